@@ -3,13 +3,38 @@ package app
 import (
 	"app_identity"
 	"net/http"
+
+	"appengine"
 )
 
+// Headers which are set by hawkeye to correlate request with test.
+var correlationHeaders = []string{"X-Hawkeye-Test-Id", "X-Hawkeye-Request-Id"}
+
+// correlated writes test ID and request ID sent by hawkeye to the app log
+// of request before calling handler.
+func correlated(handler http.HandlerFunc) http.HandlerFunc {
+	return func(w http.ResponseWriter, r *http.Request) {
+		message := ""
+		for _, name := range correlationHeaders {
+			if value := r.Header.Get(name); value != "" {
+				if message != "" {
+					message += ", "
+				}
+				message += name + "=" + value
+			}
+		}
+		if message != "" {
+			appengine.NewContext(r).Infof("Hawkeye correlation: %s", message)
+		}
+		handler(w, r)
+	}
+}
+
 func init() {
-	http.HandleFunc("/go/app_identity/project_id", app_identity.ProjectIDHandler)
-	http.HandleFunc("/go/app_identity/hostname", app_identity.HostnameHandler)
-	http.HandleFunc("/go/app_identity/access_token", app_identity.AccessTokenHandler)
-	http.HandleFunc("/go/app_identity/sign", app_identity.SignBlobHandler)
-	http.HandleFunc("/go/app_identity/certificates", app_identity.CertificateHandler)
-	http.HandleFunc("/go/app_identity/service_account_name", app_identity.ServiceAccountNameHandler)
+	http.HandleFunc("/go/app_identity/project_id", correlated(app_identity.ProjectIDHandler))
+	http.HandleFunc("/go/app_identity/hostname", correlated(app_identity.HostnameHandler))
+	http.HandleFunc("/go/app_identity/access_token", correlated(app_identity.AccessTokenHandler))
+	http.HandleFunc("/go/app_identity/sign", correlated(app_identity.SignBlobHandler))
+	http.HandleFunc("/go/app_identity/certificates", correlated(app_identity.CertificateHandler))
+	http.HandleFunc("/go/app_identity/service_account_name", correlated(app_identity.ServiceAccountNameHandler))
 }
@@ -0,0 +1,81 @@
+package com.appscale.hawkeye;
+
+import com.google.appengine.api.taskqueue.TaskOptions;
+
+import javax.servlet.Filter;
+import javax.servlet.FilterChain;
+import javax.servlet.FilterConfig;
+import javax.servlet.ServletException;
+import javax.servlet.ServletRequest;
+import javax.servlet.ServletResponse;
+import javax.servlet.http.HttpServletRequest;
+import java.io.IOException;
+import java.util.LinkedHashMap;
+import java.util.Map;
+import java.util.logging.Logger;
+
+/**
+ * Writes test ID and request ID sent by hawkeye to the app log of request
+ * and keeps them for the request thread, so push tasks enqueued by the
+ * request can carry them (see {@link #withCorrelationHeaders}).
+ */
+public class CorrelationFilter implements Filter {
+
+    public static final String TEST_ID_HEADER = "X-Hawkeye-Test-Id";
+    public static final String REQUEST_ID_HEADER = "X-Hawkeye-Request-Id";
+
+    private static final Logger logger = Logger.getLogger(CorrelationFilter.class.getName());
+
+    private static final ThreadLocal<Map<String, String>> headers = new ThreadLocal<Map<String, String>>();
+
+    public void init(FilterConfig filterConfig) throws ServletException {
+    }
+
+    public void doFilter(ServletRequest request, ServletResponse response,
+                         FilterChain chain) throws IOException, ServletException {
+        HttpServletRequest httpRequest = (HttpServletRequest) request;
+        Map<String, String> correlation = new LinkedHashMap<String, String>();
+        for (String name : new String[]{TEST_ID_HEADER, REQUEST_ID_HEADER}) {
+            String value = httpRequest.getHeader(name);
+            if (value != null) {
+                correlation.put(name, value);
+            }
+        }
+        if (correlation.isEmpty()) {
+            chain.doFilter(request, response);
+            return;
+        }
+
+        StringBuilder message = new StringBuilder("Hawkeye correlation: ");
+        for (Map.Entry<String, String> header : correlation.entrySet()) {
+            if (message.charAt(message.length() - 1) != ' ') {
+                message.append(", ");
+            }
+            message.append(header.getKey()).append('=').append(header.getValue());
+        }
+        logger.info(message.toString());
+        headers.set(correlation);
+        try {
+            chain.doFilter(request, response);
+        } finally {
+            headers.remove();
+        }
+    }
+
+    public void destroy() {
+    }
+
+    /**
+     * Adds correlation headers of current request to a push task.
+     *
+     * @param options options of push task to be enqueued.
+     * @return the same options object.
+     */
+    public static TaskOptions withCorrelationHeaders(TaskOptions options) {
+        Map<String, String> correlation = headers.get();
+        if (correlation != null) {
+            options.headers(correlation);
+        }
+        return options;
+    }
+}
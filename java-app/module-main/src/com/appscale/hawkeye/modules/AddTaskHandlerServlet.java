@@ -1,5 +1,6 @@
 package com.appscale.hawkeye.modules;
 
+import com.appscale.hawkeye.CorrelationFilter;
 import com.google.appengine.api.taskqueue.Queue;
 import com.google.appengine.api.taskqueue.QueueFactory;
 import com.google.appengine.api.taskqueue.TaskOptions;
@@ -25,6 +26,6 @@ public class AddTaskHandlerServlet extends HttpServlet {
 
         String url = "/modules/create-entity";
         TaskOptions options = TaskOptions.Builder.withUrl(url).param("id", id).method(TaskOptions.Method.GET);
-        queue.add(options);
+        queue.add(CorrelationFilter.withCorrelationHeaders(options));
     }
 }
@@ -1,5 +1,6 @@
 package com.appscale.hawkeye.taskqueue;
 
+import com.appscale.hawkeye.CorrelationFilter;
 import com.google.appengine.api.datastore.DatastoreService;
 import com.google.appengine.api.datastore.DatastoreServiceFactory;
 import com.google.appengine.api.datastore.EntityNotFoundException;
@@ -19,7 +20,7 @@ public class AdminTaskManager extends HttpServlet {
     public void doPost(HttpServletRequest request, HttpServletResponse response) {
         Queue queue = QueueFactory.getDefaultQueue();
         TaskOptions options = TaskOptions.Builder.withUrl("/java/taskqueue/admin_worker");
-        queue.add(options);
+        queue.add(CorrelationFilter.withCorrelationHeaders(options));
     }
 
     public void doGet(HttpServletRequest request, HttpServletResponse response) {
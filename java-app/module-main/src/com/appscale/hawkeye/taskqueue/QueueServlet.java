@@ -1,5 +1,6 @@
 package com.appscale.hawkeye.taskqueue;
 
+import com.appscale.hawkeye.CorrelationFilter;
 import com.appscale.hawkeye.JSONUtils;
 import com.google.appengine.api.taskqueue.Queue;
 import com.google.appengine.api.taskqueue.QueueFactory;
@@ -34,8 +35,8 @@ public class QueueServlet extends HttpServlet {
 
         // Test each queue is working.
         Queue defaultQueue = QueueFactory.getDefaultQueue();
-        TaskOptions pushTaskOptions = TaskOptions.Builder.
-                withUrl("/java/taskqueue/clean_up");
+        TaskOptions pushTaskOptions = CorrelationFilter.withCorrelationHeaders(
+                TaskOptions.Builder.withUrl("/java/taskqueue/clean_up"));
         queueArray.put(defaultQueue.getQueueName());
         try {
             defaultQueue.add(pushTaskOptions);
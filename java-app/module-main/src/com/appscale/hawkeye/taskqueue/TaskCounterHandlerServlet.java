@@ -1,5 +1,6 @@
 package com.appscale.hawkeye.taskqueue;
 
+import com.appscale.hawkeye.CorrelationFilter;
 import com.appscale.hawkeye.JSONUtils;
 import com.google.appengine.api.taskqueue.Queue;
 import com.google.appengine.api.taskqueue.QueueFactory;
@@ -56,19 +57,20 @@ public class TaskCounterHandlerServlet extends HttpServlet {
         Queue queue = QueueFactory.getDefaultQueue();
         if ("defer".equals(defer)) {
             DeferredCounterTask deferredCounterTask = new DeferredCounterTask(key);
-            queue.add(TaskOptions.Builder.withPayload(deferredCounterTask));
+            queue.add(CorrelationFilter.withCorrelationHeaders(
+                    TaskOptions.Builder.withPayload(deferredCounterTask)));
         } else if ("true".equals(getMethod)) {
             TaskOptions taskOptions = TaskOptions.Builder.
                     withUrl("/java/taskqueue/worker?key=" + key).
                     method(TaskOptions.Method.GET);
-            queue.add(taskOptions);
+            queue.add(CorrelationFilter.withCorrelationHeaders(taskOptions));
         } else {
             if (retry != null) {
                 TaskOptions taskOptions = TaskOptions.Builder.
                         withUrl("/java/taskqueue/worker").
                         param("key", key).
                         param("retry", retry);
-                queue.add(taskOptions);
+                queue.add(CorrelationFilter.withCorrelationHeaders(taskOptions));
             } else if (eta != null) {
                 long adjustedEta = System.currentTimeMillis() + Long.parseLong(eta) * 1000;
                 TaskOptions taskOptions = TaskOptions.Builder.
@@ -76,9 +78,10 @@ public class TaskCounterHandlerServlet extends HttpServlet {
                         param("key", key).
                         param("eta", "true").
                         etaMillis(adjustedEta);
-                queue.add(taskOptions);
+                queue.add(CorrelationFilter.withCorrelationHeaders(taskOptions));
             } else {
-                queue.add(TaskOptions.Builder.withUrl("/java/taskqueue/worker").param("key", key));
+                queue.add(CorrelationFilter.withCorrelationHeaders(
+                        TaskOptions.Builder.withUrl("/java/taskqueue/worker").param("key", key)));
             }
         }
         Map<String, Object> map = new HashMap<String, Object>();
@@ -1,5 +1,6 @@
 package com.appscale.hawkeye.taskqueue;
 
+import com.appscale.hawkeye.CorrelationFilter;
 import com.appscale.hawkeye.JSONUtils;
 import com.google.appengine.api.datastore.DatastoreService;
 import com.google.appengine.api.datastore.DatastoreServiceFactory;
@@ -52,7 +53,8 @@ public class TransactionalTaskHandlerServlet extends HttpServlet {
         Map<String, Object> responseMap = new HashMap<>();
 
         Transaction txn = datastore.beginTransaction();
-        queue.add(TaskOptions.Builder.withUrl("/java/taskqueue/transworker").param("key", key));
+        queue.add(CorrelationFilter.withCorrelationHeaders(
+                TaskOptions.Builder.withUrl("/java/taskqueue/transworker").param("key", key)));
 
         Entity task = new Entity("TaskEntity", key);
         task.setProperty("value", "TXN_UPDATE");
@@ -4,6 +4,19 @@ require 'app_identity.php';
 
 $request_uri = $_SERVER['PATH_INFO'];
 
+// Write test ID and request ID sent by hawkeye to the app log of request.
+$correlation = array();
+foreach (array('X-Hawkeye-Test-Id' => 'HTTP_X_HAWKEYE_TEST_ID',
+               'X-Hawkeye-Request-Id' => 'HTTP_X_HAWKEYE_REQUEST_ID')
+         as $header => $key) {
+    if (isset($_SERVER[$key])) {
+        $correlation[] = $header . '=' . $_SERVER[$key];
+    }
+}
+if ($correlation) {
+    syslog(LOG_INFO, 'Hawkeye correlation: ' . implode(', ', $correlation));
+}
+
 $routes = array(
     '/php/app_identity/project_id' => 'projectIDHandler',
     '/php/app_identity/hostname' => 'hostnameHandler',
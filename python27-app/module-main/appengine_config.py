@@ -0,0 +1,22 @@
+import os
+
+# Header which is set by hawkeye to isolate data of a test suite.
+NAMESPACE_HEADER_ENV = 'HTTP_X_HAWKEYE_NAMESPACE'
+
+# Header which is set by taskqueue when task is added from namespaced request.
+TASK_NAMESPACE_HEADER_ENV = 'HTTP_X_APPENGINE_CURRENT_NAMESPACE'
+
+
+def namespace_manager_default_namespace_for_request():
+  """ Determines namespace for datastore, memcache, search and taskqueue
+  calls made by request handlers.
+
+  Hawkeye sends X-Hawkeye-Namespace header with every request of a test suite,
+  so suites don't see (and don't remove) entities of each other.
+  Tasks inherit namespace of request which enqueued them.
+
+  Returns:
+    A string - namespace name ('' for requests which are not isolated).
+  """
+  return (os.environ.get(NAMESPACE_HEADER_ENV) or
+          os.environ.get(TASK_NAMESPACE_HEADER_ENV) or '')
@@ -0,0 +1,687 @@
+import binascii
+import json
+import os
+import random
+import threading
+import time
+
+import webapp2
+from google.appengine.api import datastore_admin
+from google.appengine.api import datastore_types
+from google.appengine.datastore import datastore_index
+from google.appengine.datastore import entity_pb
+from google.appengine.ext import db
+from google.appengine.runtime import apiproxy_errors
+
+from datastore import Project
+
+# Max number of entities put or deleted by a single call.
+BATCH_SIZE = 200
+
+# Max number of entities counted by a single query.
+MAX_COUNT = 1000000
+
+# Max number of large entities put by a single call (keeps RPC size
+# well below its limit).
+LARGE_BATCH_SIZE = 20
+
+# Properties which are fetched by projection benchmark.
+PROJECTED_PROPERTIES = ('label', 'rank')
+
+# Max size of payload put by a single batch call of entity size benchmark.
+MAX_BATCH_BYTES = 4 * 1024 * 1024
+
+# Types of payload property used by entity size benchmark.
+PAYLOAD_TYPES = ('blob', 'text')
+
+# Number of groups of entities seeded by index backfill benchmark and
+# the group queried through the composite index it registers.
+BACKFILL_GROUPS = 10
+BACKFILL_QUERY_GROUP = 0
+
+# Category of all entities seeded by paging benchmark (it's filtered by
+# its composite query).
+PAGING_CATEGORY = 'paged'
+
+# Strategies used to fetch consecutive pages by paging benchmark.
+PAGING_STRATEGIES = ('offset', 'cursor')
+
+# Composite index registered by index backfill benchmark (it must not be
+# listed in index.yaml, so it's built while the benchmark runs).
+BACKFILL_INDEX = datastore_index.Index(
+  kind='BenchmarkBackfillEntity',
+  properties=[datastore_index.Property(name='group'),
+              datastore_index.Property(name='rank', direction='desc')])
+
+# Keeps GqlQuery objects parsed once per thread (bind() changes the query
+# object, so a query can't be shared by concurrent requests).
+_cached_queries = threading.local()
+
+
+class BenchmarkWideEntity(db.Expando):
+  """ Large entity with many unindexed properties (field_<N> dynamic
+  properties of db.Text type) and a couple of small indexed ones.
+  """
+  label = db.StringProperty()
+  rank = db.IntegerProperty()
+
+
+class BenchmarkSizedProject(db.Model):
+  """ Project with a payload of configurable size stored as unindexed
+  blob or text property. Entities of one size are kept under one parent.
+  """
+  project_id = db.StringProperty(required=True)
+  name = db.StringProperty(required=True)
+  rating = db.IntegerProperty(required=True)
+  size = db.IntegerProperty(required=True)
+  blob_payload = db.BlobProperty()
+  text_payload = db.TextProperty()
+
+
+class BenchmarkIndexedEntity(db.Expando):
+  """ Entity with p_<N> dynamic properties (indexed strings or unindexed
+  db.Text values) and a list property of configurable length.
+  """
+  tags = db.StringListProperty()
+
+
+class BenchmarkCompositeIndexedEntity(BenchmarkIndexedEntity):
+  """ The same entity as BenchmarkIndexedEntity, but its kind has
+  composite indexes in index.yaml.
+  """
+  pass
+
+
+class BenchmarkBackfillEntity(db.Model):
+  """ Entity indexed by composite index registered by index backfill
+  benchmark.
+  """
+  group = db.IntegerProperty(required=True)
+  rank = db.IntegerProperty(required=True)
+  label = db.StringProperty()
+
+
+class BenchmarkPagedEntity(db.Model):
+  """ Entity paged through by paging benchmark. All of them are kept
+  under one root, so they can be paged through by kindless ancestor query.
+  """
+  category = db.StringProperty(required=True)
+  rank = db.IntegerProperty(required=True)
+  label = db.StringProperty()
+
+
+def latency_summary(latencies):
+  """ Summarizes latencies of repeated operation.
+
+  Args:
+    latencies: A list of floats - seconds taken by every run.
+  Returns:
+    A dict with number of runs and mean, median, 95th percentile
+    and max latency in milliseconds.
+  """
+  latencies = sorted(latencies)
+  count = len(latencies)
+  if not count:
+    return {'count': 0}
+  return {
+    'count': count,
+    'mean_ms': sum(latencies) / count * 1000,
+    'p50_ms': latencies[count // 2] * 1000,
+    'p95_ms': latencies[min(int(count * 0.95), count - 1)] * 1000,
+    'max_ms': latencies[-1] * 1000
+  }
+
+
+def time_runs(function, args_list):
+  """ Calls function once for every args tuple and times every call.
+
+  Args:
+    function: A callable.
+    args_list: A list of tuples - positional arguments of every call.
+  Returns:
+    A dict built by latency_summary.
+  """
+  latencies = []
+  for args in args_list:
+    started_at = time.time()
+    function(*args)
+    latencies.append(time.time() - started_at)
+  return latency_summary(latencies)
+
+
+def add_throughput(summary, entities_per_run, entity_size=None):
+  """ Adds throughput of timed runs to their latency summary.
+
+  Args:
+    summary: A dict built by latency_summary.
+    entities_per_run: An integer - number of entities handled by every run.
+    entity_size: An integer - payload size of every entity in bytes
+      (kilobytes per second aren't reported if it's None).
+  Returns:
+    The same dict with entities (and kilobytes) handled per second.
+  """
+  total_seconds = summary.get('mean_ms', 0) * summary['count'] / 1000
+  if total_seconds:
+    entities = entities_per_run * summary['count']
+    summary['entities_per_s'] = entities / total_seconds
+    if entity_size is not None:
+      summary['kb_per_s'] = entities * entity_size / 1024.0 / total_seconds
+  return summary
+
+
+def remove_kind(model_class):
+  """ Removes all entities of a kind in the current namespace.
+
+  Args:
+    model_class: A db.Model subclass.
+  Returns:
+    An integer - number of removed entities.
+  """
+  removed = 0
+  while True:
+    keys = model_class.all(keys_only=True).fetch(BATCH_SIZE)
+    if not keys:
+      return removed
+    db.delete(keys)
+    removed += len(keys)
+
+
+def _gql_string(project_id):
+  # The way ProjectHandler and other handlers build queries
+  return db.GqlQuery("SELECT * FROM Project WHERE "
+                     "project_id = '%s'" % project_id).get()
+
+
+def _gql_bound(project_id):
+  query = getattr(_cached_queries, 'project_by_id', None)
+  if query is None:
+    query = db.GqlQuery("SELECT * FROM Project WHERE project_id = :1")
+    _cached_queries.project_by_id = query
+  query.bind(project_id)
+  return query.get()
+
+
+def _gql_parse_only(project_id):
+  return db.GqlQuery("SELECT * FROM Project WHERE "
+                     "project_id = '%s'" % project_id)
+
+
+def _db_query(project_id):
+  return Project.all().filter('project_id =', project_id).get()
+
+
+def _key_get(project_id):
+  return Project.get_by_key_name(project_id)
+
+
+# Lookups of a project by its ID done in different ways.
+QUERY_VARIANTS = [
+  ('gql_string', _gql_string),
+  ('gql_bound', _gql_bound),
+  ('gql_parse_only', _gql_parse_only),
+  ('db_query', _db_query),
+  ('key_get', _key_get),
+]
+
+
+class QueryOverheadBenchmark(webapp2.RequestHandler):
+  """ Compares latency of looking up a project by ID using GQL string built
+  for every request (as ProjectHandler does), bound GqlQuery parsed once,
+  db.Query with filter and get by key. gql_parse_only shows how much of it
+  is spent building GqlQuery object.
+  """
+  def post(self):
+    """ Seeds projects to look up. """
+    count = int(self.request.get('count', 100))
+    remove_kind(Project)
+    projects = [
+      Project(key_name='bench-{}'.format(index),
+              project_id='bench-{}'.format(index),
+              name='Benchmark project {}'.format(index),
+              description='Project used by query overhead benchmark',
+              rating=index % 10, license='L{}'.format(index % 3))
+      for index in xrange(count)
+    ]
+    for start in xrange(0, count, BATCH_SIZE):
+      db.put(projects[start:start + BATCH_SIZE])
+    self.response.headers['Content-Type'] = 'application/json'
+    self.response.set_status(201)
+    self.response.out.write(json.dumps({'seeded': count}))
+
+  def get(self):
+    """ Runs every variant of lookup for random seeded projects. """
+    count = int(self.request.get('count', 100))
+    repeats = int(self.request.get('repeats', 50))
+    args_list = [('bench-{}'.format(random.randrange(count)),)
+                 for _ in xrange(repeats)]
+    variants = {}
+    for name, function in QUERY_VARIANTS:
+      # The first call warms up caches of the instance
+      function(*args_list[0])
+      variants[name] = time_runs(function, args_list)
+    self.response.headers['Content-Type'] = 'application/json'
+    self.response.out.write(json.dumps({'variants': variants}))
+
+  def delete(self):
+    self.response.headers['Content-Type'] = 'application/json'
+    self.response.out.write(json.dumps({'removed': remove_kind(Project)}))
+
+
+class ProjectionBenchmark(webapp2.RequestHandler):
+  """ Fetches large entities as full entities, projections of two small
+  properties or keys only, so cost of every way can be compared
+  (datastore time is reported in Server-Timing header).
+  """
+  def post(self):
+    """ Seeds large entities. """
+    count = int(self.request.get('count', 500))
+    properties = int(self.request.get('properties', 30))
+    property_size = int(self.request.get('property_size', 200))
+    remove_kind(BenchmarkWideEntity)
+    value = db.Text('x' * property_size)
+    for start in xrange(0, count, LARGE_BATCH_SIZE):
+      entities = []
+      for index in xrange(start, min(start + LARGE_BATCH_SIZE, count)):
+        entity = BenchmarkWideEntity(label='entity-{}'.format(index),
+                                     rank=index)
+        for field in xrange(properties):
+          setattr(entity, 'field_{}'.format(field), value)
+        entities.append(entity)
+      db.put(entities)
+    self.response.headers['Content-Type'] = 'application/json'
+    self.response.set_status(201)
+    self.response.out.write(json.dumps({'seeded': count}))
+
+  def get(self):
+    """ Fetches limit entities using mode (full, projection or keys_only)
+    and returns them.
+    """
+    mode = self.request.get('mode', 'full')
+    limit = int(self.request.get('limit', 100))
+    if mode == 'full':
+      results = [db.to_dict(entity)
+                 for entity in BenchmarkWideEntity.all().fetch(limit)]
+    elif mode == 'projection':
+      query = BenchmarkWideEntity.all(projection=PROJECTED_PROPERTIES)
+      results = [{name: getattr(entity, name) for name in PROJECTED_PROPERTIES}
+                 for entity in query.fetch(limit)]
+    elif mode == 'keys_only':
+      results = [str(key) for key
+                 in BenchmarkWideEntity.all(keys_only=True).fetch(limit)]
+    else:
+      self.response.set_status(400)
+      self.response.out.write('Unknown mode: {}'.format(mode))
+      return
+    self.response.headers['Content-Type'] = 'application/json'
+    self.response.out.write(json.dumps({'results': results}))
+
+  def delete(self):
+    self.response.headers['Content-Type'] = 'application/json'
+    self.response.out.write(
+      json.dumps({'removed': remove_kind(BenchmarkWideEntity)}))
+
+
+class EntitySizeBenchmark(webapp2.RequestHandler):
+  """ Puts, gets and queries projects with payload of a given size
+  one by one and in batches, so latency and throughput can be compared
+  across entity sizes up to the 1 MB limit.
+  """
+  def get(self):
+    """ Runs every operation for count entities of size bytes and removes
+    them afterwards.
+    """
+    size = int(self.request.get('size', 100))
+    count = int(self.request.get('count', 20))
+    payload_type = self.request.get('payload_type', 'blob')
+    if payload_type not in PAYLOAD_TYPES:
+      self.response.set_status(400)
+      self.response.out.write('Unknown payload type: {}'.format(payload_type))
+      return
+    batch_size = max(1, min(count, MAX_BATCH_BYTES // max(size, 1)))
+
+    payload = binascii.hexlify(os.urandom(size // 2 + 1))[:size]
+    if payload_type == 'blob':
+      payload_kwargs = {'blob_payload': db.Blob(payload)}
+    else:
+      payload_kwargs = {'text_payload': db.Text(payload)}
+    parent = db.Key.from_path('BenchmarkSize',
+                              '{}-{}'.format(payload_type, size))
+
+    def new_projects(prefix):
+      return [
+        BenchmarkSizedProject(
+          parent=parent, key_name='{}-{}'.format(prefix, index),
+          project_id='{}-{}'.format(prefix, index),
+          name='Sized project {}'.format(index), rating=index % 10,
+          size=size, **payload_kwargs)
+        for index in xrange(count)
+      ]
+
+    def batches(items):
+      return [(items[start:start + batch_size],)
+              for start in xrange(0, len(items), batch_size)]
+
+    single = new_projects('single')
+    batched = new_projects('batch')
+    keys = [project.key() for project in batched]
+    operations = {
+      'put': add_throughput(
+        time_runs(db.put, [(project,) for project in single]), 1, size),
+      'put_batch': add_throughput(
+        time_runs(db.put, batches(batched)), batch_size, size),
+      'get': add_throughput(
+        time_runs(db.get, [(key,) for key in keys]), 1, size),
+      'get_batch': add_throughput(
+        time_runs(db.get, batches(keys)), batch_size, size),
+    }
+    query = BenchmarkSizedProject.all().ancestor(parent)
+    operations['query'] = add_throughput(
+      time_runs(query.fetch, [(batch_size,)] * max(1, count // batch_size)),
+      batch_size, size)
+
+    all_keys = [project.key() for project in single] + keys
+    for start in xrange(0, len(all_keys), BATCH_SIZE):
+      db.delete(all_keys[start:start + BATCH_SIZE])
+    self.response.headers['Content-Type'] = 'application/json'
+    self.response.out.write(json.dumps({'size': size,
+                                        'batch_size': batch_size,
+                                        'operations': operations}))
+
+  def delete(self):
+    self.response.headers['Content-Type'] = 'application/json'
+    self.response.out.write(
+      json.dumps({'removed': remove_kind(BenchmarkSizedProject)}))
+
+
+class IndexWriteBenchmark(webapp2.RequestHandler):
+  """ Puts entities with a given number of indexed properties and list
+  values, one by one and in batches, so cost of index writes can be
+  compared with entities of the same shape which are not indexed.
+  """
+  def get(self):
+    """ Puts count entities of requested shape and removes them afterwards.
+    """
+    indexed = int(self.request.get('indexed', 0))
+    properties = max(indexed, int(self.request.get('properties', 100)))
+    list_length = int(self.request.get('list_length', 0))
+    composite = self.request.get('composite').lower() == 'true'
+    count = int(self.request.get('count', 50))
+    batch_size = int(self.request.get('batch_size', 10))
+    if composite:
+      model_class = BenchmarkCompositeIndexedEntity
+    else:
+      model_class = BenchmarkIndexedEntity
+
+    def new_entities():
+      entities = []
+      for index in xrange(count):
+        entity = model_class(
+          tags=['tag-{}'.format(tag) for tag in xrange(list_length)])
+        for prop in xrange(properties):
+          value = 'value-{}-{}'.format(index, prop)
+          if prop >= indexed:
+            value = db.Text(value)
+          setattr(entity, 'p_{}'.format(prop), value)
+        entities.append(entity)
+      return entities
+
+    single = new_entities()
+    batched = new_entities()
+    operations = {
+      'put': add_throughput(
+        time_runs(db.put, [(entity,) for entity in single]), 1),
+      'put_batch': add_throughput(
+        time_runs(db.put, [(batched[start:start + batch_size],)
+                           for start in xrange(0, count, batch_size)]),
+        batch_size),
+    }
+
+    keys = [entity.key() for entity in single + batched]
+    for start in xrange(0, len(keys), BATCH_SIZE):
+      db.delete(keys[start:start + BATCH_SIZE])
+    self.response.headers['Content-Type'] = 'application/json'
+    self.response.out.write(json.dumps({
+      'kind': model_class.kind(),
+      'indexed_values': indexed + list_length,
+      'operations': operations
+    }))
+
+  def delete(self):
+    removed = sum(remove_kind(model_class) for model_class
+                  in (BenchmarkIndexedEntity, BenchmarkCompositeIndexedEntity))
+    self.response.headers['Content-Type'] = 'application/json'
+    self.response.out.write(json.dumps({'removed': removed}))
+
+
+def _backfill_index_proto():
+  return datastore_index.IndexDefinitionToProto(
+    datastore_types.ResolveAppId(None), BACKFILL_INDEX)
+
+
+def _find_backfill_index():
+  """ Looks up composite index registered by index backfill benchmark.
+
+  Returns:
+    An entity_pb.CompositeIndex object or None if it's not registered.
+  """
+  definition = _backfill_index_proto().definition()
+  for index in datastore_admin.GetIndices():
+    if index.definition().Equals(definition):
+      return index
+  return None
+
+
+def _paging_root():
+  return db.Key.from_path('BenchmarkPagingRoot', 'root')
+
+
+def _kind_query():
+  return BenchmarkPagedEntity.all(keys_only=True).order('__key__')
+
+
+def _composite_query():
+  return BenchmarkPagedEntity.all(keys_only=True) \
+    .filter('category =', PAGING_CATEGORY).order('-rank')
+
+
+def _kindless_ancestor_query():
+  return db.Query(keys_only=True).ancestor(_paging_root())
+
+
+# Keys-only queries paged through by paging benchmark.
+PAGING_QUERIES = {
+  'kind': _kind_query,
+  'composite': _composite_query,
+  'kindless_ancestor': _kindless_ancestor_query,
+}
+
+
+class PagingBenchmark(webapp2.RequestHandler):
+  """ Pages through entities with limit/offset or with cursors passed
+  between requests (as web pages do) and times every page, so latency
+  can be compared by page depth.
+  """
+  def post(self):
+    """ Seeds count entities starting from number start. """
+    start = int(self.request.get('start', 0))
+    count = int(self.request.get('count', 2000))
+    entities = [
+      BenchmarkPagedEntity(parent=_paging_root(),
+                           key_name='paged-{}'.format(index),
+                           category=PAGING_CATEGORY, rank=index,
+                           label='entity-{}'.format(index))
+      for index in xrange(start, start + count)
+    ]
+    for batch_start in xrange(0, count, BATCH_SIZE):
+      db.put(entities[batch_start:batch_start + BATCH_SIZE])
+    self.response.headers['Content-Type'] = 'application/json'
+    self.response.set_status(201)
+    self.response.out.write(json.dumps({'seeded': count}))
+
+  def get(self):
+    """ Fetches up to pages consecutive pages of a query using strategy and
+    reports latency of every page. Offset pages start from start_page,
+    cursor pages start from cursor returned by previous request.
+    """
+    query_name = self.request.get('query', 'kind')
+    strategy = self.request.get('strategy', 'cursor')
+    page_size = int(self.request.get('page_size', 100))
+    pages = int(self.request.get('pages', 20))
+    start_page = int(self.request.get('start_page', 0))
+    cursor = self.request.get('cursor') or None
+    if query_name not in PAGING_QUERIES or strategy not in PAGING_STRATEGIES:
+      self.response.set_status(400)
+      self.response.out.write(
+        'Unknown query or strategy: {}, {}'.format(query_name, strategy))
+      return
+
+    latencies = []
+    results = 0
+    done = False
+    for page_number in xrange(start_page, start_page + pages):
+      started_at = time.time()
+      query = PAGING_QUERIES[query_name]()
+      if strategy == 'offset':
+        page = query.fetch(page_size, offset=page_number * page_size)
+      else:
+        if cursor:
+          query.with_cursor(start_cursor=cursor)
+        page = query.fetch(page_size)
+        cursor = query.cursor()
+      latencies.append((time.time() - started_at) * 1000)
+      results += len(page)
+      if len(page) < page_size:
+        done = True
+        break
+
+    self.response.headers['Content-Type'] = 'application/json'
+    self.response.out.write(json.dumps({'latencies_ms': latencies,
+                                        'results': results,
+                                        'cursor': cursor,
+                                        'done': done}))
+
+  def delete(self):
+    self.response.headers['Content-Type'] = 'application/json'
+    self.response.out.write(
+      json.dumps({'removed': remove_kind(BenchmarkPagedEntity)}))
+
+
+class PagingCountHandler(webapp2.RequestHandler):
+  """ Counts entities of paging benchmark visible to its queries. """
+  def get(self):
+    counts = {name: PAGING_QUERIES[name]().count(limit=MAX_COUNT)
+              for name in PAGING_QUERIES}
+    self.response.headers['Content-Type'] = 'application/json'
+    self.response.out.write(json.dumps(counts))
+
+
+class IndexBackfillBenchmark(webapp2.RequestHandler):
+  """ Seeds and counts entities indexed by composite index of index
+  backfill benchmark.
+  """
+  def post(self):
+    """ Seeds count entities starting from number start. """
+    start = int(self.request.get('start', 0))
+    count = int(self.request.get('count', 2000))
+    entities = [
+      BenchmarkBackfillEntity(key_name='backfill-{}'.format(index),
+                              group=index % BACKFILL_GROUPS, rank=index,
+                              label='entity-{}'.format(index))
+      for index in xrange(start, start + count)
+    ]
+    for batch_start in xrange(0, count, BATCH_SIZE):
+      db.put(entities[batch_start:batch_start + BATCH_SIZE])
+    self.response.headers['Content-Type'] = 'application/json'
+    self.response.set_status(201)
+    self.response.out.write(json.dumps({'seeded': count}))
+
+  def get(self):
+    """ Counts seeded entities visible to queries. """
+    count = BenchmarkBackfillEntity.all(keys_only=True).count(limit=MAX_COUNT)
+    self.response.headers['Content-Type'] = 'application/json'
+    self.response.out.write(json.dumps({'count': count}))
+
+  def delete(self):
+    self.response.headers['Content-Type'] = 'application/json'
+    self.response.out.write(
+      json.dumps({'removed': remove_kind(BenchmarkBackfillEntity)}))
+
+
+class IndexBackfillIndexHandler(webapp2.RequestHandler):
+  """ Registers composite index of index backfill benchmark and reports
+  whether queries using it return complete results.
+  """
+  def post(self):
+    """ Registers the index using datastore admin API (as deployment of
+    index.yaml does).
+    """
+    if _find_backfill_index() is not None:
+      self.response.set_status(409)
+      self.response.out.write('Backfill index is already registered')
+      return
+    try:
+      index_id = datastore_admin.CreateIndex(_backfill_index_proto())
+    except apiproxy_errors.ApplicationError as error:
+      self.response.set_status(501)
+      self.response.out.write(
+        'Datastore refused to create index: {}'.format(error))
+      return
+    self.response.headers['Content-Type'] = 'application/json'
+    self.response.set_status(201)
+    self.response.out.write(json.dumps({'id': index_id}))
+
+  def get(self):
+    """ Reports state of the index, number of entities in the queried
+    group (found with built-in index) and number of them returned by
+    query which needs the composite index (None if it can't be served yet).
+    """
+    index = _find_backfill_index()
+    state = None
+    if index is not None:
+      state = entity_pb.CompositeIndex.State_Name(index.state())
+    group = BenchmarkBackfillEntity.all(keys_only=True) \
+      .filter('group =', BACKFILL_QUERY_GROUP)
+    expected = group.count(limit=MAX_COUNT)
+    try:
+      results = group.order('-rank').count(limit=MAX_COUNT)
+    except (db.NeedIndexError, apiproxy_errors.ApplicationError):
+      results = None
+    self.response.headers['Content-Type'] = 'application/json'
+    self.response.out.write(json.dumps({'state': state,
+                                        'expected': expected,
+                                        'results': results}))
+
+  def delete(self):
+    index = _find_backfill_index()
+    if index is not None:
+      datastore_admin.DeleteIndex(index)
+    self.response.set_status(204)
+
+
+class IndexBackfillWritesHandler(webapp2.RequestHandler):
+  """ Times puts of entities indexed by composite index of index backfill
+  benchmark (e.g. while the index is being built).
+  """
+  def post(self):
+    writes = int(self.request.get('writes', 10))
+    entities = [
+      BenchmarkBackfillEntity(group=BACKFILL_GROUPS, rank=index,
+                              label='write-{}'.format(index))
+      for index in xrange(writes)
+    ]
+    summary = time_runs(db.put, [(entity,) for entity in entities])
+    self.response.headers['Content-Type'] = 'application/json'
+    self.response.out.write(json.dumps(summary))
+
+
+urls = [
+  ('/python/benchmarks/query_overhead', QueryOverheadBenchmark),
+  ('/python/benchmarks/projection', ProjectionBenchmark),
+  ('/python/benchmarks/entity_size', EntitySizeBenchmark),
+  ('/python/benchmarks/index_writes', IndexWriteBenchmark),
+  ('/python/benchmarks/index_backfill', IndexBackfillBenchmark),
+  ('/python/benchmarks/index_backfill/index', IndexBackfillIndexHandler),
+  ('/python/benchmarks/index_backfill/writes', IndexBackfillWritesHandler),
+  ('/python/benchmarks/paging', PagingBenchmark),
+  ('/python/benchmarks/paging/count', PagingCountHandler),
+]
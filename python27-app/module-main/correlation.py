@@ -0,0 +1,75 @@
+import logging
+import threading
+
+from google.appengine.api import apiproxy_stub_map
+from google.appengine.api.taskqueue import taskqueue_service_pb
+
+# Headers which are set by hawkeye to correlate request with test
+# (and by taskqueue for tasks spawned by such request).
+TEST_ID_HEADER = 'X-Hawkeye-Test-Id'
+REQUEST_ID_HEADER = 'X-Hawkeye-Request-Id'
+
+CORRELATION_HEADERS = (
+  (TEST_ID_HEADER, 'HTTP_X_HAWKEYE_TEST_ID'),
+  (REQUEST_ID_HEADER, 'HTTP_X_HAWKEYE_REQUEST_ID'),
+)
+
+# Keeps correlation headers of request handled by current thread.
+_local = threading.local()
+
+
+def _add_task_headers(add_request, headers):
+  """ Adds correlation headers to a push task (pull tasks can't have them).
+
+  Args:
+    add_request: A TaskQueueAddRequest object.
+    headers: A list of tuples (header name, value).
+  """
+  if add_request.mode() == taskqueue_service_pb.TaskQueueMode.PULL:
+    return
+  existing = set(header.key().lower() for header in add_request.header_list())
+  for name, value in headers:
+    if name.lower() not in existing:
+      header = add_request.add_header()
+      header.set_key(name)
+      header.set_value(value)
+
+
+def _taskqueue_pre_call_hook(service, call, request, response):
+  headers = getattr(_local, 'headers', None)
+  if not headers:
+    return
+  if call == 'Add':
+    _add_task_headers(request, headers)
+  elif call == 'BulkAdd':
+    for add_request in request.add_request_list():
+      _add_task_headers(add_request, headers)
+
+
+apiproxy_stub_map.apiproxy.GetPreCallHooks().Append(
+  'correlation_taskqueue', _taskqueue_pre_call_hook, 'taskqueue')
+
+
+class CorrelationMiddleware(object):
+  """ Writes test ID and request ID sent by hawkeye to the app log of
+  request and passes them to push tasks enqueued by the request, so
+  server-side logs and tasks can be joined with requests seen by hawkeye.
+  """
+  def __init__(self, app):
+    self.app = app
+
+  def __call__(self, environ, start_response):
+    headers = [(name, environ[env_name])
+               for name, env_name in CORRELATION_HEADERS
+               if env_name in environ]
+    if not headers:
+      return self.app(environ, start_response)
+
+    logging.info('Hawkeye correlation: %s',
+                 ', '.join('{}={}'.format(name, value)
+                           for name, value in headers))
+    _local.headers = headers
+    try:
+      return self.app(environ, start_response)
+    finally:
+      _local.headers = None
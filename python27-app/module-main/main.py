@@ -2,7 +2,9 @@ import webapp2
 
 from app_identity import urls as app_identity_urls
 from async_datastore import urls as async_datastore_urls
+from benchmarks import urls as benchmarks_urls
 from blobstore import urls as blobstore_urls
+from correlation import CorrelationMiddleware
 from cron import urls as cron_urls
 from datastore import urls as datastore_urls
 from env_var import urls as env_var_urls
@@ -10,17 +12,21 @@ from images import urls as images_urls
 from logservice import urls as logservice_urls
 from memcache import urls as memcache_urls
 from module_main import urls as modules_urls
+from namespaces import urls as namespaces_urls
 from ndb import urls as ndb_urls
+from rpc_stats import urls as rpc_stats_urls
 from search import urls as search_urls
 from secure_url import urls as secure_url_urls
+from server_timing import ServerTimingMiddleware
 from taskqueue import urls as taskqueue_urls
 from urlfetch import urls as urlfetch_urls
 from users import urls as user_urls
 from xmpp import urls as xmpp_urls
 
-app = webapp2.WSGIApplication(
+app = CorrelationMiddleware(ServerTimingMiddleware(webapp2.WSGIApplication(
   app_identity_urls +
   async_datastore_urls +
+  benchmarks_urls +
   blobstore_urls +
   cron_urls +
   datastore_urls +
@@ -29,11 +35,13 @@ app = webapp2.WSGIApplication(
   logservice_urls +
   memcache_urls +
   modules_urls +
+  namespaces_urls +
   ndb_urls +
+  rpc_stats_urls +
   secure_url_urls +
   taskqueue_urls +
   urlfetch_urls +
   user_urls +
   xmpp_urls +
   search_urls
-)
+)))
@@ -0,0 +1,71 @@
+import json
+
+import webapp2
+
+from google.appengine.api import namespace_manager
+from google.appengine.api import search
+from google.appengine.ext import db
+
+# Number of keys or document IDs removed by a single call.
+BATCH_SIZE = 200
+
+
+def remove_entities():
+  """ Removes entities of all kinds from the current namespace.
+
+  Returns:
+    An integer - number of removed entities.
+  """
+  removed = 0
+  while True:
+    # Kindless query returns keys of all user entities in namespace.
+    keys = db.Query(keys_only=True).fetch(BATCH_SIZE)
+    if not keys:
+      return removed
+    db.delete(keys)
+    removed += len(keys)
+
+
+def remove_documents(namespace):
+  """ Removes documents of all search indexes in the namespace.
+
+  Args:
+    namespace: A string - name of namespace to clean.
+  Returns:
+    An integer - number of removed documents.
+  """
+  removed = 0
+  for index in search.get_indexes(namespace=namespace, limit=1000).results:
+    while True:
+      doc_ids = [document.doc_id for document
+                 in index.get_range(ids_only=True, limit=BATCH_SIZE)]
+      if not doc_ids:
+        break
+      index.delete(doc_ids)
+      removed += len(doc_ids)
+  return removed
+
+
+class NamespaceHandler(webapp2.RequestHandler):
+  """ Removes data left by test suite in its namespace.
+
+  Memcache doesn't allow to flush a single namespace,
+  so namespaced memcache items are left to be evicted.
+  """
+  def delete(self):
+    namespace = namespace_manager.get_namespace()
+    if not namespace:
+      self.response.set_status(400)
+      self.response.out.write('Refusing to clean default namespace')
+      return
+    self.response.headers['Content-Type'] = 'application/json'
+    self.response.out.write(json.dumps({
+      'namespace': namespace,
+      'entities': remove_entities(),
+      'documents': remove_documents(namespace)
+    }))
+
+
+urls = [
+  ('/python/_hawkeye/namespace', NamespaceHandler),
+]
@@ -0,0 +1,105 @@
+import json
+import os
+import threading
+import time
+
+import webapp2
+
+# Max number of routes to keep aggregates of. Routes come from urls lists,
+# so the limit is only hit if routes are added dynamically.
+MAX_ROUTES = 500
+
+# Route of requests which didn't match any route (or were not matched yet).
+UNMATCHED_ROUTE = '(unmatched)'
+
+# Route of requests which didn't fit into MAX_ROUTES.
+OTHER_ROUTE = '(other)'
+
+# Path of stats endpoint (its requests are not aggregated).
+STATS_PATH = '/python/_hawkeye/stats'
+
+
+class RouteStats(object):
+  """ Aggregated RPCs of requests handled by a single route. """
+
+  def __init__(self):
+    self.requests = 0
+    self.services = {}
+
+  def add(self, timings):
+    """ Adds RPCs of a finished request.
+
+    Args:
+      timings: A server_timing.RequestTimings object.
+    """
+    self.requests += 1
+    for service, count in timings.rpc_counts.iteritems():
+      stats = self.services.setdefault(service, {
+        'calls': 0, 'request_bytes': 0, 'response_bytes': 0,
+        'total_ms': 0.0, 'max_ms': 0.0
+      })
+      stats['calls'] += count
+      stats['request_bytes'] += timings.rpc_request_bytes[service]
+      stats['response_bytes'] += timings.rpc_response_bytes[service]
+      stats['total_ms'] += timings.rpc_durations[service] * 1000
+      stats['max_ms'] = max(stats['max_ms'],
+                            timings.rpc_max_durations[service] * 1000)
+
+  def to_dict(self):
+    return {'requests': self.requests, 'rpcs': self.services}
+
+
+class RpcStats(object):
+  """ In-memory per-instance aggregates of RPCs grouped by route. """
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self.reset()
+
+  def reset(self):
+    with self._lock:
+      self._routes = {}
+      self._since = time.time()
+
+  def record(self, route, timings):
+    """ Adds RPCs of a finished request to aggregates of its route.
+
+    Args:
+      route: A string - template of matched route or None.
+      timings: A server_timing.RequestTimings object.
+    """
+    route = route or UNMATCHED_ROUTE
+    with self._lock:
+      if route not in self._routes and len(self._routes) >= MAX_ROUTES:
+        route = OTHER_ROUTE
+      self._routes.setdefault(route, RouteStats()).add(timings)
+
+  def to_dict(self):
+    with self._lock:
+      return {
+        'instance': os.environ.get('INSTANCE_ID'),
+        'since': self._since,
+        'routes': {route: stats.to_dict()
+                   for route, stats in self._routes.iteritems()}
+      }
+
+
+stats = RpcStats()
+
+
+class StatsHandler(webapp2.RequestHandler):
+  """ Reports RPCs made by requests handled by this instance
+  (grouped by route) or resets them.
+  """
+  def get(self):
+    self.response.headers['Content-Type'] = 'application/json'
+    self.response.out.write(json.dumps(stats.to_dict()))
+
+  def delete(self):
+    stats.reset()
+    self.response.set_status(204)
+
+
+urls = [
+  (STATS_PATH, StatsHandler),
+]
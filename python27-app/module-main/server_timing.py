@@ -0,0 +1,129 @@
+import collections
+import threading
+import time
+
+import webapp2
+from google.appengine.api import apiproxy_stub_map
+
+import rpc_stats
+
+# Hawkeye sends this header when it wants to get server timing of request.
+REQUEST_HEADER_ENV = 'HTTP_X_HAWKEYE_SERVER_TIMING'
+
+# Response header with timings (see https://www.w3.org/TR/server-timing/).
+RESPONSE_HEADER = 'Server-Timing'
+
+# API services which RPCs are timed.
+TIMED_SERVICES = ('datastore_v3', 'memcache', 'taskqueue', 'search')
+
+# Keeps RequestTimings of request handled by current thread.
+_local = threading.local()
+
+
+class RequestTimings(object):
+  """ Handler wall time, matched route and RPCs of a single request. """
+
+  def __init__(self):
+    self.started_at = time.time()
+    self.route = None
+    self.rpc_durations = collections.defaultdict(float)
+    self.rpc_max_durations = collections.defaultdict(float)
+    self.rpc_counts = collections.defaultdict(int)
+    self.rpc_request_bytes = collections.defaultdict(int)
+    self.rpc_response_bytes = collections.defaultdict(int)
+    self.rpc_starts = {}
+
+  def header_value(self):
+    """ Renders Server-Timing header value with durations in milliseconds.
+
+    Returns:
+      A string like 'handler;dur=12.1, datastore_v3;dur=8.3;desc="2 calls"'.
+    """
+    metrics = ['handler;dur={:.1f}'.format(
+      (time.time() - self.started_at) * 1000)]
+    for service in sorted(self.rpc_durations):
+      metrics.append('{service};dur={dur:.1f};desc="{count} calls"'.format(
+        service=service, dur=self.rpc_durations[service] * 1000,
+        count=self.rpc_counts[service]))
+    return ', '.join(metrics)
+
+
+def _byte_size(message):
+  try:
+    return message.ByteSize()
+  except Exception:
+    return 0
+
+
+def _pre_call_hook(service, call, request, response):
+  timings = getattr(_local, 'timings', None)
+  if timings is not None:
+    timings.rpc_starts[id(response)] = time.time()
+
+
+def _post_call_hook(service, call, request, response):
+  timings = getattr(_local, 'timings', None)
+  if timings is None:
+    return
+  started_at = timings.rpc_starts.pop(id(response), None)
+  if started_at is not None:
+    duration = time.time() - started_at
+    timings.rpc_durations[service] += duration
+    timings.rpc_max_durations[service] = max(
+      timings.rpc_max_durations[service], duration)
+    timings.rpc_counts[service] += 1
+    timings.rpc_request_bytes[service] += _byte_size(request)
+    timings.rpc_response_bytes[service] += _byte_size(response)
+
+
+def _route_matcher(router, request):
+  """ Matches request as webapp2 does and remembers template
+  of matched route, so RPCs are grouped by route in rpc_stats.
+  """
+  match = webapp2.Router.default_matcher(router, request)
+  timings = getattr(_local, 'timings', None)
+  if timings is not None:
+    timings.route = match[0].template
+  return match
+
+
+for _service in TIMED_SERVICES:
+  apiproxy_stub_map.apiproxy.GetPreCallHooks().Append(
+    'server_timing_' + _service, _pre_call_hook, _service)
+  apiproxy_stub_map.apiproxy.GetPostCallHooks().Append(
+    'server_timing_' + _service, _post_call_hook, _service)
+
+
+class ServerTimingMiddleware(object):
+  """ Times datastore, memcache, taskqueue and search RPCs of every request
+  and adds them to per-route aggregates of rpc_stats.
+
+  Responses to requests which have X-Hawkeye-Server-Timing header get
+  Server-Timing header with handler wall time and durations of RPCs.
+  """
+  def __init__(self, app):
+    """
+    Args:
+      app: A webapp2.WSGIApplication object.
+    """
+    self.app = app
+    app.router.set_matcher(_route_matcher)
+
+  def __call__(self, environ, start_response):
+    timings = RequestTimings()
+    report_timing = REQUEST_HEADER_ENV in environ
+
+    def timed_start_response(status, headers, exc_info=None):
+      # webapp2 starts response when handler is done
+      if report_timing:
+        headers = list(headers)
+        headers.append((RESPONSE_HEADER, timings.header_value()))
+      return start_response(status, headers, exc_info)
+
+    _local.timings = timings
+    try:
+      return self.app(environ, timed_start_response)
+    finally:
+      _local.timings = None
+      if environ.get('PATH_INFO') != rpc_stats.STATS_PATH:
+        rpc_stats.stats.record(timings.route, timings)
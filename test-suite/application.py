@@ -1,5 +1,10 @@
+import functools
+
+from concurrent.futures import Future
+
 from application_versions import AppVersion
-from hawkeye_utils import hawkeye_request
+from hawkeye_cassette import exchange_key
+from hawkeye_utils import hawkeye_request, AsyncHTTPEngine
 
 
 class UnknownVersion(Exception):
@@ -19,11 +24,50 @@ class Application(object):
   It's based on requests library and is actually some kind of proxy for it.
   """
 
-  def __init__(self, app_id, url_builder):
+  # Header which tells python application to scope its data by namespace.
+  NAMESPACE_HEADER = 'X-Hawkeye-Namespace'
+
+  # Header which asks application to report server-side timings
+  # of request in Server-Timing response header.
+  SERVER_TIMING_HEADER = 'X-Hawkeye-Server-Timing'
+
+  def __init__(self, app_id, url_builder, namespace=None, async_engine=None,
+               cassette=None, health=None):
+    """
+    Args:
+      app_id: A string - application ID.
+      url_builder: An AppURLBuilder object.
+      namespace: A string - namespace to isolate application data in
+        (None means default namespace).
+      async_engine: An AsyncHTTPEngine object to send asynchronous requests
+        with (a new one is created if it's None).
+      cassette: A hawkeye_cassette.Cassette object to record responses to
+        or to replay responses from (instead of sending requests).
+      health: A hawkeye_health.HealthMonitor object - requests to versions
+        which are down fail immediately with VersionUnavailable.
+    """
     self.app_id = app_id
     self._url_builder = url_builder
+    self.namespace = namespace
+    self._async_engine = async_engine or AsyncHTTPEngine()
+    self._cassette = cassette
+    self._health = health
+
+  def with_namespace(self, namespace):
+    """
+    Creates Application object which sends all requests with namespace header.
+    Asynchronous requests of both objects share the same engine.
+
+    Args:
+      namespace: A string - name of namespace.
+    Returns:
+      An Application object.
+    """
+    return Application(self.app_id, self._url_builder, namespace,
+                       self._async_engine, self._cassette, self._health)
 
-  def get(self, path, module=None, version=None, https=False, **kwargs):
+  def get(self, path, module=None, version=None, https=False, digest=None,
+          **kwargs):
     """
     Sends GET request to specified module and version of application.
     If module or version are missing, then default one will be used.
@@ -34,10 +78,16 @@ class Application(object):
       module: A string - identifies which module should be used.
       version: A string - identifies which version of module should be used.
       https: A boolean - determines if https should be used.
+      digest: A string - name of hashlib algorithm (e.g. 'md5'). If it's
+        specified, body is streamed and only its digest, length and prefix
+        are kept (response.body_digest, body_length and body_prefix),
+        so large downloads take constant memory.
       kwargs: kwargs to be passed to requests.get function.
     Returns:
        request.Response object.
     """
+    if digest:
+      kwargs['digest'] = digest
     return self.request('get', path, module, version, https, **kwargs)
 
   def post(self, path, module=None, version=None, https=False, **kwargs):
@@ -107,9 +157,176 @@ class Application(object):
       kwargs: kwargs to be passed to requests.delete function.
     Returns:
        request.Response object.
+    Raises:
+      VersionUnavailable: If version is known to be down.
     """
     url = self.build_url(path, module, version, https)
-    return hawkeye_request(method, url, **kwargs)
+    kwargs = self._with_hawkeye_headers(kwargs)
+    if self._cassette and self._cassette.replaying:
+      key = exchange_key(method, path, module, version, https, kwargs)
+      return self._cassette.replay(key)
+
+    base_url = self._check_health(module, version, https)
+    try:
+      response = hawkeye_request(method, url, **kwargs)
+    except Exception as error:
+      self._report_health(base_url, error)
+      raise
+    self._report_health(base_url)
+    if self._cassette:
+      key = exchange_key(method, path, module, version, https, kwargs)
+      self._cassette.record(key, response)
+    return response
+
+  def aget(self, path, module=None, version=None, https=False, **kwargs):
+    """
+    Schedules GET request to specified module and version of application.
+
+    Args:
+      path: A string - path to http method. It can contain '{lang}'
+        which will be replaced with application language.
+      module: A string - identifies which module should be used.
+      version: A string - identifies which version of module should be used.
+      https: A boolean - determines if https should be used.
+      kwargs: kwargs to be passed to requests.get function.
+    Returns:
+       concurrent.futures.Future which result is request.Response object.
+    """
+    return self.arequest('get', path, module, version, https, **kwargs)
+
+  def apost(self, path, module=None, version=None, https=False, **kwargs):
+    """
+    Schedules POST request to specified module and version of application.
+
+    Args:
+      path: A string - path to http method. It can contain '{lang}'
+        which will be replaced with application language.
+      module: A string - identifies which module should be used.
+      version: A string - identifies which version of module should be used.
+      https: A boolean - determines if https should be used.
+      kwargs: kwargs to be passed to requests.post function.
+    Returns:
+       concurrent.futures.Future which result is request.Response object.
+    """
+    return self.arequest('post', path, module, version, https, **kwargs)
+
+  def aput(self, path, module=None, version=None, https=False, **kwargs):
+    """
+    Schedules PUT request to specified module and version of application.
+
+    Args:
+      path: A string - path to http method. It can contain '{lang}'
+        which will be replaced with application language.
+      module: A string - identifies which module should be used.
+      version: A string - identifies which version of module should be used.
+      https: A boolean - determines if https should be used.
+      kwargs: kwargs to be passed to requests.put function.
+    Returns:
+       concurrent.futures.Future which result is request.Response object.
+    """
+    return self.arequest('put', path, module, version, https, **kwargs)
+
+  def adelete(self, path, module=None, version=None, https=False, **kwargs):
+    """
+    Schedules DELETE request to specified module and version of application.
+
+    Args:
+      path: A string - path to http method. It can contain '{lang}'
+        which will be replaced with application language.
+      module: A string - identifies which module should be used.
+      version: A string - identifies which version of module should be used.
+      https: A boolean - determines if https should be used.
+      kwargs: kwargs to be passed to requests.delete function.
+    Returns:
+       concurrent.futures.Future which result is request.Response object.
+    """
+    return self.arequest('delete', path, module, version, https, **kwargs)
+
+  def arequest(self, method, path, module=None, version=None,
+               https=False, **kwargs):
+    """
+    Schedules request to specified module and version of application.
+    Requests are sent by a bounded pool of workers over keep-alive
+    connections, so many requests can be in flight without opening
+    a thread and a connection per request.
+
+    Args:
+      method: A string - represents HTTP methods.
+      path: A string - path to http method. It can contain '{lang}'
+        which will be replaced with application language.
+      module: A string - identifies which module should be used.
+      version: A string - identifies which version of module should be used.
+      https: A boolean - determines if https should be used.
+      kwargs: kwargs to be passed to requests.request function.
+    Returns:
+       concurrent.futures.Future which result is request.Response object.
+    Raises:
+      VersionUnavailable: If version is known to be down.
+    """
+    url = self.build_url(path, module, version, https)
+    kwargs = self._with_hawkeye_headers(kwargs)
+    if self._cassette and self._cassette.replaying:
+      key = exchange_key(method, path, module, version, https, kwargs)
+      future = Future()
+      try:
+        future.set_result(self._cassette.replay(key))
+      except Exception as error:
+        future.set_exception(error)
+      return future
+
+    base_url = self._check_health(module, version, https)
+    on_response = None
+    if self._cassette:
+      # Response is recorded before the future is resolved, so it's saved
+      # even if cassette is closed right after the result is received
+      key = exchange_key(method, path, module, version, https, kwargs)
+      on_response = functools.partial(self._cassette.record, key)
+    future = self._async_engine.submit(method, url, on_response=on_response,
+                                       **kwargs)
+    future.add_done_callback(
+      lambda done: self._report_health(base_url, done.exception()))
+    return future
+
+  def _check_health(self, module, version, https):
+    """
+    Fails fast if version is known to be down.
+
+    Args:
+      module: A string - module name or None.
+      version: A string - version name or None.
+      https: A boolean - determines if https is used.
+    Returns:
+      A string - base URL of the version (None if health isn't monitored).
+    Raises:
+      VersionUnavailable: If version is known to be down.
+    """
+    if not self._health:
+      return None
+    base_url = self._url_builder.get_base_url(
+      self.app_id, module, version, https)
+    self._health.check(base_url)
+    return base_url
+
+  def _report_health(self, base_url, error=None):
+    if self._health:
+      self._health.report(base_url, error)
+
+  def _with_hawkeye_headers(self, kwargs):
+    """
+    Adds server timing header and namespace header (if namespace is set)
+    to request kwargs.
+
+    Args:
+      kwargs: A dict - kwargs to be passed to requests.request function.
+    Returns:
+      A dict - kwargs with headers containing hawkeye headers.
+    """
+    kwargs = dict(kwargs)
+    kwargs['headers'] = dict(kwargs.get('headers') or {})
+    kwargs['headers'][self.SERVER_TIMING_HEADER] = '1'
+    if self.namespace:
+      kwargs['headers'][self.NAMESPACE_HEADER] = self.namespace
+    return kwargs
 
   def build_url(self, path, module=None, version=None, https=True):
     """
@@ -218,7 +435,23 @@ class AppURLBuilder(object):
     """
     # Allow testcases to leave a placeholder for language in path
     path = path.format(lang=self.language)
+    base_url = self.get_base_url(app_id, module, version, https)
+    return "{base}/{path}".format(
+      base=base_url.rstrip("/"), path=path.lstrip("/"))
 
+  def get_base_url(self, app_id, module, version, https):
+    """
+    Finds base URL of specific version.
+
+    Args:
+      app_id: A string - application ID of running app.
+      module: A string - module name or None for default module.
+      version: A string - version name or None for default version.
+      https: A boolean - shows if https should be used instead of http.
+
+    Returns:
+      Base URL, e.g. "https://192.168.33.10:8082".
+    """
     # Get full (or short if module/version is None) name of specific version
     version_full_name = AppVersion.get_version_alias(app_id, module, version)
 
@@ -231,8 +464,12 @@ class AppURLBuilder(object):
       )
 
     if https:
-      base_url = app_version.https_url
-    else:
-      base_url = app_version.http_url
-    return "{base}/{path}".format(
-      base=base_url.rstrip("/"), path=path.lstrip("/"))
+      return app_version.https_url
+    return app_version.http_url
+
+  @property
+  def base_urls(self):
+    """ A list of base URLs of all known versions. """
+    return sorted(
+      {url for app_version in self._versions_dict.itervalues()
+       for url in (app_version.http_url, app_version.https_url)})
@@ -2,14 +2,19 @@
 """hawkeye.py: Run API fidelity tests on AppScale.
 
 Usage:
-  hawkeye.py --app APP_ID --versions-csv FILE [options]
+  hawkeye.py --app APP_ID (--versions-csv FILE | --replay DIR) [options]
+  hawkeye.py merge [options] SHARD_CSV...
+  hawkeye.py list [options]
   hawkeye.py (-h | --help)
 
 Options:
   -h, --help           # show this help message and exit
   --app=APP_ID         # Application ID to test
   --versions-csv FILE  # File containing http and https URL to app versions
-  -l LANG --lang=LANG  # Language binding to test (python or java) [default: python]
+                       # (see multi-language run below)
+  -l LANG --lang=LANG  # Language binding to test (python or java). Run
+                       # accepts comma separated list of languages
+                       # (e.g. python,java) [default: python]
   --user=USER          # Admin username [default: a@a.com]
   --pass=PASSWORD      # Admin password [default: aaaaaa]
   -c, --console        # Log errors and failures to console
@@ -18,37 +23,210 @@ Options:
   --baseline           # Turn on verbose reporting for baseline comparison
   --log-dir=BASE_DIR   # Directory to store error logs
   --keep-old-logs      # Keep existing hawkeye logs
+  --log-queue=N        # Max number of log records waiting to be written to
+                       # detailed log [default: 10000]
+  --log-overflow=POLICY  # What to do when log queue is full: block tests
+                         # or drop records (block or drop) [default: block]
+  --no-capture         # Don't save requests to capture file
+                       # (see hawkeye_capture.py)
+  --record=DIR         # Save responses of application to cassette directory
+  --replay=DIR         # Serve responses from cassette directory (saved
+                       # using --record) instead of sending requests
+  --shard=SHARD        # Run only I-th of N shards of tests (e.g.: 2/3)
+  --output=FILE        # File to save tests statuses to (hawkeye_output.csv
+                       # or hawkeye_output_<I>_of_<N>.csv by default)
+  --test-workers=N     # Max number of concurrently running tests of suites
+                       # which allow it [default: 1]
+  --suite-workers=N    # Max number of concurrently running suites
+                       # (python only) [default: 1]
+  --budget-factor=F    # Report succeeded tests which took more than F times
+                       # their performance budget [default: 1.0]
+  --slowest=N          # Number of slowest tests to list in summary
+                       # (0 to hide the list) [default: 10]
+  --history=FILE       # File with durations of previous runs which is used
+                       # to run the slowest suites and tests first
+                       # (hawkeye_history_<LANG>.json by default)
+  --request-budget=N   # Max number of requests sent at once (shared by
+                       # all languages of multi-language run)
+  --connect-timeout=S  # Default connect timeout of requests in seconds
+                       # [default: 10]
+  --read-timeout=S     # Default read timeout of requests in seconds
+                       # [default: 120]
+  --test-deadline=S    # Default max seconds a test can take including
+                       # its poll loops [default: 600]
+  --profile            # Profile hawkeye itself
+                       # (saved to hawkeye-logs/profile-<LANG>)
+  --probe-interval=S   # Seconds between health probes of every app version
+                       # (0 to always send requests to versions which are
+                       # down) [default: 10]
+
+Data of python test suites is isolated in per-run, per-suite namespaces
+which are cleaned up when tests are finished.
+
+Replayed run doesn't need AppScale deployment. Only requests sent through
+Application object are recorded, so tests which send requests in other
+ways still need the deployment.
+
+Durations of tests are saved next to the output file
+(e.g. hawkeye_output_durations.csv).
+
+Baseline rows can contain optional performance budgets (in seconds) of test
+duration and of latency of its slowest HTTP request:
+  <test_id>,<status>[,<max_duration>[,<max_latency>]]
+
+Multi-language run (e.g. --lang python,java) tests every language in its
+own process concurrently. --app and --versions-csv take either a comma
+separated list of values (one per language) or a template with {lang}
+placeholder (e.g. --versions-csv versions_{lang}.csv). Output, durations,
+history and cassette of every language get _<LANG> suffix
+(e.g. hawkeye_output_java.csv) and statuses, durations and latencies of
+all languages are saved side by side to hawkeye_output_combined.csv.
+
+Suites and tests can override default timeouts (see request_timeout and
+deadline of HawkeyeTestSuite, REQUEST_TIMEOUT and DEADLINE of
+HawkeyeTestCase). Tests which exceed their deadline or request timeout
+get TIMEOUT status.
+
+Profiled run (--profile) saves profile of tests of every suite
+(<suite>.pstats), memory allocated by every suite (<suite>.memory.txt)
+and stacks of all hawkeye threads sampled during the run in collapsed
+format read by flamegraph tools (stacks.collapsed). Tests discovery is
+profiled to discovery.pstats.
+
+Python application reports RPCs made by its handlers. They are scraped
+before and after every suite, average number of RPCs per request of
+every suite is printed and RPCs of every route are saved next to the
+output file (e.g. hawkeye_output_rpc_stats.csv). They aren't collected
+when suites run concurrently (--suite-workers > 1).
+
+Requests to app version which doesn't respond (3 connection failures in a
+row) fail immediately with VersionUnavailable error until the version
+responds to a health probe again.
+
+Benchmarks suite is run only if it's listed in --suites (for example
+with --suites benchmarks). Measurements of benchmarks are printed in
+summary and saved next to the output file (e.g. hawkeye_output_benchmarks.csv).
+
+List command prints suite and ID of every test which a run with the same
+options would execute, in the order they would be started.
+
+Merge command combines shard reports (produced by runs with --shard option)
+into one report, saves it and compares it to the baseline.
 """
 import csv
+import importlib
+import logging
+import multiprocessing
 import os
 import sys
+import uuid
 
 import docopt
 
 import hawkeye_utils
+from hawkeye_cassette import Cassette
+from hawkeye_health import HealthMonitor
+from hawkeye_rpc_stats import RpcStatsCollector, print_rpc_stats, \
+  save_rpc_stats_to_csv
+from hawkeye_utils import QueuedHandler
+from hawkeye_history import RunHistory, RunProgress
+from hawkeye_profile import RunProfiler
 from application import Application, AppURLBuilder
 from application_versions import AppVersion
 from hawkeye_test_runner import HawkeyeSuitesRunner, save_report_dict_to_csv, \
-  DeprecatedHawkeyeTestCase
+  DeprecatedHawkeyeTestCase, select_shard, merge_report_csv_files, \
+  save_timings_to_csv, save_cross_language_report, \
+  save_server_timings_to_csv, save_metrics_to_csv
 
 if not sys.version_info[:2] > (2, 6):
   raise RuntimeError("Hawkeye will only run with Python 2.7 or newer.")
 
-from tests import (
-  app_identity_tests, datastore_tests, ndb_tests, memcache_tests,
-  taskqueue_tests, blobstore_tests, user_tests, images_tests, secure_url_tests,
-  xmpp_tests, environment_variable_tests, async_datastore_tests, cron_tests,
-  logservice_tests, modules_tests, runtime_tests, urlfetch_tests, warmup_tests,
-  search_tests
-)
-
 SUPPORTED_LANGUAGES = ['java', 'python', 'go', 'php']
 
+# Modules defining suite(lang, app) function for every suite. A module is
+# imported only when its suite is selected.
+SUITE_MODULES = {
+  'app_identity': 'tests.app_identity_tests',
+  'async_datastore': 'tests.async_datastore_tests',
+  'benchmarks': 'tests.benchmark_tests',
+  'blobstore': 'tests.blobstore_tests',
+  'cron': 'tests.cron_tests',
+  'datastore': 'tests.datastore_tests',
+  'env_var': 'tests.environment_variable_tests',
+  'images': 'tests.images_tests',
+  'logservice': 'tests.logservice_tests',
+  'memcache': 'tests.memcache_tests',
+  'modules': 'tests.modules_tests',
+  'ndb': 'tests.ndb_tests',
+  'runtime': 'tests.runtime_tests',
+  'search': 'tests.search_tests',
+  'secure_url': 'tests.secure_url_tests',
+  'taskqueue': 'tests.taskqueue_tests',
+  'urlfetch': 'tests.urlfetch_tests',
+  'users': 'tests.user_tests',
+  'warmup': 'tests.warmup_tests',
+  'xmpp': 'tests.xmpp_tests',
+}
+
+# Languages which application scopes data by namespace sent by hawkeye.
+NAMESPACED_LANGUAGES = ['python']
+
+# Suites which verify data written by requests not sent by hawkeye
+# (cron jobs, inbound messages, warmup requests), so it stays in
+# the default namespace.
+NOT_ISOLATED_SUITES = ['cron', 'xmpp', 'warmup']
+
+# Suites which are run only if they are listed in --suites
+# (benchmarks take long and don't verify API fidelity).
+OPT_IN_SUITES = ['benchmarks']
+
+
+def select_suite_names(include, exclude):
+  """
+  Based on include and exclude filters, selects names of suites to run.
+
+  Args:
+    include: A list of str - suites to return (use empty list to include all).
+    exclude: A list of str - suites to skip
+      ('exclude' is ignored if 'include' is specified). Suites from
+      OPT_IN_SUITES are skipped unless they are included.
+
+  Returns:
+    a list of suite names (warmup suite goes first).
+  """
+  # Validation include and exclude lists
+  for suite_name in include + exclude:
+    if suite_name not in SUITE_MODULES:
+      print_usage_and_exit("Unknown suite '{}'. Suite can be one of {}"
+                           .format(suite_name, sorted(SUITE_MODULES)))
+
+  if include:
+    names = [name for name in SUITE_MODULES if name in include]
+  else:
+    names = [name for name in SUITE_MODULES
+             if name not in exclude and name not in OPT_IN_SUITES]
+  if 'warmup' in names:
+    names.remove('warmup')
+    names.insert(0, 'warmup')
+  if not names:
+    print_usage_and_exit('Must specify at least one suite to execute')
+  return names
+
+
+def import_suite_module(suite_name):
+  """
+  Args:
+    suite_name: A string - name of suite (key of SUITE_MODULES).
+  Returns:
+    A module with suite(lang, app) function.
+  """
+  return importlib.import_module(SUITE_MODULES[suite_name])
+
 
-def build_suites_list(lang, include, exclude, application):
+def build_suites_list(lang, include, exclude, application, run_id=None):
   """
   Based on language, include and exclude filters, build list of
-  HawkeyeTestSuite objects.
+  HawkeyeTestSuite objects. Only modules of selected suites are imported.
 
   Args:
     lang: A string representing language to test ('python' or 'java').
@@ -57,51 +235,164 @@ def build_suites_list(lang, include, exclude, application):
       ('exclude' is ignored if 'include' is specified).
     application: An Application object - wraps requests library and provides
       api for access to testing AppEngine application.
+    run_id: A string - unique ID of tests run. If it's specified and
+      application of the language supports it, every suite gets
+      its own namespace.
 
   Returns:
     a list of HawkeyeTestSuite for specified language.
   """
-  defined_suites  = {
-    'app_identity': app_identity_tests.suite(lang, application),
-    'blobstore' : blobstore_tests.suite(lang, application),
-    'datastore' : datastore_tests.suite(lang, application),
-    'async_datastore' : async_datastore_tests.suite(lang, application),
-    'env_var' : environment_variable_tests.suite(lang, application),
-    'images' : images_tests.suite(lang, application),
-    'memcache' : memcache_tests.suite(lang, application),
-    'ndb' : ndb_tests.suite(lang, application),
-    'secure_url' : secure_url_tests.suite(lang, application),
-    'taskqueue' : taskqueue_tests.suite(lang, application),
-    'urlfetch': urlfetch_tests.suite(lang, application),
-    'users' : user_tests.suite(lang, application),
-    'xmpp' : xmpp_tests.suite(lang, application),
-    'cron' : cron_tests.suite(lang, application),
-    'logservice': logservice_tests.suite(lang, application),
-    'modules' : modules_tests.suite(lang, application),
-    'runtime': runtime_tests.suite(lang, application),
-    'search': search_tests.suite(lang, application),
-  }
-  # Validation include and exclude lists
-  for suite_name in include + exclude:
-    if suite_name not in defined_suites:
-      print_usage_and_exit("Unknown suite '{}'. Suite can be one of {}"
-                           .format(suite_name, defined_suites.keys()))
+  def suite_app(suite_name):
+    if (run_id is None or lang not in NAMESPACED_LANGUAGES
+        or suite_name in NOT_ISOLATED_SUITES):
+      return application
+    namespace = "hawkeye-{run_id}-{suite}".format(run_id=run_id,
+                                                 suite=suite_name)
+    return application.with_namespace(namespace)
 
-  if include:
-    suites = [suite for suite_name, suite in defined_suites.iteritems()
-              if suite_name in include]
-    if 'warmup' in include and 'warmup' not in exclude:
-      warmup = warmup_tests.suite(lang, application)
-      suites.insert(0, warmup)
-  else:
-    suites = [suite for suite_name, suite in defined_suites.iteritems()
-              if suite_name not in exclude]
-    if 'warmup' not in exclude:
-      warmup = warmup_tests.suite(lang, application)
-      suites.insert(0, warmup)
-  if not suites:
-    print_usage_and_exit('Must specify at least one suite to execute')
-  return suites
+  return [import_suite_module(name).suite(lang, suite_app(name))
+          for name in select_suite_names(include, exclude)]
+
+
+def order_suites(hawkeye_suites, history):
+  """
+  Orders suites (and tests of concurrent suites) the way they are run:
+  warmup suite first, then the slowest suites according to history.
+
+  Args:
+    hawkeye_suites: A list of HawkeyeTestSuite objects.
+    history: A RunHistory object.
+  Returns:
+    A new list of HawkeyeTestSuite objects.
+  """
+  # Warmup suite checks the very first requests, so it always goes first
+  warmup = [suite for suite in hawkeye_suites if suite.short_name == 'warmup']
+  return warmup + history.order_suites(
+    [suite for suite in hawkeye_suites if suite.short_name != 'warmup'])
+
+
+def parse_shard(shard_opt):
+  """
+  Parses shard option.
+
+  Args:
+    shard_opt: A string like "2/3" (1-based shard number and number of shards).
+  Returns:
+    A tuple (0-based shard index, number of shards).
+  """
+  try:
+    number, count = [int(part) for part in shard_opt.split('/')]
+  except ValueError:
+    print_usage_and_exit("Shard should be specified as I/N (e.g.: 2/3), "
+                         "but '{}' was given".format(shard_opt))
+  if count < 1 or not 1 <= number <= count:
+    print_usage_and_exit("Shard number should be between 1 and {count}"
+                         .format(count=count))
+  return number - 1, count
+
+
+def parse_positive_number(option_name, value, number_type=int):
+  """
+  Parses numeric option and exits with usage message if it is invalid.
+
+  Args:
+    option_name: A string - name of option to mention in error message.
+    value: A string - value passed in command line.
+    number_type: A type to convert value to (int or float).
+  Returns:
+    A positive number of number_type.
+  """
+  try:
+    number = number_type(value)
+  except ValueError:
+    number = 0
+  if number <= 0:
+    print_usage_and_exit("{option} should be a positive {type}, but '{value}' "
+                         "was given".format(option=option_name, value=value,
+                                            type=number_type.__name__))
+  return number
+
+
+def parse_non_negative_number(option_name, value, number_type=int):
+  """
+  Parses numeric option which can be 0 and exits with usage message
+  if it is invalid.
+
+  Args:
+    option_name: A string - name of option to mention in error message.
+    value: A string - value passed in command line.
+    number_type: A type to convert value to (int or float).
+  Returns:
+    A non-negative number of number_type.
+  """
+  try:
+    number = number_type(value)
+  except ValueError:
+    number = -1
+  if number < 0:
+    print_usage_and_exit("{option} should be a non-negative {type}, but "
+                         "'{value}' was given"
+                         .format(option=option_name, value=value,
+                                 type=number_type.__name__))
+  return number
+
+
+def parse_languages(lang_opt):
+  """
+  Parses language option.
+
+  Args:
+    lang_opt: A string - comma separated list of languages.
+  Returns:
+    A list of languages to test.
+  """
+  languages = lang_opt.split(',')
+  for language in languages:
+    validate_language(language)
+  if len(set(languages)) != len(languages):
+    print_usage_and_exit("Every language should be specified only once")
+  return languages
+
+
+def per_language_values(option_name, value, languages):
+  """
+  Splits value of option which can be specified for every language.
+
+  Args:
+    option_name: A string - name of option to mention in error message.
+    value: A string - a template with {lang} placeholder, a comma separated
+      list of values (one per language) or a single value for all languages.
+    languages: A list of languages to test.
+  Returns:
+    A dict (<language>: <value>).
+  """
+  if value is None:
+    return {language: None for language in languages}
+  if '{lang}' in value:
+    return {language: value.format(lang=language) for language in languages}
+  values = value.split(',')
+  if len(values) == 1:
+    return {language: value for language in languages}
+  if len(values) != len(languages):
+    print_usage_and_exit("{option} should have one value per language "
+                         "({count} values), but {given} were given"
+                         .format(option=option_name, count=len(languages),
+                                 given=len(values)))
+  return dict(zip(languages, values))
+
+
+def language_file_name(file_name, language):
+  """
+  Makes name of file specific for language of multi-language run.
+
+  Args:
+    file_name: A string - name of file (e.g. hawkeye_output.csv).
+    language: A string - language or other suffix.
+  Returns:
+    A string like hawkeye_output_java.csv.
+  """
+  base, ext = os.path.splitext(file_name)
+  return "{base}_{lang}{ext}".format(base=base, lang=language, ext=ext)
 
 
 def print_usage_and_exit(msg):
@@ -116,6 +407,26 @@ def print_usage_and_exit(msg):
   exit(1)
 
 
+def check_usage_options(doc):
+  """
+  Makes sure that every option is described once in usage doc. Docopt
+  takes every line of the doc which starts with a dash for an option
+  description, so a prose line starting with an option name defines it
+  again and docopt rejects the option as ambiguous.
+
+  Args:
+    doc: A string - usage doc.
+  Raises:
+    ValueError: If some options are described more than once.
+  """
+  names = [option.long or option.short
+           for option in docopt.parse_defaults(doc)]
+  duplicates = sorted(set(name for name in names if names.count(name) > 1))
+  if duplicates:
+    raise ValueError("Options are described more than once in usage doc: "
+                     "{}".format(", ".join(duplicates)))
+
+
 class HawkeyeParameters(object):
   """
   Container of parameters which are used to configure
@@ -128,25 +439,80 @@ class HawkeyeParameters(object):
     self.baseline_verbosity = None
     self.baseline_file = None
     self.log_dir = None
+    self.log_queue_size = None
+    self.log_overflow = None
+    self.capture = None
     self.output_file = None
-
-
-def process_command_line_options():
+    self.combined_output_file = None
+    self.test_workers = None
+    self.suite_workers = None
+    self.budget_factor = None
+    self.slowest_count = None
+    self.durations_file = None
+    self.server_timing_file = None
+    self.history_file = None
+    self.history = None
+    self.cassette = None
+    self.health = None
+    self.request_timeout = None
+    self.test_deadline = None
+    self.profiler = None
+    self.rpc_stats = None
+    self.rpc_stats_file = None
+    self.metrics_file = None
+    self.isolated_apps = None
+
+
+def validate_language(language):
   """
-  Validates and processes command line arguments. Builds HawkeyeParameters.
+  Exits with usage message if language is not supported.
 
-  Returns:
-    An instance of HawkeyeParameters with filled attributres.
+  Args:
+    language: A string - language passed in command line.
   """
-  options = docopt.docopt(__doc__)
-
-  # Validate language
-  language = options["--lang"]
   if language not in SUPPORTED_LANGUAGES:
     print_usage_and_exit('Unsupported language. Must be one of: {0}'.
       format(SUPPORTED_LANGUAGES))
 
-  # Prepare logs directory
+
+def process_command_line_options(options):
+  """
+  Validates and processes command line arguments. Builds HawkeyeParameters
+  for every language to test.
+
+  Args:
+    options: A dict - command line options parsed by docopt.
+  Returns:
+    A list of HawkeyeParameters with filled attributres (one per language).
+  """
+  languages = parse_languages(options["--lang"])
+  multi_language = len(languages) > 1
+  hawkeye_logs = prepare_logs_dir(options)
+  app_ids = per_language_values("--app", options["--app"], languages)
+  versions_csvs = per_language_values(
+    "--versions-csv", options["--versions-csv"], languages)
+  if multi_language and options["--versions-csv"] and len(
+      set(versions_csvs.values())) == 1:
+    print_usage_and_exit("Every language needs its own versions csv")
+  if options["--record"] and options["--replay"]:
+    print_usage_and_exit("--record and --replay can't be used together")
+  return [
+    process_language_options(
+      options, language, app_ids[language], versions_csvs[language],
+      hawkeye_logs, multi_language)
+    for language in languages
+  ]
+
+
+def prepare_logs_dir(options):
+  """
+  Creates hawkeye-logs directory or removes old logs from it.
+
+  Args:
+    options: A dict - command line options parsed by docopt.
+  Returns:
+    A string - path to hawkeye-logs directory.
+  """
   base_dir = options["--log-dir"] or os.getcwd()
   if base_dir.startswith("~"):
     base_dir = os.path.join(os.environ['HOME'], base_dir[1:])
@@ -158,15 +524,42 @@ def process_command_line_options():
       file_path = os.path.join(hawkeye_logs, child_file)
       if os.path.isfile(file_path):
         os.unlink(file_path)
+  return hawkeye_logs
 
-  # Set user email and password in user_tests module
-  user_tests.USER_EMAIL = options["--user"]
-  user_tests.USER_PASSWORD = options["--pass"]
+
+def process_language_options(options, language, app_id, versions_csv_path,
+                             hawkeye_logs, multi_language=False):
+  """
+  Builds HawkeyeParameters of tests run against application in
+  specific language.
+
+  Args:
+    options: A dict - command line options parsed by docopt.
+    language: A string - language to test.
+    app_id: A string - ID of application to test.
+    versions_csv_path: A string - path to versions csv of the application.
+    hawkeye_logs: A string - path to prepared hawkeye-logs directory.
+    multi_language: A boolean - determines if other languages are tested
+      in the same run, so files of the language need _<LANG> suffix.
+  Returns:
+    An instance of HawkeyeParameters with filled attributres.
+  """
+  def for_language(file_name):
+    return language_file_name(file_name, language) if multi_language \
+      else file_name
+
+  # Prepare cassette to record responses to or to replay them from
+  cassette = None
+  if options["--record"]:
+    cassette = Cassette(for_language(options["--record"]))
+    cassette.save_versions(versions_csv_path)
+  elif options["--replay"]:
+    cassette = Cassette(for_language(options["--replay"]), replay=True)
+    versions_csv_path = cassette.versions_csv
 
   # Initialize Application object
-  app_id = options["--app"]
   versions = []
-  with open(options["--versions-csv"]) as versions_csv:
+  with open(versions_csv_path) as versions_csv:
     # Skip header line
     versions_csv.next()
     for module, version, http, https, is_default in csv.reader(versions_csv):
@@ -178,14 +571,51 @@ def process_command_line_options():
       versions.append(version)
 
   url_builder = AppURLBuilder(versions, language)
-  app = Application(app_id, url_builder)
+  probe_interval = parse_non_negative_number(
+    "--probe-interval", options["--probe-interval"], float)
+  health = None
+  if probe_interval and not (cassette and cassette.replaying):
+    health = HealthMonitor(url_builder.base_urls, probe_interval)
+  app = Application(app_id, url_builder, cassette=cassette, health=health)
 
   # Determine suites list
   include_opt = options["--suites"]
   include_suites = include_opt.split(',') if include_opt else []
   exclude_opt = options["--exclude-suites"]
   exclude_suites = exclude_opt.split(',') if exclude_opt else []
-  suites = build_suites_list(language, include_suites, exclude_suites, app)
+  run_id = uuid.uuid4().hex[:8]
+  profiler = None
+  if options["--profile"]:
+    profiler = RunProfiler(os.path.join(
+      hawkeye_logs, "profile-{lang}".format(lang=language)))
+    with profiler.profile("discovery"):
+      suites = build_suites_list(language, include_suites, exclude_suites,
+                                 app, run_id)
+  else:
+    suites = build_suites_list(language, include_suites, exclude_suites, app,
+                               run_id)
+
+  # Set user email and password in user_tests module
+  if 'users' in select_suite_names(include_suites, exclude_suites):
+    user_tests = import_suite_module('users')
+    user_tests.USER_EMAIL = options["--user"]
+    user_tests.USER_PASSWORD = options["--pass"]
+  output_file = options["--output"] or "hawkeye_output.csv"
+  if options["--shard"]:
+    shard_index, shards_count = parse_shard(options["--shard"])
+    suites = select_shard(suites, shard_index, shards_count)
+    output_file = options["--output"] or "hawkeye_output_{i}_of_{n}.csv".format(
+      i=shard_index + 1, n=shards_count)
+  combined_output_file = language_file_name(output_file, "combined")
+  output_file = for_language(output_file)
+
+  # Run the slowest suites and tests first
+  if options["--history"]:
+    history_file = for_language(options["--history"])
+  else:
+    history_file = "hawkeye_history_{lang}.json".format(lang=language)
+  history = RunHistory.load(history_file)
+  suites = order_suites(suites, history)
 
   # Prepare summarized hawkeye parameters
   hawkeye_params = HawkeyeParameters()
@@ -195,7 +625,60 @@ def process_command_line_options():
   hawkeye_params.test_result_verbosity = 2 if options["--console"] else 1
   hawkeye_params.baseline_verbosity = 2 if options["--baseline"] else 1
   hawkeye_params.log_dir = hawkeye_logs
-  hawkeye_params.output_file = "hawkeye_output.csv"
+  hawkeye_params.log_queue_size = parse_positive_number(
+    "--log-queue", options["--log-queue"])
+  hawkeye_params.log_overflow = options["--log-overflow"]
+  hawkeye_params.capture = not options["--no-capture"]
+  if hawkeye_params.log_overflow not in QueuedHandler.OVERFLOW_POLICIES:
+    print_usage_and_exit("--log-overflow should be one of {policies}"
+                         .format(policies=QueuedHandler.OVERFLOW_POLICIES))
+  hawkeye_params.output_file = output_file
+  hawkeye_params.combined_output_file = combined_output_file
+  hawkeye_params.test_workers = parse_positive_number(
+    "--test-workers", options["--test-workers"])
+  hawkeye_params.suite_workers = parse_positive_number(
+    "--suite-workers", options["--suite-workers"])
+  hawkeye_params.budget_factor = parse_positive_number(
+    "--budget-factor", options["--budget-factor"], float)
+  hawkeye_params.slowest_count = parse_non_negative_number(
+    "--slowest", options["--slowest"])
+  output_base, output_ext = os.path.splitext(output_file)
+  hawkeye_params.durations_file = "{base}_durations{ext}".format(
+    base=output_base, ext=output_ext or ".csv")
+  hawkeye_params.server_timing_file = "{base}_server_timing{ext}".format(
+    base=output_base, ext=output_ext or ".csv")
+  hawkeye_params.rpc_stats_file = "{base}_rpc_stats{ext}".format(
+    base=output_base, ext=output_ext or ".csv")
+  hawkeye_params.metrics_file = "{base}_benchmarks{ext}".format(
+    base=output_base, ext=output_ext or ".csv")
+  hawkeye_params.history_file = history_file
+  hawkeye_params.history = history
+  hawkeye_params.cassette = cassette
+  hawkeye_params.health = health
+  hawkeye_params.profiler = profiler
+  hawkeye_params.request_timeout = (
+    parse_positive_number("--connect-timeout", options["--connect-timeout"],
+                          float),
+    parse_positive_number("--read-timeout", options["--read-timeout"], float)
+  )
+  hawkeye_params.test_deadline = parse_positive_number(
+    "--test-deadline", options["--test-deadline"], float)
+  if (hawkeye_params.suite_workers > 1
+      and language not in NAMESPACED_LANGUAGES):
+    print_usage_and_exit("Suites of {lang} application are not isolated, "
+                         "so they can't run concurrently".format(lang=language))
+  # Only python application reports its RPCs
+  if language == "python" and not (cassette and cassette.replaying):
+    if hawkeye_params.suite_workers > 1:
+      # Scrapes of concurrent suites overlap, so RPCs can't be attributed
+      print("RPC stats are not collected as suites run concurrently")
+    else:
+      hawkeye_params.rpc_stats = RpcStatsCollector(app)
+  # Remember one application per namespace to clean it up after tests
+  hawkeye_params.isolated_apps = {
+    test.app.namespace: test.app
+    for suite in suites for test in suite if test.app.namespace
+  }.values()
   return hawkeye_params
 
 
@@ -208,22 +691,243 @@ def run_hawkeye_tests(params):
     params: An instance of HawkeyeParameters.
   """
   # Configure logging
-  hawkeye_utils.configure_hawkeye_logging(params.log_dir, params.language)
+  hawkeye_utils.configure_hawkeye_logging(
+    params.log_dir, params.language, params.log_queue_size, params.log_overflow,
+    params.capture)
 
   DeprecatedHawkeyeTestCase.LANG = params.language
+  hawkeye_utils.set_default_timeouts(params.request_timeout,
+                                     params.test_deadline)
 
   # Prepare and start testing suites
   test_runner = HawkeyeSuitesRunner(
     params.language,
     params.log_dir,
     params.baseline_file,
-    params.test_result_verbosity
+    params.test_result_verbosity,
+    params.test_workers,
+    params.suite_workers,
+    params.budget_factor,
+    params.slowest_count,
+    RunProgress(params.suites, params.history),
+    params.profiler,
+    params.rpc_stats
   )
+  if params.health:
+    params.health.start()
+  if params.profiler:
+    params.profiler.start()
+  if params.rpc_stats:
+    params.rpc_stats.reset()
   test_runner.run_suites(params.suites)
   test_runner.print_summary(params.baseline_verbosity)
+  if params.rpc_stats:
+    print_rpc_stats(params.rpc_stats.suites_stats, params.baseline_verbosity)
+    save_rpc_stats_to_csv(params.rpc_stats.suites_stats,
+                          params.rpc_stats_file)
+  if params.health:
+    params.health.stop()
+    print_outages(params.health.outages())
+  if params.profiler:
+    params.profiler.stop()
+    print("\nProfile is saved to {dir}".format(
+      dir=params.profiler.output_dir))
   save_report_dict_to_csv(test_runner.suites_report, params.output_file)
+  save_timings_to_csv(test_runner.suites_timings, params.durations_file,
+                      test_runner.suites_latencies)
+  save_server_timings_to_csv(test_runner.suites_server_timings,
+                             params.server_timing_file)
+  if test_runner.suites_metrics:
+    save_metrics_to_csv(test_runner.suites_metrics, params.metrics_file)
+  if not (params.cassette and params.cassette.replaying):
+    # Durations of replayed run are not representative
+    params.history.update(test_runner.suites_durations,
+                          test_runner.suites_timings)
+    params.history.save(params.history_file)
+  # Reports are saved first, so a failed cleanup doesn't lose them
+  clean_namespaces(params.isolated_apps)
+  if params.cassette:
+    params.cassette.close()
+
+
+def run_languages_concurrently(params_list):
+  """
+  Runs hawkeye tests of every language in separate process. Output of
+  every language is printed when its tests are finished. Statuses,
+  durations and latencies of all languages are saved side by side to
+  combined csv report.
+
+  Args:
+    params_list: A list of HawkeyeParameters (one per language).
+  """
+  processes = {}
+  for params in params_list:
+    console_file = os.path.join(
+      params.log_dir, "{lang}-console.log".format(lang=params.language))
+    process = multiprocessing.Process(
+      target=_run_language_process, args=(params, console_file),
+      name="hawkeye-{lang}".format(lang=params.language))
+    process.start()
+    processes[process] = (params, console_file)
+
+  failed_languages = []
+  while processes:
+    for process in processes.keys():
+      process.join(0.5)
+      if process.is_alive():
+        continue
+      params, console_file = processes.pop(process)
+      print("\n===== {lang} =====".format(lang=params.language))
+      with open(console_file) as console_output:
+        sys.stdout.write(console_output.read())
+      sys.stdout.flush()
+      if process.exitcode != 0:
+        failed_languages.append(params.language)
+        print("Tests of {lang} failed to finish (exit code {code})"
+              .format(lang=params.language, code=process.exitcode))
+
+  finished = [params for params in params_list
+              if params.language not in failed_languages]
+  if len(finished) < 2:
+    return
+  differing = save_cross_language_report(
+    [(params.language, params.output_file, params.durations_file)
+     for params in finished],
+    params_list[0].combined_output_file)
+  print("\n===== Cross-language report =====")
+  print(" {count:<3} tests have different statuses in {languages}".format(
+    count=len(differing),
+    languages=", ".join(params.language for params in finished)))
+  for test_id in differing:
+    print("    {test_id}".format(test_id=test_id))
+  print("Combined report is saved to {file_name}".format(
+    file_name=params_list[0].combined_output_file))
+
+
+def _run_language_process(params, console_file):
+  """
+  Runs hawkeye tests of a language in child process with stdout and stderr
+  redirected to console_file.
+  """
+  with open(console_file, "w") as console_output:
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.dup2(console_output.fileno(), sys.stdout.fileno())
+    os.dup2(console_output.fileno(), sys.stderr.fileno())
+  try:
+    run_hawkeye_tests(params)
+  finally:
+    # Child exits with os._exit, so handlers wouldn't be closed otherwise
+    # (queued log records would be lost and capture index wouldn't be saved)
+    logging.shutdown()
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+
+def print_outages(outages):
+  """
+  Prints app versions which were unavailable during the run.
+
+  Args:
+    outages: A list of tuples (base URL, seconds of downtime, is still down).
+  """
+  if not outages:
+    return
+  print("\nUnavailable versions:")
+  for base_url, downtime, still_down in outages:
+    print(" {url} was down for {seconds:.0f}s{still}".format(
+      url=base_url, seconds=downtime,
+      still=" (still down)" if still_down else ""))
+
+
+def clean_namespaces(applications):
+  """
+  Removes data which was left by tests in isolated namespaces.
+
+  Args:
+    applications: A list of Application objects with namespace set.
+  """
+  for app in applications:
+    try:
+      response = app.delete('/{lang}/_hawkeye/namespace')
+    except Exception as error:
+      print("Failed to clean namespace '{namespace}' ({error})"
+            .format(namespace=app.namespace, error=error))
+      continue
+    if response.status_code != 200:
+      print("Failed to clean namespace '{namespace}' (status: {status})"
+            .format(namespace=app.namespace, status=response.status_code))
+
+
+def merge_shard_reports(options):
+  """
+  Merges reports of different shards, prints summary and saves
+  merged test results to csv file.
+
+  Args:
+    options: A dict - command line options parsed by docopt.
+  """
+  language = options["--lang"]
+  validate_language(language)
+  try:
+    merged_report = merge_report_csv_files(options["SHARD_CSV"])
+  except ValueError as err:
+    print_usage_and_exit(str(err))
+
+  test_runner = HawkeyeSuitesRunner(
+    language, None, "hawkeye_baseline_{}.csv".format(language))
+  test_runner.suites_report = merged_report
+  test_runner.print_summary(2 if options["--baseline"] else 1)
+  save_report_dict_to_csv(merged_report,
+                          options["--output"] or "hawkeye_output.csv")
+
+
+def list_tests(options):
+  """
+  Prints IDs of tests which a run with the same --lang, --suites,
+  --exclude-suites, --shard and --history options would execute, in the
+  order they would be started. No requests are sent.
+
+  Suites are built (without application) as only suite(lang, app) of a test
+  module knows which tests are run for a language, and shards and history
+  order are computed from test IDs and prerequisites of built tests.
+
+  Args:
+    options: A dict - command line options parsed by docopt.
+  """
+  language = options["--lang"]
+  validate_language(language)
+  include_opt = options["--suites"]
+  include_suites = include_opt.split(',') if include_opt else []
+  exclude_opt = options["--exclude-suites"]
+  exclude_suites = exclude_opt.split(',') if exclude_opt else []
+  suites = build_suites_list(language, include_suites, exclude_suites,
+                             application=None)
+  if options["--shard"]:
+    suites = select_shard(suites, *parse_shard(options["--shard"]))
+  history_file = (options["--history"] or
+                  "hawkeye_history_{lang}.json".format(lang=language))
+  for suite in order_suites(suites, RunHistory.load(history_file)):
+    for test in suite:
+      print("{suite} {test_id}".format(suite=suite.short_name,
+                                       test_id=test.id()))
 
 
 if __name__ == '__main__':
-  hawkeye_parameters = process_command_line_options()
-  run_hawkeye_tests(hawkeye_parameters)
+  check_usage_options(__doc__)
+  command_line_options = docopt.docopt(__doc__)
+  if command_line_options["merge"]:
+    merge_shard_reports(command_line_options)
+  elif command_line_options["list"]:
+    list_tests(command_line_options)
+  else:
+    if command_line_options["--request-budget"]:
+      # Created before language processes are forked, so it's shared
+      hawkeye_utils.set_request_budget(multiprocessing.BoundedSemaphore(
+        parse_positive_number("--request-budget",
+                              command_line_options["--request-budget"])))
+    languages_parameters = process_command_line_options(command_line_options)
+    if len(languages_parameters) == 1:
+      run_hawkeye_tests(languages_parameters[0])
+    else:
+      run_languages_concurrently(languages_parameters)
@@ -0,0 +1,257 @@
+#!/usr/bin/python2.7
+"""hawkeye_capture.py: Inspect requests captured during hawkeye run.
+
+Every hawkeye run saves requests and responses to
+hawkeye-logs/<lang>-detailed <datetime>.capture (and index of the capture
+to .capture.idx file next to it).
+
+Usage:
+  hawkeye_capture.py list CAPTURE
+  hawkeye_capture.py extract CAPTURE TEST_ID [--full-bodies]
+  hawkeye_capture.py replay CAPTURE TEST_ID
+  hawkeye_capture.py (-h | --help)
+
+Options:
+  -h, --help     # show this help message and exit
+  --full-bodies  # Don't cut long bodies of requests and responses
+
+Use "-" as TEST_ID to select requests which were sent outside of tests.
+"""
+import base64
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+
+import docopt
+
+from hawkeye_utils import REQUEST_ID_HEADER, hawkeye_request, \
+  render_request, render_response
+
+# Capture file starts with this line
+MAGIC = "HAWKEYE-CAPTURE-1\n"
+
+# Every record is prefixed by its length packed using this format
+LENGTH_FORMAT = ">I"
+LENGTH_SIZE = struct.calcsize(LENGTH_FORMAT)
+
+# Key of index which lists requests sent outside of tests
+NO_TEST = "-"
+
+
+class CaptureHandler(logging.Handler):
+  """
+  Logging handler which saves exchanges (requests with responses) passed
+  to hawkeye_utils.capture_logger into capture file. Every exchange is
+  saved as a length-prefixed zlib-compressed json record. Offsets of
+  records of every test are saved to index file when handler is closed.
+  """
+
+  def __init__(self, file_name):
+    """
+    Args:
+      file_name: A string - path to capture file to create.
+    """
+    super(CaptureHandler, self).__init__()
+    self.file_name = file_name
+    self._file = open(file_name, "wb")
+    self._file.write(MAGIC)
+    self._index = {}
+    self._index_lock = threading.Lock()
+
+  def emit(self, record):
+    try:
+      exchange = getattr(record, "exchange")
+      data = zlib.compress(json.dumps(_encode_bodies(exchange)))
+      with self._index_lock:
+        offset = self._file.tell()
+        self._file.write(struct.pack(LENGTH_FORMAT, len(data)))
+        self._file.write(data)
+        test_id = exchange["test_id"] or NO_TEST
+        self._index.setdefault(test_id, []).append(offset)
+    except Exception:
+      self.handleError(record)
+
+  def close(self):
+    with self._index_lock:
+      if not self._file.closed:
+        self._file.close()
+        save_index(self._index, self.file_name)
+    super(CaptureHandler, self).close()
+
+
+def _encode_bodies(exchange):
+  """
+  Replaces bodies of request and response with base64 strings,
+  so binary bodies can be saved to json.
+  """
+  encoded = dict(exchange)
+  for key in ("request_body", "response_body"):
+    body = encoded.pop(key)
+    if isinstance(body, unicode):
+      body = body.encode("utf-8")
+    elif body is not None and not isinstance(body, str):
+      body = "CAPTURE STUB: body of type {}".format(type(body).__name__)
+    encoded[key + "_base64"] = (
+      base64.b64encode(body) if body is not None else None)
+  return encoded
+
+
+def _decode_bodies(exchange):
+  """ Reverts _encode_bodies. """
+  decoded = dict(exchange)
+  for key in ("request_body", "response_body"):
+    body = decoded.pop(key + "_base64")
+    decoded[key] = base64.b64decode(body) if body is not None else None
+  return decoded
+
+
+def save_index(index, capture_file_name):
+  """
+  Saves index of capture file.
+
+  Args:
+    index: A dict (<test_id>: <list of offsets of records>).
+    capture_file_name: A string - path to capture file.
+  """
+  with open(capture_file_name + ".idx", "w") as index_file:
+    json.dump(index, index_file, indent=1, sort_keys=True)
+
+
+class CaptureReader(object):
+  """
+  Reads exchanges of specific tests from capture file using its index.
+  """
+
+  def __init__(self, file_name):
+    """
+    Args:
+      file_name: A string - path to capture file. If index file is missing
+        (e.g. hawkeye was killed), index is rebuilt and saved.
+    """
+    self.file_name = file_name
+    with open(file_name, "rb") as capture_file:
+      if capture_file.read(len(MAGIC)) != MAGIC:
+        raise ValueError("{} is not a hawkeye capture file".format(file_name))
+    index_file_name = file_name + ".idx"
+    if os.path.exists(index_file_name):
+      with open(index_file_name) as index_file:
+        self.index = json.load(index_file)
+    else:
+      self.index = self._build_index()
+      save_index(self.index, file_name)
+
+  def test_ids(self):
+    """
+    Returns:
+      A sorted list of IDs of tests which sent requests.
+    """
+    return sorted(self.index)
+
+  def exchanges(self, test_id):
+    """
+    Reads exchanges of a test.
+
+    Args:
+      test_id: A string - ID of test (or NO_TEST).
+    Returns:
+      A list of dicts describing exchanges in order they were finished.
+    """
+    exchanges = []
+    with open(self.file_name, "rb") as capture_file:
+      for offset in self.index.get(test_id, []):
+        capture_file.seek(offset)
+        exchanges.append(self._read_record(capture_file))
+    return exchanges
+
+  def _build_index(self):
+    index = {}
+    with open(self.file_name, "rb") as capture_file:
+      capture_file.seek(len(MAGIC))
+      while True:
+        offset = capture_file.tell()
+        try:
+          exchange = self._read_record(capture_file)
+        except EOFError:
+          return index
+        test_id = exchange["test_id"] or NO_TEST
+        index.setdefault(test_id, []).append(offset)
+
+  @staticmethod
+  def _read_record(capture_file):
+    header = capture_file.read(LENGTH_SIZE)
+    if len(header) < LENGTH_SIZE:
+      raise EOFError()
+    length, = struct.unpack(LENGTH_FORMAT, header)
+    data = capture_file.read(length)
+    if len(data) < length:
+      # Last record is incomplete
+      raise EOFError()
+    return _decode_bodies(json.loads(zlib.decompress(data)))
+
+
+def print_exchanges(exchanges, full_bodies):
+  """
+  Prints exchanges in format of detailed log.
+
+  Args:
+    exchanges: A list of dicts describing exchanges.
+    full_bodies: A boolean - determines if long bodies should be cut.
+  """
+  verbosity = 4 if full_bodies else 3
+  for exchange in exchanges:
+    print("--- request {request_id}, started at {started_at:.3f}, "
+          "took {elapsed:.3f}s ---".format(
+            request_id=exchange.get("request_id") or "-",
+            started_at=exchange["started_at"], elapsed=exchange["elapsed"]))
+    print(render_request(exchange["method"], exchange["url"],
+                         exchange["request_headers"],
+                         exchange["request_body"], verbosity))
+    if exchange["status"] is None:
+      print("No response")
+    else:
+      print(render_response(exchange["status"], exchange["url"],
+                            exchange["response_headers"],
+                            exchange["response_body"], verbosity))
+    print("")
+
+
+def replay_exchanges(exchanges):
+  """
+  Sends captured requests again and prints new statuses next to old ones.
+
+  Args:
+    exchanges: A list of dicts describing exchanges.
+  """
+  for exchange in exchanges:
+    # Let requests library compute framing headers and request ID again
+    headers = {name: value
+               for name, value in exchange["request_headers"].iteritems()
+               if name.lower() not in ("content-length", "host",
+                                       REQUEST_ID_HEADER.lower())}
+    try:
+      response = hawkeye_request(
+        exchange["method"], exchange["url"], verbosity=0,
+        headers=headers, data=exchange["request_body"])
+      status = response.status_code
+    except Exception as error:
+      status = "error ({})".format(error)
+    print("{method} {url}: {old} -> {new}".format(
+      method=exchange["method"], url=exchange["url"],
+      old=exchange["status"], new=status))
+
+
+if __name__ == '__main__':
+  options = docopt.docopt(__doc__)
+  reader = CaptureReader(options["CAPTURE"])
+  if options["list"]:
+    for test_id in reader.test_ids():
+      print("{test_id} ({count} requests)".format(
+        test_id=test_id, count=len(reader.index[test_id])))
+  elif options["extract"]:
+    print_exchanges(reader.exchanges(options["TEST_ID"]),
+                    options["--full-bodies"])
+  elif options["replay"]:
+    replay_exchanges(reader.exchanges(options["TEST_ID"]))
@@ -0,0 +1,165 @@
+import base64
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import deque
+from datetime import timedelta
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Name of file inside of cassette directory where exchanges are saved
+EXCHANGES_FILE = "exchanges.jsonl"
+
+# Name of file inside of cassette directory where versions csv is copied
+VERSIONS_FILE = "versions.csv"
+
+
+class CassetteMiss(Exception):
+  """ Raised when replayed run sends a request which was not recorded. """
+  pass
+
+
+def exchange_key(method, path, module, version, https, kwargs):
+  """
+  Builds a key which identifies request sent by Application. It uses
+  path template (e.g.: '/{lang}/memcache') instead of URL, so it doesn't
+  depend on location of application. Headers are not used, so namespaces
+  of different runs don't matter.
+
+  Args:
+    method: A string - HTTP method.
+    path: A string - path template passed to Application.
+    module: A string - module name or None.
+    version: A string - version name or None.
+    https: A boolean - determines if https is used.
+    kwargs: A dict - kwargs passed to requests library.
+  Returns:
+    A string key.
+  """
+  if "json" in kwargs:
+    body = json.dumps(kwargs["json"], sort_keys=True)
+  elif isinstance(kwargs.get("data"), dict):
+    body = json.dumps(kwargs["data"], sort_keys=True)
+  elif "files" in kwargs:
+    body = json.dumps(sorted(kwargs["files"]))
+  else:
+    body = kwargs.get("data") or ""
+  if isinstance(body, unicode):
+    body = body.encode("utf-8")
+  return json.dumps([
+    method.upper(), module, version, bool(https), path,
+    json.dumps(kwargs.get("params"), sort_keys=True),
+    hashlib.md5(body).hexdigest()
+  ])
+
+
+class Cassette(object):
+  """
+  Records responses received by Application to a directory or serves
+  them back without sending requests (replay mode).
+
+  Identical requests are served in order they were recorded. If replayed
+  run sends the same request more times than it was recorded (e.g. while
+  polling), the last recorded response is served again.
+  """
+
+  def __init__(self, directory, replay=False):
+    """
+    Args:
+      directory: A string - path to cassette directory.
+      replay: A boolean - determines if responses should be served from
+        the cassette instead of being recorded.
+    """
+    self.directory = directory
+    self.replaying = replay
+    self._lock = threading.Lock()
+    exchanges_path = os.path.join(directory, EXCHANGES_FILE)
+    if replay:
+      self._responses = {}
+      with open(exchanges_path) as exchanges_file:
+        for line in exchanges_file:
+          exchange = json.loads(line)
+          self._responses.setdefault(exchange["key"], deque()).append(exchange)
+    else:
+      if not os.path.exists(directory):
+        os.makedirs(directory)
+      self._file = open(exchanges_path, "w")
+
+  def save_versions(self, versions_csv):
+    """
+    Copies versions csv to cassette, so replay doesn't need it.
+
+    Args:
+      versions_csv: A string - path to versions csv file.
+    """
+    shutil.copy(versions_csv, os.path.join(self.directory, VERSIONS_FILE))
+
+  @property
+  def versions_csv(self):
+    """ Path to versions csv saved in the cassette """
+    return os.path.join(self.directory, VERSIONS_FILE)
+
+  def record(self, key, response):
+    """
+    Saves response to the cassette.
+
+    Args:
+      key: A string - key of request built by exchange_key.
+      response: A requests.Response object.
+    """
+    exchange = {
+      "key": key,
+      "url": response.url,
+      "status": response.status_code,
+      "reason": response.reason,
+      "headers": dict(response.headers)
+    }
+    if hasattr(response, "body_digest"):
+      # Body was streamed, so only its summary is available
+      exchange["streamed"] = {"digest": response.body_digest,
+                              "length": response.body_length}
+      exchange["body_base64"] = base64.b64encode(response.body_prefix)
+    else:
+      exchange["body_base64"] = base64.b64encode(response.content or "")
+    line = json.dumps(exchange)
+    with self._lock:
+      self._file.write(line + "\n")
+      self._file.flush()
+
+  def replay(self, key):
+    """
+    Builds response recorded for request.
+
+    Args:
+      key: A string - key of request built by exchange_key.
+    Returns:
+      A requests.Response object.
+    Raises:
+      CassetteMiss: If such request was not recorded.
+    """
+    with self._lock:
+      responses = self._responses.get(key)
+      if not responses:
+        raise CassetteMiss("No recorded response for request {}".format(key))
+      exchange = responses.popleft() if len(responses) > 1 else responses[0]
+    response = requests.Response()
+    response.url = exchange["url"]
+    response.status_code = exchange["status"]
+    response.reason = exchange["reason"]
+    response.headers = CaseInsensitiveDict(exchange["headers"])
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.elapsed = timedelta(0)
+    response._content = base64.b64decode(exchange["body_base64"])
+    if "streamed" in exchange:
+      response.body_digest = exchange["streamed"]["digest"]
+      response.body_length = exchange["streamed"]["length"]
+      response.body_prefix = response._content
+    return response
+
+  def close(self):
+    if not self.replaying:
+      self._file.close()
@@ -0,0 +1,170 @@
+import threading
+import time
+
+import requests
+
+
+class VersionUnavailable(Exception):
+  """ Raised instead of sending request to version which is down. """
+  pass
+
+
+class CircuitBreaker(object):
+  """
+  Tracks health of a single base URL of application version.
+
+  Breaker is closed while version responds. After FAILURE_THRESHOLD
+  consecutive connection failures (of tests requests or of health probes)
+  it's open and requests to the version fail immediately. The first
+  successful response closes it again.
+  """
+
+  FAILURE_THRESHOLD = 3
+
+  def __init__(self, base_url):
+    """
+    Args:
+      base_url: A string - base URL of application version.
+    """
+    self.base_url = base_url
+    self.failures = 0
+    self.opened_at = None
+    self.downtime = 0.0
+    self.last_error = None
+    self._lock = threading.Lock()
+
+  @property
+  def is_open(self):
+    return self.opened_at is not None
+
+  def check(self):
+    """
+    Raises:
+      VersionUnavailable: If breaker is open.
+    """
+    if self.is_open:
+      raise VersionUnavailable(
+        "Version unavailable: {url} doesn't respond since {since} ({error})"
+        .format(url=self.base_url, error=self.last_error,
+                since=time.strftime("%H:%M:%S",
+                                    time.localtime(self.opened_at))))
+
+  @property
+  def total_downtime(self):
+    """ Seconds the version was unavailable (including current outage). """
+    with self._lock:
+      if self.opened_at is None:
+        return self.downtime
+      return self.downtime + time.time() - self.opened_at
+
+  def report_success(self):
+    with self._lock:
+      self.failures = 0
+      if self.opened_at is not None:
+        self.downtime += time.time() - self.opened_at
+        self.opened_at = None
+
+  def report_failure(self, error):
+    """
+    Args:
+      error: An exception raised while connecting to the version.
+    """
+    with self._lock:
+      self.failures += 1
+      self.last_error = error
+      if self.failures >= self.FAILURE_THRESHOLD and self.opened_at is None:
+        self.opened_at = time.time()
+
+
+class HealthMonitor(object):
+  """
+  Keeps circuit breakers of base URLs of application versions and probes
+  every base URL in background, so a version which went down is detected
+  without waiting for tests to time out, and a version which came back is
+  used again.
+  """
+
+  # Seconds to wait for response to probe. Any HTTP response
+  # means that version is up.
+  PROBE_TIMEOUT = 5
+
+  def __init__(self, base_urls, probe_interval):
+    """
+    Args:
+      base_urls: A list of strings - base URLs of application versions.
+      probe_interval: A number - seconds between probes of a base URL.
+    """
+    self.probe_interval = probe_interval
+    self._breakers = {url: CircuitBreaker(url) for url in set(base_urls)}
+    self._stopped = threading.Event()
+    self._probers = []
+
+  def start(self):
+    """ Starts a background prober per base URL. """
+    for breaker in self._breakers.itervalues():
+      prober = threading.Thread(target=self._probe_forever, args=(breaker,),
+                                name="health-{}".format(breaker.base_url))
+      prober.daemon = True
+      prober.start()
+      self._probers.append(prober)
+
+  def stop(self):
+    """ Stops background probers. """
+    self._stopped.set()
+    for prober in self._probers:
+      prober.join()
+    self._probers = []
+
+  def check(self, base_url):
+    """
+    Args:
+      base_url: A string - base URL which request is going to be sent to.
+    Raises:
+      VersionUnavailable: If breaker of base URL is open.
+    """
+    breaker = self._breakers.get(base_url)
+    if breaker:
+      breaker.check()
+
+  def report(self, base_url, error=None):
+    """
+    Reports result of request sent to version.
+
+    Args:
+      base_url: A string - base URL which request was sent to.
+      error: An exception raised while sending request (None if response
+        was received).
+    """
+    breaker = self._breakers.get(base_url)
+    if not breaker:
+      return
+    if error is None:
+      breaker.report_success()
+    elif isinstance(error, requests.ConnectionError):
+      # Read timeout means that version accepted connection, it can be
+      # a single slow handler (connect timeout is a ConnectionError)
+      breaker.report_failure(error)
+
+  def outages(self):
+    """
+    Returns:
+      A list of tuples (base URL, seconds of downtime, is still down)
+      for versions which were unavailable during the run.
+    """
+    return [
+      (url, breaker.total_downtime, breaker.is_open)
+      for url, breaker in sorted(self._breakers.iteritems())
+      if breaker.total_downtime
+    ]
+
+  def _probe_forever(self, breaker):
+    while not self._stopped.wait(self.probe_interval):
+      try:
+        requests.get(breaker.base_url, timeout=self.PROBE_TIMEOUT,
+                     verify=False, allow_redirects=False)
+      except requests.RequestException as error:
+        # Only connection errors count as failures (as for test requests),
+        # a busy version may answer slower than PROBE_TIMEOUT
+        self.report(breaker.base_url, error)
+      else:
+        self.report(breaker.base_url)
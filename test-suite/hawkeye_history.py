@@ -0,0 +1,216 @@
+import heapq
+import json
+import os
+import sys
+import time
+
+from hawkeye_test_runner import get_prerequisites
+
+
+class RunHistory(object):
+  """
+  Keeps durations of suites and tests measured in previous runs and uses
+  them to order suites and tests longest-processing-time first.
+
+  Durations are smoothed over runs, so a single slow run doesn't
+  change the order too much.
+  """
+
+  # Weight of the latest run in smoothed duration.
+  LATEST_RUN_WEIGHT = 0.5
+
+  # Estimated duration of a test when nothing is known about tests.
+  DEFAULT_TEST_DURATION = 1.0
+
+  def __init__(self, suites=None, tests=None):
+    """
+    Args:
+      suites: A dict with durations of suites (<short_name>: <seconds>).
+      tests: A dict with durations of tests (<test_id>: <seconds>).
+    """
+    self.suites = suites or {}
+    self.tests = tests or {}
+
+  @classmethod
+  def load(cls, file_name):
+    """
+    Loads history from json file.
+
+    Args:
+      file_name: A string - name of history file.
+    Returns:
+      A RunHistory object (empty if file doesn't exist).
+    """
+    if not os.path.exists(file_name):
+      return cls()
+    with open(file_name) as history_file:
+      history = json.load(history_file)
+    return cls(history.get("suites"), history.get("tests"))
+
+  def save(self, file_name):
+    """
+    Saves history to json file.
+
+    Args:
+      file_name: A string - name of history file.
+    """
+    with open(file_name, "w") as history_file:
+      json.dump({"suites": self.suites, "tests": self.tests}, history_file,
+                indent=2, sort_keys=True)
+
+  def update(self, suite_durations, test_timings):
+    """
+    Adds durations measured in the latest run.
+
+    Args:
+      suite_durations: A dict with durations of suites
+        (<short_name>: <seconds>).
+      test_timings: A dict with timings of tests (<test_id>: <TestTiming>).
+    """
+    for short_name, duration in suite_durations.iteritems():
+      self.suites[short_name] = self._smooth(
+        self.suites.get(short_name), duration)
+    for test_id, timing in test_timings.iteritems():
+      self.tests[test_id] = self._smooth(
+        self.tests.get(test_id), timing.duration)
+
+  def _smooth(self, previous, latest):
+    if previous is None:
+      return latest
+    return (self.LATEST_RUN_WEIGHT * latest +
+            (1 - self.LATEST_RUN_WEIGHT) * previous)
+
+  def estimate_test(self, test):
+    """
+    Args:
+      test: A TestCase object.
+    Returns:
+      A float - expected duration of the test in seconds.
+    """
+    duration = self.tests.get(test.id())
+    if duration is not None:
+      return duration
+    if not self.tests:
+      return self.DEFAULT_TEST_DURATION
+    # Unknown test is expected to be as slow as a typical one
+    known = sorted(self.tests.itervalues())
+    return known[len(known) // 2]
+
+  def estimate_suite(self, suite):
+    """
+    Args:
+      suite: A HawkeyeTestSuite object.
+    Returns:
+      A float - expected duration of the suite in seconds.
+    """
+    duration = self.suites.get(suite.short_name)
+    if duration is not None:
+      return duration
+    return sum(self.estimate_test(test) for test in suite)
+
+  def order_suites(self, hawkeye_suites):
+    """
+    Orders suites longest first, so the slowest suites don't become
+    stragglers at the end of the run.
+
+    Args:
+      hawkeye_suites: A list of HawkeyeTestSuite objects.
+    Returns:
+      A new list of HawkeyeTestSuite objects. Tests of suites which allow
+      concurrent tests are reordered too (see order_tests).
+    """
+    ordered = sorted(hawkeye_suites, key=self.estimate_suite, reverse=True)
+    return [self.order_tests(suite) if suite.concurrent_tests else suite
+            for suite in ordered]
+
+  def order_tests(self, suite):
+    """
+    Orders tests so every test still goes after its prerequisites, and
+    among tests which are ready to run the one which heads the longest
+    chain of dependent tests goes first.
+
+    Args:
+      suite: A HawkeyeTestSuite object with all dependencies declared.
+    Returns:
+      A HawkeyeTestSuite object with reordered tests.
+    """
+    tests = list(suite)
+    prerequisites = get_prerequisites(tests)
+    dependents = [[] for _ in tests]
+    for index, required in enumerate(prerequisites):
+      for prerequisite in required:
+        dependents[prerequisite].append(index)
+
+    # Tests are in topological order, so dependents are processed first
+    chain_durations = [0.0] * len(tests)
+    for index in reversed(range(len(tests))):
+      chain_durations[index] = self.estimate_test(tests[index]) + max(
+        [chain_durations[dependent] for dependent in dependents[index]] or [0])
+
+    remaining = [len(required) for required in prerequisites]
+    ready = [(-chain_durations[index], index)
+             for index, count in enumerate(remaining) if count == 0]
+    heapq.heapify(ready)
+    ordered = []
+    while ready:
+      _, index = heapq.heappop(ready)
+      ordered.append(tests[index])
+      for dependent in dependents[index]:
+        remaining[dependent] -= 1
+        if remaining[dependent] == 0:
+          heapq.heappush(ready, (-chain_durations[dependent], dependent))
+    return suite.copy_with_tests(ordered)
+
+
+class RunProgress(object):
+  """
+  Prints progress bar and estimated time left after every finished suite.
+  Estimation is based on run history and is corrected by actual speed of
+  the current run.
+  """
+
+  BAR_WIDTH = 30
+
+  def __init__(self, hawkeye_suites, history, stream=sys.stdout):
+    """
+    Args:
+      hawkeye_suites: A list of HawkeyeTestSuite objects to be run.
+      history: A RunHistory object.
+      stream: A file-like object to print progress to.
+    """
+    self._estimates = {suite.short_name: history.estimate_suite(suite)
+                       for suite in hawkeye_suites}
+    self._total = sum(self._estimates.itervalues())
+    self._done = 0.0
+    self._finished = 0
+    self._started_at = time.time()
+    self._stream = stream
+
+  def suite_finished(self, suite):
+    """
+    Reports that suite is finished and prints progress.
+
+    Args:
+      suite: A HawkeyeTestSuite object.
+    """
+    self._done += self._estimates.get(suite.short_name, 0.0)
+    self._finished += 1
+    if self._total:
+      fraction = min(self._done / self._total, 1.0)
+    else:
+      fraction = float(self._finished) / len(self._estimates)
+    elapsed = time.time() - self._started_at
+    eta = elapsed * (1 - fraction) / fraction if fraction else 0
+    filled = int(round(fraction * self.BAR_WIDTH))
+    self._stream.write(
+      "\n[{bar}] {finished}/{count} suites, {elapsed} elapsed, ETA {eta}\n"
+      .format(bar="#" * filled + "-" * (self.BAR_WIDTH - filled),
+              finished=self._finished, count=len(self._estimates),
+              elapsed=_format_seconds(elapsed), eta=_format_seconds(eta)))
+    self._stream.flush()
+
+
+def _format_seconds(seconds):
+  minutes, seconds = divmod(int(seconds), 60)
+  hours, minutes = divmod(minutes, 60)
+  return "{:02}:{:02}:{:02}".format(hours, minutes, seconds)
@@ -0,0 +1,201 @@
+import collections
+import contextlib
+import cProfile
+import gc
+import os
+import pstats
+import resource
+import sys
+import threading
+
+try:
+  # Is a part of python 3 and is available for python 2.7
+  # as pytracemalloc package (requires patched interpreter)
+  import tracemalloc
+except ImportError:
+  tracemalloc = None
+
+# File with stacks sampled during the run in collapsed format
+# ("<frame>;<frame>;... <count>") which is read by flamegraph tools.
+STACKS_FILE = "stacks.collapsed"
+
+# Number of lines to list in memory report of a suite.
+MEMORY_REPORT_LINES = 25
+
+
+class RunProfiler(object):
+  """
+  Profiles hawkeye runner itself (not the tested application):
+    - every test (and other labeled parts of the run like tests discovery)
+      runs under cProfile, profiles are aggregated to <label>.pstats file;
+    - stacks of all threads (including log writer and async requests
+      workers) are sampled to a collapsed-stack file;
+    - memory allocated during every suite is reported to
+      <label>.memory.txt (using tracemalloc if it's available or counts of
+      objects tracked by gc otherwise).
+  """
+
+  def __init__(self, output_dir, sample_interval=0.01):
+    """
+    Args:
+      output_dir: A string - directory to save profiles to.
+      sample_interval: A float - seconds between samples of threads stacks.
+    """
+    self.output_dir = output_dir
+    self.sample_interval = sample_interval
+    self._stats = {}
+    self._stacks = collections.Counter()
+    self._thread_labels = {}
+    self._lock = threading.Lock()
+    self._stopped = threading.Event()
+    self._sampler = None
+    if not os.path.exists(output_dir):
+      os.makedirs(output_dir)
+
+  def start(self):
+    """ Starts sampling stacks of threads in background. """
+    if tracemalloc and not tracemalloc.is_tracing():
+      tracemalloc.start()
+    self._sampler = threading.Thread(target=self._sample_forever,
+                                     name="hawkeye-profiler")
+    self._sampler.daemon = True
+    self._sampler.start()
+
+  def stop(self):
+    """ Stops sampling and saves collected stacks and profiles. """
+    self._stopped.set()
+    if self._sampler:
+      self._sampler.join()
+    with open(os.path.join(self.output_dir, STACKS_FILE), "w") as stacks_file:
+      for stack, count in sorted(self._stacks.iteritems()):
+        stacks_file.write("{stack} {count}\n".format(stack=stack, count=count))
+    with self._lock:
+      for label, stats in self._stats.iteritems():
+        stats.dump_stats(self._file_name(label, "pstats"))
+
+  @contextlib.contextmanager
+  def profile(self, label):
+    """
+    Runs code of with-block in current thread under cProfile. Profile is
+    added to aggregated profile of label and stacks sampled from current
+    thread are prefixed with label.
+
+    Args:
+      label: A string - e.g. short name of suite.
+    """
+    thread_id = threading.current_thread().ident
+    previous_label = self._thread_labels.get(thread_id)
+    self._thread_labels[thread_id] = label
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+      yield
+    finally:
+      profile.disable()
+      if previous_label is None:
+        del self._thread_labels[thread_id]
+      else:
+        self._thread_labels[thread_id] = previous_label
+      with self._lock:
+        if label in self._stats:
+          self._stats[label].add(profile)
+        else:
+          self._stats[label] = pstats.Stats(profile)
+
+  def profiled(self, label, function):
+    """
+    Wraps function, so it's run under profile(label).
+
+    Args:
+      label: A string - e.g. short name of suite.
+      function: A callable to wrap.
+    Returns:
+      A wrapped function.
+    """
+    def profiled_function(*args, **kwargs):
+      with self.profile(label):
+        return function(*args, **kwargs)
+    return profiled_function
+
+  @contextlib.contextmanager
+  def memory(self, label):
+    """
+    Reports memory which was allocated by the runner during with-block
+    and wasn't released. Snapshots are process-wide, so report includes
+    allocations of other suites running concurrently.
+
+    Args:
+      label: A string - e.g. short name of suite.
+    """
+    before = _memory_snapshot()
+    try:
+      yield
+    finally:
+      after = _memory_snapshot()
+      with open(self._file_name(label, "memory.txt"), "w") as report:
+        report.write(_memory_report(before, after))
+
+  def _file_name(self, label, extension):
+    return os.path.join(self.output_dir, "{label}.{ext}".format(
+      label=label, ext=extension))
+
+  def _sample_forever(self):
+    own_id = threading.current_thread().ident
+    while not self._stopped.wait(self.sample_interval):
+      names = {thread.ident: thread.name for thread in threading.enumerate()}
+      for thread_id, frame in sys._current_frames().items():
+        if thread_id == own_id:
+          continue
+        label = (self._thread_labels.get(thread_id)
+                 or names.get(thread_id, "thread-{}".format(thread_id)))
+        self._stacks[_collapse_stack(label, frame)] += 1
+
+
+def _collapse_stack(label, frame):
+  """
+  Returns:
+    A string - stack of frame from the outermost call, frames are
+    separated by ';' and prefixed with label.
+  """
+  frames = []
+  while frame is not None:
+    code = frame.f_code
+    frames.append("{func} ({file}:{line})".format(
+      func=code.co_name, file=os.path.basename(code.co_filename),
+      line=code.co_firstlineno))
+    frame = frame.f_back
+  frames.append(label)
+  # Spaces separate stack from count in collapsed format
+  return ";".join(reversed(frames)).replace(" ", "_")
+
+
+def _memory_snapshot():
+  """
+  Returns:
+    A tracemalloc.Snapshot object or a Counter of gc-tracked objects
+    by type name if tracemalloc is not available.
+  """
+  if tracemalloc:
+    return tracemalloc.take_snapshot()
+  gc.collect()
+  return collections.Counter(type(obj).__name__ for obj in gc.get_objects())
+
+
+def _memory_report(before, after):
+  """
+  Returns:
+    A string listing the biggest growths between two snapshots.
+  """
+  max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  lines = ["Max RSS of the process: {} KB".format(max_rss)]
+  if tracemalloc:
+    lines.append("Top allocations (by line):")
+    for stat in after.compare_to(before, "lineno")[:MEMORY_REPORT_LINES]:
+      lines.append(str(stat))
+  else:
+    lines.append("tracemalloc is not available, growth of objects tracked "
+                 "by gc (by type):")
+    growth = after - before
+    for type_name, count in growth.most_common(MEMORY_REPORT_LINES):
+      lines.append("{count:>10} {type}".format(count=count, type=type_name))
+  return "\n".join(lines) + "\n"
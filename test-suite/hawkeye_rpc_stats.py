@@ -0,0 +1,174 @@
+import csv
+import threading
+
+# Endpoint of python application which reports RPCs made by requests
+# handled by the instance (grouped by route) and resets them on DELETE.
+STATS_PATH = "/{lang}/_hawkeye/stats"
+
+CSV_HEADER = ("suite", "route", "requests", "service", "calls",
+              "calls_per_request", "request_bytes", "response_bytes",
+              "total_ms")
+
+# Counters of service RPCs which are subtracted when diff is computed.
+COUNTERS = ("calls", "request_bytes", "response_bytes", "total_ms")
+
+
+class RpcStatsCollector(object):
+  """
+  Scrapes RPC aggregates of application before and after every suite,
+  so RPCs made by requests of the suite are known (e.g. to spot N+1
+  patterns). Aggregates are kept per instance of application, so numbers
+  are exact only if a single instance serves the tests (hawkeye doesn't
+  collect them when suites run concurrently).
+  """
+
+  def __init__(self, app):
+    """
+    Args:
+      app: An Application object.
+    """
+    self.app = app
+    self.available = True
+    self.suites_stats = {}
+    """ Suite short name -> dict (<route>: <route stats>) """
+    self._before = {}
+    self._lock = threading.Lock()
+
+  def reset(self):
+    """
+    Resets aggregates of application. Collector is disabled if
+    application doesn't support stats endpoint.
+    """
+    try:
+      response = self.app.delete(STATS_PATH)
+      self.available = response.status_code in (200, 204)
+    except Exception:
+      self.available = False
+
+  def suite_started(self, suite):
+    """
+    Args:
+      suite: A HawkeyeTestSuite object.
+    """
+    snapshot = self._scrape()
+    with self._lock:
+      self._before[suite.short_name] = snapshot
+
+  def suite_finished(self, suite):
+    """
+    Args:
+      suite: A HawkeyeTestSuite object.
+    """
+    after = self._scrape()
+    with self._lock:
+      before = self._before.pop(suite.short_name, None)
+      if after is not None:
+        self.suites_stats[suite.short_name] = diff_stats(before, after)
+
+  def _scrape(self):
+    """
+    Returns:
+      A dict reported by stats endpoint or None if it's not available.
+    """
+    if not self.available:
+      return None
+    try:
+      response = self.app.get(STATS_PATH)
+      if response.status_code == 200:
+        stats = response.json()
+        if isinstance(stats, dict) and isinstance(stats.get("routes"), dict):
+          return stats
+    except Exception:
+      pass
+    return None
+
+
+def diff_stats(before, after):
+  """
+  Computes RPCs made between two snapshots of stats endpoint.
+
+  Args:
+    before: A dict - earlier snapshot (or None).
+    after: A dict - later snapshot.
+  Returns:
+    A dict (<route>: {"requests": <number>, "rpcs": {<service>: <dict of
+    COUNTERS>}}) with routes which handled requests between snapshots.
+  """
+  if (not before or before.get("instance") != after.get("instance")
+      or before.get("since") != after.get("since")):
+    # Aggregates were reset (or another instance responded)
+    before = {"routes": {}}
+  routes = {}
+  for route, stats in after["routes"].iteritems():
+    old = before["routes"].get(route, {"requests": 0, "rpcs": {}})
+    requests = stats["requests"] - old["requests"]
+    if requests <= 0:
+      continue
+    rpcs = {}
+    for service, counters in stats["rpcs"].iteritems():
+      old_counters = old["rpcs"].get(service, {})
+      rpcs[service] = {name: counters[name] - old_counters.get(name, 0)
+                       for name in COUNTERS}
+    routes[route] = {"requests": requests, "rpcs": rpcs}
+  return routes
+
+
+def rpcs_per_request(routes):
+  """
+  Args:
+    routes: A dict built by diff_stats.
+  Returns:
+    A tuple (number of requests, average number of RPCs per request).
+  """
+  requests = sum(stats["requests"] for stats in routes.itervalues())
+  calls = sum(counters["calls"] for stats in routes.itervalues()
+              for counters in stats["rpcs"].itervalues())
+  return requests, float(calls) / requests if requests else 0.0
+
+
+def save_rpc_stats_to_csv(suites_stats, file_name):
+  """
+  Saves RPCs of every suite, route and service to csv file.
+
+  Args:
+    suites_stats: A dict (<suite short name>: <dict built by diff_stats>).
+    file_name: A string - name of csv file.
+  """
+  with open(file_name, "w") as csv_file:
+    csv_writer = csv.writer(csv_file)
+    csv_writer.writerow(CSV_HEADER)
+    for suite in sorted(suites_stats):
+      for route, stats in sorted(suites_stats[suite].iteritems()):
+        for service, counters in sorted(stats["rpcs"].iteritems()):
+          csv_writer.writerow((
+            suite, route, stats["requests"], service, counters["calls"],
+            "{:.2f}".format(float(counters["calls"]) / stats["requests"]),
+            counters["request_bytes"], counters["response_bytes"],
+            "{:.1f}".format(counters["total_ms"])
+          ))
+
+
+def print_rpc_stats(suites_stats, verbosity, routes_count=10):
+  """
+  Prints average number of RPCs per request of every suite.
+
+  Args:
+    suites_stats: A dict (<suite short name>: <dict built by diff_stats>).
+    verbosity: An integer - if > 1 the chattiest routes are listed.
+    routes_count: An integer - number of the chattiest routes to list.
+  """
+  if not suites_stats:
+    return
+  print("\nRPCs per request:")
+  for suite in sorted(suites_stats):
+    requests, per_request = rpcs_per_request(suites_stats[suite])
+    print(" {:>6.1f} ({:>5} requests)  {}".format(per_request, requests, suite))
+  if verbosity > 1:
+    chattiest = sorted(
+      ((rpcs_per_request({route: stats})[1], suite, route)
+       for suite, routes in suites_stats.iteritems()
+       for route, stats in routes.iteritems()),
+      reverse=True)[:routes_count]
+    print("Chattiest routes:")
+    for per_request, suite, route in chattiest:
+      print(" {:>6.1f}  {} ({})".format(per_request, route, suite))
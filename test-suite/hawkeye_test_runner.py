@@ -1,9 +1,19 @@
+import collections
 import csv
+import hashlib
 import inspect
 import json
 import sys
+import time
 import traceback
 import unittest
+from StringIO import StringIO
+from unittest.runner import _WritelnDecorator
+
+import requests
+from concurrent.futures import (
+  ThreadPoolExecutor, FIRST_COMPLETED, wait, as_completed
+)
 
 # We want to proceed nicely on systems that don't have termcolor installed.
 try:
@@ -21,7 +31,13 @@ except ImportError:
     """
     print(msg)
 
-from hawkeye_utils import logger, ResponseInfo
+from hawkeye_utils import logger, ResponseInfo, TestContext, TestTimeout, \
+  set_current_test
+
+
+class PrerequisiteFailed(Exception):
+  """ Raised instead of running a test if its prerequisite did not succeed. """
+  pass
 
 
 class HawkeyeTestCase(unittest.TestCase):
@@ -30,6 +46,25 @@ class HawkeyeTestCase(unittest.TestCase):
   tested application.
   """
 
+  REQUIRES = ()
+  """
+  Names of test case classes which must be added to the suite before this
+  test case and succeed before this test starts (e.g. because they put
+  entities this test queries or fill module globals this test reads).
+  """
+
+  REQUEST_TIMEOUT = None
+  """
+  A tuple (connect, read) - timeouts in seconds of requests sent by the test
+  (overrides timeouts of suite and default timeouts).
+  """
+
+  DEADLINE = None
+  """
+  Max seconds the test can take including setUp and tearDown
+  (overrides deadline of suite and default deadline).
+  """
+
   def __init__(self, methodName, application):
     """
     Args:
@@ -38,6 +73,8 @@ class HawkeyeTestCase(unittest.TestCase):
     """
     super(HawkeyeTestCase, self).__init__(methodName)
     self.app = application
+    self.request_timeout = self.REQUEST_TIMEOUT
+    self.deadline = self.DEADLINE
 
   @classmethod
   def all_cases(cls, app):
@@ -67,7 +104,8 @@ class HawkeyeTestSuite(unittest.TestSuite):
   Usual TestSuite but with name and short_name which are used by hawkeye
   """
 
-  def __init__(self, name, short_name, **kwargs):
+  def __init__(self, name, short_name, shard_key=None, concurrent_tests=False,
+               request_timeout=None, deadline=None, **kwargs):
     """
     Args:
       name: A descriptive name for the test suite.
@@ -75,11 +113,283 @@ class HawkeyeTestSuite(unittest.TestSuite):
         Should be ideally just one word. This short name is used to name
         log files and other command line options related to this
         test suite.
+      shard_key: A string - if specified, tests of the suite depend on
+        each other (or on state shared with other suites) and are never
+        split between shards. All suites with the same shard_key are placed
+        on the same shard.
+      concurrent_tests: A boolean - determines if all ordering dependencies
+        between tests are declared using REQUIRES, so tests can be run
+        concurrently when their prerequisites are done.
+      request_timeout: A tuple (connect, read) - timeouts in seconds of
+        requests sent by tests of the suite which don't specify their own.
+      deadline: A number - max seconds a test of the suite which doesn't
+        specify its own deadline can take.
       kwargs: keyword arguments to be passed to super __init__.
     """
+    self.request_timeout = request_timeout
+    self.deadline = deadline
     super(HawkeyeTestSuite, self).__init__(**kwargs)
     self.name = name
     self.short_name = short_name
+    self.shard_key = shard_key
+    self.concurrent_tests = concurrent_tests
+    # Is set by runner, concurrency is used only if concurrent_tests is True.
+    self.max_workers = 1
+
+  def copy_with_tests(self, tests):
+    """
+    Creates a new suite with the same names but with a different tests list.
+
+    Args:
+      tests: A list of TestCase objects.
+    Returns:
+      A new HawkeyeTestSuite containing tests.
+    """
+    suite = HawkeyeTestSuite(self.name, self.short_name, self.shard_key,
+                             self.concurrent_tests, self.request_timeout,
+                             self.deadline)
+    suite.addTests(tests)
+    return suite
+
+  def addTest(self, test):
+    """
+    Adds test to the suite. Test which doesn't specify its own timeouts
+    gets timeouts of the suite.
+
+    Args:
+      test: A TestCase object.
+    """
+    super(HawkeyeTestSuite, self).addTest(test)
+    if getattr(test, 'request_timeout', False) is None:
+      test.request_timeout = self.request_timeout
+    if getattr(test, 'deadline', False) is None:
+      test.deadline = self.deadline
+
+  def run(self, result, debug=False):
+    """
+    Runs tests in order they were added to the suite (or concurrently if
+    max_workers > 1 and concurrent_tests is set). A test which prerequisites
+    did not succeed is not run, it's reported as an error instead.
+
+    Args:
+      result: A HawkeyeTestResult object.
+      debug: Is not supported by HawkeyeTestSuite.
+    Returns:
+      The result object.
+    """
+    tests = list(self)
+    prerequisites = get_prerequisites(tests)
+    if self.concurrent_tests and self.max_workers > 1:
+      self._run_concurrently(tests, prerequisites, result)
+    else:
+      self._run_sequentially(tests, prerequisites, result)
+    return result
+
+  def _run_sequentially(self, tests, prerequisites, result):
+    statuses = {}
+    for index, test in enumerate(tests):
+      if result.shouldStop:
+        break
+      failed = [tests[i] for i in prerequisites[index]
+                if statuses[i] != HawkeyeTestResult.SUCCESS]
+      if failed:
+        result.addPrerequisiteFailure(test, failed)
+      else:
+        test(result)
+      statuses[index] = result.report_dict.get(test.id())
+
+  def _run_concurrently(self, tests, prerequisites, result):
+    statuses = {}
+    pending = range(len(tests))
+    running = {}
+    executor = ThreadPoolExecutor(self.max_workers)
+    try:
+      while pending or running:
+        # Start every test which prerequisites are done
+        for index in list(pending):
+          if any(i not in statuses for i in prerequisites[index]):
+            continue
+          pending.remove(index)
+          test = tests[index]
+          failed = [tests[i] for i in prerequisites[index]
+                    if statuses[i] != HawkeyeTestResult.SUCCESS]
+          if failed:
+            result.addPrerequisiteFailure(test, failed)
+            statuses[index] = result.report_dict.get(test.id())
+          else:
+            running[executor.submit(_run_isolated, test, result)] = index
+
+        if not running:
+          continue
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+          index = running.pop(future)
+          test_result = future.result()
+          result.merge(test_result)
+          statuses[index] = test_result.report_dict.get(tests[index].id())
+    finally:
+      executor.shutdown(wait=True)
+
+
+def _run_isolated(test, parent_result):
+  """
+  Runs a test with its own result object, so output and report of
+  concurrently running tests are not mixed.
+
+  Args:
+    test: A TestCase object.
+    parent_result: A HawkeyeTestResult to copy settings from.
+  Returns:
+    A HawkeyeTestResult object with result of the test.
+  """
+  test_result = parent_result.__class__(
+    _WritelnDecorator(StringIO()), parent_result.descriptions,
+    parent_result.verbosity)
+  test(test_result)
+  return test_result
+
+
+def get_prerequisites(tests):
+  """
+  Builds dependency graph of tests using REQUIRES attribute of test cases.
+  Prerequisites of a test are all earlier tests of required classes, so
+  the graph is acyclic and the order of tests is its topological order.
+
+  Args:
+    tests: A list of TestCase objects in order they were added to a suite.
+  Returns:
+    A list where i-th item is a list of indexes of prerequisites of tests[i].
+  Raises:
+    ValueError: If required test case is not added to the suite before
+      the test which requires it.
+  """
+  indexes_by_class = {}
+  prerequisites = []
+  for index, test in enumerate(tests):
+    required = []
+    for class_name in getattr(test, "REQUIRES", ()):
+      if class_name not in indexes_by_class:
+        raise ValueError(
+          "{test_id} requires {class_name} which is not added to the suite "
+          "before it".format(test_id=test.id(), class_name=class_name))
+      required.extend(indexes_by_class[class_name])
+    prerequisites.append(required)
+    indexes_by_class.setdefault(type(test).__name__, []).append(index)
+  return prerequisites
+
+
+def get_dependency_groups(tests):
+  """
+  Splits tests into connected components of dependency graph.
+
+  Args:
+    tests: A list of TestCase objects in order they were added to a suite.
+  Returns:
+    A list where i-th item is an index of the first test in the group
+    of tests[i].
+  """
+  groups = []
+  for index, required in enumerate(get_prerequisites(tests)):
+    groups.append(index)
+    for prerequisite in required:
+      old_group, new_group = groups[prerequisite], groups[index]
+      if old_group != new_group:
+        first, second = min(old_group, new_group), max(old_group, new_group)
+        groups = [first if group == second else group for group in groups]
+  return groups
+
+
+def get_shard_index(key, shards_count):
+  """
+  Deterministically maps a key to a shard. It doesn't depend on python
+  hash seed or platform, so every client machine gets the same result.
+
+  Args:
+    key: A string - test ID or shard key of suite.
+    shards_count: An integer - total number of shards.
+  Returns:
+    An integer from 0 to shards_count-1.
+  """
+  digest = hashlib.md5(key.encode("utf-8")).hexdigest()
+  return int(digest[:8], 16) % shards_count
+
+
+def select_shard(hawkeye_suites, shard_index, shards_count):
+  """
+  Leaves only tests which belong to specified shard. Tests of suites with
+  shard_key are kept together, other tests are distributed by hash of
+  their IDs (tests which depend on each other are distributed as a group
+  using ID of the first test in group). Order of suites and order of tests
+  inside of suites is preserved.
+
+  Args:
+    hawkeye_suites: A list of HawkeyeTestSuite objects.
+    shard_index: An integer - 0-based index of the shard to select.
+    shards_count: An integer - total number of shards.
+  Returns:
+    A list of HawkeyeTestSuite objects (suites without selected tests
+    are omitted).
+  """
+  selected = []
+  for suite in hawkeye_suites:
+    if suite.shard_key is not None:
+      if get_shard_index(suite.shard_key, shards_count) == shard_index:
+        selected.append(suite)
+      continue
+    all_tests = list(suite)
+    groups = get_dependency_groups(all_tests)
+    tests = [
+      test for test, group in zip(all_tests, groups)
+      if get_shard_index(all_tests[group].id(), shards_count) == shard_index
+    ]
+    if tests:
+      selected.append(suite.copy_with_tests(tests))
+  return selected
+
+
+TIMINGS_CSV_HEADER = ("test_id", "start", "end", "duration", "setup_time",
+                      "test_time", "teardown_time", "max_latency")
+
+
+class TestTiming(object):
+  """
+  Timestamps of a test run and time spent in its setUp and tearDown.
+  """
+  def __init__(self, start, end=None, setup_time=0.0, teardown_time=0.0):
+    self.start = start
+    self.end = end
+    self.setup_time = setup_time
+    self.teardown_time = teardown_time
+
+  @property
+  def duration(self):
+    """ Seconds spent on the test including setUp and tearDown """
+    return self.end - self.start
+
+  @property
+  def test_time(self):
+    """ Seconds spent on the test method itself """
+    return self.duration - self.setup_time - self.teardown_time
+
+
+def _timed(method, timing, attribute):
+  """
+  Wraps test method, so seconds spent in it are saved to timing attribute.
+
+  Args:
+    method: A bound method to wrap (setUp or tearDown of test).
+    timing: A TestTiming object.
+    attribute: A string - name of timing attribute to save seconds to.
+  Returns:
+    A function to use instead of method.
+  """
+  def timed_method():
+    started_at = time.time()
+    try:
+      method()
+    finally:
+      setattr(timing, attribute, time.time() - started_at)
+  return timed_method
 
 
 class HawkeyeTestResult(unittest.TextTestResult):
@@ -101,6 +411,7 @@ class HawkeyeTestResult(unittest.TextTestResult):
   SKIP = "skip"
   EXPECTED_FAILURE = "expected-failure"
   UNEXPECTED_SUCCESS = "unexpected-success"
+  TIMEOUT = "TIMEOUT"
 
   def __init__(self, stream, descriptions, verbosity):
     super(HawkeyeTestResult, self).__init__(stream, descriptions, verbosity)
@@ -110,6 +421,14 @@ class HawkeyeTestResult(unittest.TextTestResult):
     Item of self.report_dict is pair of test IDs ('<class_name>.<method_name>')
      and test status (one of 'ERROR', 'ok', ...)
     """
+    self.timings = {}
+    """ Test ID -> TestTiming object """
+    self.latencies = {}
+    """ Test ID -> list of latencies of HTTP requests sent by the test """
+    self.server_timings = {}
+    """ Test ID -> list of (latency, server timings) of HTTP requests """
+    self.metrics = {}
+    """ Test ID -> list of (name, value, unit) recorded by the test """
 
   def startTest(self, test):
     super(HawkeyeTestResult, self).startTest(test)
@@ -117,8 +436,30 @@ class HawkeyeTestResult(unittest.TextTestResult):
       "==========================================\n"
       "Starting {test_id}".format(test_id=test.id())
     )
+    timing = TestTiming(start=time.time())
+    self.timings[test.id()] = timing
+    # Instance attributes shadow methods of test class until stopTest
+    test.setUp = _timed(test.setUp, timing, 'setup_time')
+    test.tearDown = _timed(test.tearDown, timing, 'teardown_time')
+    self.latencies[test.id()] = []
+    self.server_timings[test.id()] = []
+    self.metrics[test.id()] = []
+    set_current_test(TestContext(
+      test.id(), self.latencies[test.id()], timing.start,
+      getattr(test, 'request_timeout', None), getattr(test, 'deadline', None),
+      self.server_timings[test.id()], self.metrics[test.id()]))
+
+  def stopTest(self, test):
+    super(HawkeyeTestResult, self).stopTest(test)
+    set_current_test(None)
+    del test.setUp
+    del test.tearDown
+    self.timings[test.id()].end = time.time()
 
   def addError(self, test, err):
+    if issubclass(err[0], (TestTimeout, requests.Timeout)):
+      self.addTimeout(test, err)
+      return
     super(HawkeyeTestResult, self).addError(test, err)
     self.report_dict[test.id()] = self.ERROR
     logger.error("{test_id} - failed with error:\n{trace}"
@@ -153,6 +494,64 @@ class HawkeyeTestResult(unittest.TextTestResult):
     logger.warn("{test_id} - unexpectedly succeeded"
                 .format(test_id=test.id()))
 
+  def addTimeout(self, test, err):
+    """
+    Reports a test which exceeded its deadline or timeout of a request.
+
+    Args:
+      test: A TestCase object.
+      err: A tuple returned by sys.exc_info().
+    """
+    # Error is saved without printing ERROR by TextTestResult
+    unittest.TestResult.addError(self, test, err)
+    if self.showAll:
+      self.stream.writeln("TIMEOUT")
+    elif self.dots:
+      self.stream.write("T")
+      self.stream.flush()
+    self.report_dict[test.id()] = self.TIMEOUT
+    elapsed = time.time() - self.timings[test.id()].start
+    logger.error("{test_id} - timed out after {elapsed:.3f}s:\n{trace}"
+                 .format(test_id=test.id(), elapsed=elapsed,
+                         trace=self._render_cut_traceback(test, err)))
+
+  def addPrerequisiteFailure(self, test, failed_prerequisites):
+    """
+    Reports a test which is not run because some of its prerequisites
+    did not succeed.
+
+    Args:
+      test: A TestCase object.
+      failed_prerequisites: A list of TestCase objects.
+    """
+    error = PrerequisiteFailed(
+      "Test is not run as prerequisite(s) did not succeed: {}".format(
+        ", ".join(prerequisite.id() for prerequisite in failed_prerequisites)))
+    self.startTest(test)
+    self.addError(test, (PrerequisiteFailed, error, None))
+    self.stopTest(test)
+
+  def merge(self, other):
+    """
+    Adds results and output of other HawkeyeTestResult to this one.
+
+    Args:
+      other: A HawkeyeTestResult object (with StringIO stream).
+    """
+    self.testsRun += other.testsRun
+    self.errors.extend(other.errors)
+    self.failures.extend(other.failures)
+    self.skipped.extend(other.skipped)
+    self.expectedFailures.extend(other.expectedFailures)
+    self.unexpectedSuccesses.extend(other.unexpectedSuccesses)
+    self.report_dict.update(other.report_dict)
+    self.timings.update(other.timings)
+    self.latencies.update(other.latencies)
+    self.server_timings.update(other.server_timings)
+    self.metrics.update(other.metrics)
+    self.stream.write(other.stream.getvalue())
+    self.stream.flush()
+
   def printErrors(self):
     if self.verbosity > 1:
       super(HawkeyeTestResult, self).printErrors()
@@ -200,6 +599,117 @@ def save_report_dict_to_csv(report_dict, file_name):
       csv_writer.writerow((test_id, report_dict[test_id]))
 
 
+def save_timings_to_csv(timings, file_name, latencies=None):
+  """
+  Persists timings of tests to csv file in alphabetical order of test IDs.
+
+  Args:
+    timings: A dict with timings of tests (<test_id>: <TestTiming>).
+    file_name: A string - name of csv file where timings should be saved.
+    latencies: A dict with latencies of tests requests
+      (<test_id>: <list of seconds>) to save max latency of every test.
+  """
+  latencies = latencies or {}
+  with open(file_name, "w") as csv_file:
+    csv_writer = csv.writer(csv_file)
+    csv_writer.writerow(TIMINGS_CSV_HEADER)
+    for test_id in sorted(timings.keys()):
+      timing = timings[test_id]
+      max_latency = max(latencies.get(test_id) or [None])
+      csv_writer.writerow((
+        test_id, "{:.3f}".format(timing.start), "{:.3f}".format(timing.end),
+        "{:.3f}".format(timing.duration), "{:.3f}".format(timing.setup_time),
+        "{:.3f}".format(timing.test_time), "{:.3f}".format(timing.teardown_time),
+        "{:.3f}".format(max_latency) if max_latency is not None else ""
+      ))
+
+
+def sum_server_timings(server_timings):
+  """
+  Splits total latency of requests into network time, handler time and
+  time of API RPCs (RPCs are part of handler time).
+
+  Args:
+    server_timings: A list of tuples (latency, server timings) of requests.
+  Returns:
+    A dict with "requests", "latency", "network", "handler" and per-service
+    sums in seconds, and sorted list of names of "services". Empty dict if
+    there are no requests with server timings.
+  """
+  if not server_timings:
+    return {}
+  breakdown = collections.defaultdict(float)
+  services = set()
+  for latency, timings in server_timings:
+    handler = timings.get("handler", 0.0)
+    breakdown["latency"] += latency
+    breakdown["handler"] += handler
+    breakdown["network"] += max(latency - handler, 0.0)
+    for name, duration in timings.iteritems():
+      if name != "handler":
+        services.add(name)
+        breakdown[name] += duration
+  breakdown = dict(breakdown)
+  breakdown["requests"] = len(server_timings)
+  breakdown["services"] = sorted(services)
+  return breakdown
+
+
+def save_server_timings_to_csv(server_timings, file_name):
+  """
+  Persists per-test breakdown of requests latency (see sum_server_timings)
+  to csv file in alphabetical order of test IDs.
+
+  Args:
+    server_timings: A dict (<test_id>: <list of (latency, server timings)>).
+    file_name: A string - name of csv file where breakdown should be saved.
+  """
+  breakdowns = {test_id: sum_server_timings(test_requests)
+                for test_id, test_requests in server_timings.iteritems()
+                if test_requests}
+  services = sorted({service for breakdown in breakdowns.itervalues()
+                     for service in breakdown["services"]})
+  columns = ["requests", "latency", "network", "handler"] + services
+  with open(file_name, "w") as csv_file:
+    csv_writer = csv.writer(csv_file)
+    csv_writer.writerow(["test_id"] + columns)
+    for test_id in sorted(breakdowns):
+      breakdown = breakdowns[test_id]
+      csv_writer.writerow(
+        [test_id, breakdown["requests"]] +
+        ["{:.3f}".format(breakdown.get(column, 0.0))
+         for column in columns[1:]])
+
+
+def save_metrics_to_csv(metrics, file_name):
+  """
+  Persists measurements recorded by tests in alphabetical order of test IDs.
+
+  Args:
+    metrics: A dict (<test_id>: <list of (name, value, unit)>).
+    file_name: A string - name of csv file where metrics should be saved.
+  """
+  with open(file_name, "w") as csv_file:
+    csv_writer = csv.writer(csv_file)
+    csv_writer.writerow(("test_id", "metric", "value", "unit"))
+    for test_id in sorted(metrics):
+      for name, value, unit in metrics[test_id]:
+        csv_writer.writerow((test_id, name, value, unit))
+
+
+def load_timings_from_csv(file_name):
+  """
+  Loads timings saved by save_timings_to_csv.
+
+  Args:
+    file_name: A string representing name of source csv file.
+  Returns:
+    A dict (<test_id>: <dict of column name to value>).
+  """
+  with open(file_name, "r") as csv_file:
+    return {row["test_id"]: row for row in csv.DictReader(csv_file)}
+
+
 def load_report_dict_from_csv(file_name):
   """
   Loads test statuses report from csv file.
@@ -210,7 +720,133 @@ def load_report_dict_from_csv(file_name):
     A dictionary with statuses of tests (<test_id>: <status>).
   """
   with open(file_name, "r") as csv_file:
-    return {test_id: result.rstrip() for test_id, result in csv.reader(csv_file)}
+    return {row[0]: row[1].rstrip() for row in csv.reader(csv_file)}
+
+
+# Max seconds a test is expected to take and max seconds any single
+# HTTP request of the test is expected to take (None if not limited).
+PerformanceBudget = collections.namedtuple(
+  'PerformanceBudget', ['duration', 'latency'])
+
+
+def load_budgets_from_csv(file_name):
+  """
+  Loads performance budgets from baseline csv file. Besides test ID and
+  status, baseline row can contain optional duration and latency budgets
+  (in seconds): "<test_id>,<status>[,<max_duration>[,<max_latency>]]".
+
+  Args:
+    file_name: A string representing name of baseline csv file.
+  Returns:
+    A dictionary with budgets of tests (<test_id>: <PerformanceBudget>).
+  """
+  budgets = {}
+  with open(file_name, "r") as csv_file:
+    for row in csv.reader(csv_file):
+      limits = [float(value) if value.strip() else None for value in row[2:4]]
+      limits += [None] * (2 - len(limits))
+      if any(limit is not None for limit in limits):
+        budgets[row[0]] = PerformanceBudget(*limits)
+  return budgets
+
+
+def find_budget_violations(budgets, report_dict, durations, latencies,
+                           factor=1.0):
+  """
+  Finds succeeded tests which were slower than their budgets.
+
+  Args:
+    budgets: A dict with budgets of tests (<test_id>: <PerformanceBudget>).
+    report_dict: A dict with statuses of tests (<test_id>: <status>).
+    durations: A dict with durations of tests (<test_id>: <seconds>).
+    latencies: A dict with latencies of tests requests
+      (<test_id>: <list of seconds>).
+    factor: A float - how many times a test can exceed its budget
+      before it's reported.
+  Returns:
+    A list of tuples (test_id, measure, budget, actual) ordered by test_id,
+    where measure is 'duration' or 'latency'.
+  """
+  violations = []
+  for test_id, budget in sorted(budgets.iteritems()):
+    if report_dict.get(test_id) != HawkeyeTestResult.SUCCESS:
+      continue
+    duration = durations.get(test_id)
+    if (budget.duration is not None and duration is not None
+        and duration > budget.duration * factor):
+      violations.append((test_id, 'duration', budget.duration, duration))
+    latency = max(latencies.get(test_id) or [None])
+    if (budget.latency is not None and latency is not None
+        and latency > budget.latency * factor):
+      violations.append((test_id, 'latency', budget.latency, latency))
+  return violations
+
+
+def merge_report_csv_files(file_names):
+  """
+  Combines test statuses reports saved by different shards.
+
+  Args:
+    file_names: A list of strings - names of csv files to merge.
+  Returns:
+    A dictionary with statuses of tests (<test_id>: <status>).
+  Raises:
+    ValueError: If the same test has different statuses in different reports.
+  """
+  merged = {}
+  for file_name in file_names:
+    for test_id, status in load_report_dict_from_csv(file_name).iteritems():
+      if merged.get(test_id, status) != status:
+        raise ValueError(
+          "Test {test_id} has conflicting statuses in shard reports "
+          "({first} and {second})"
+          .format(test_id=test_id, first=merged[test_id], second=status))
+      merged[test_id] = status
+  return merged
+
+
+def save_cross_language_report(language_reports, file_name):
+  """
+  Saves statuses, durations and max latencies of tests run against
+  applications in different languages side by side.
+
+  Args:
+    language_reports: A list of tuples (language, report csv file,
+      durations csv file).
+    file_name: A string - name of csv file where report should be saved.
+  Returns:
+    A list of IDs of tests which have different statuses in different
+    languages (tests missing in some language are not counted).
+  """
+  statuses = {}
+  timings = {}
+  for language, report_file, durations_file in language_reports:
+    statuses[language] = load_report_dict_from_csv(report_file)
+    timings[language] = load_timings_from_csv(durations_file)
+  languages = [language for language, _, _ in language_reports]
+  test_ids = sorted(set(
+    test_id for report in statuses.itervalues() for test_id in report))
+
+  differing = []
+  with open(file_name, "w") as csv_file:
+    csv_writer = csv.writer(csv_file)
+    header = ["test_id"]
+    for language in languages:
+      header += ["{}_status".format(language), "{}_duration".format(language),
+                 "{}_max_latency".format(language)]
+    csv_writer.writerow(header)
+    for test_id in test_ids:
+      row = [test_id]
+      for language in languages:
+        timing = timings[language].get(test_id, {})
+        row += [statuses[language].get(test_id, ""),
+                timing.get("duration", ""), timing.get("max_latency", "")]
+      csv_writer.writerow(row)
+      known = set(report[test_id] for report in statuses.itervalues()
+                  if test_id in report)
+      if len(known) > 1:
+        differing.append(test_id)
+  return differing
 
 
 class ReportsDiff(object):
@@ -264,7 +900,10 @@ def compare_test_reports(first_report_dict, second_report_dict):
 
 class HawkeyeSuitesRunner(object):
 
-  def __init__(self, language, logs_dir, baseline_file, verbosity=1):
+  def __init__(self, language, logs_dir, baseline_file, verbosity=1,
+               test_workers=1, suite_workers=1, budget_factor=1.0,
+               slowest_count=10, progress=None, profiler=None,
+               rpc_stats=None):
     """
     Args:
       language: A string ('python' or 'java').
@@ -272,12 +911,37 @@ class HawkeyeSuitesRunner(object):
       baseline_file: A string representing name of baseline file.
       verbosity: A flag. Is passed to TextTestRunner and HawkeyeTestResult.
         Defines how many details will be written to stdout.
+      test_workers: An integer - max number of concurrently running tests
+        of a suite which allows concurrent tests.
+      suite_workers: An integer - max number of concurrently running suites.
+        Suites should be isolated from each other if it's greater than 1.
+      budget_factor: A float - how many times a succeeded test can exceed
+        performance budget from baseline before it's reported.
+      slowest_count: An integer - number of slowest tests to list in summary.
+      progress: An object with suite_finished(suite) method which is called
+        after every suite (e.g. hawkeye_history.RunProgress).
+      profiler: A hawkeye_profile.RunProfiler object to profile every test
+        and memory of every suite with.
+      rpc_stats: A hawkeye_rpc_stats.RpcStatsCollector object to scrape
+        RPCs made by application before and after every suite.
     """
     self.language = language
     self.logs_dir = logs_dir
     self.baseline_file = baseline_file
     self.verbosity = verbosity
+    self.test_workers = test_workers
+    self.suite_workers = suite_workers
+    self.budget_factor = budget_factor
+    self.slowest_count = slowest_count
+    self.progress = progress
+    self.profiler = profiler
+    self.rpc_stats = rpc_stats
     self.suites_report = {}
+    self.suites_durations = {}
+    self.suites_timings = {}
+    self.suites_latencies = {}
+    self.suites_server_timings = {}
+    self.suites_metrics = {}
 
   def run_suites(self, hawkeye_suites):
     """
@@ -288,18 +952,101 @@ class HawkeyeSuitesRunner(object):
     Args:
       hawkeye_suites: A list of HawkeyeTestSuite objects.
     """
+    if self.suite_workers > 1:
+      self._run_suites_concurrently(hawkeye_suites)
+      return
     for suite in hawkeye_suites:
-      print("\n{}".format(suite.name))
-      print("=" * len(suite.name))
-      test_runner = unittest.TextTestRunner(resultclass=HawkeyeTestResult,
-                                            verbosity=self.verbosity,
-                                            stream=sys.stdout)
+      result = self._run_suite(suite, sys.stdout)
+      self._process_suite_result(suite, result)
+
+  def _run_suites_concurrently(self, hawkeye_suites):
+    """
+    Executes up to suite_workers suites at the same time. Output of every
+    suite is buffered and printed when the suite is finished, so output
+    of different suites is not interleaved.
+
+    Args:
+      hawkeye_suites: A list of HawkeyeTestSuite objects.
+    """
+    with ThreadPoolExecutor(max_workers=self.suite_workers) as executor:
+      running = {}
+      for suite in hawkeye_suites:
+        output = StringIO()
+        future = executor.submit(self._run_suite, suite, output)
+        running[future] = (suite, output)
+      for future in as_completed(running):
+        suite, output = running[future]
+        sys.stdout.write(output.getvalue())
+        self._process_suite_result(suite, future.result())
+
+  def _run_suite(self, suite, stream):
+    """
+    Executes tests of a suite.
+
+    Args:
+      suite: A HawkeyeTestSuite object.
+      stream: A file-like object to write suite output to.
+    Returns:
+      A HawkeyeTestResult object.
+    """
+    stream.write("\n{name}\n{line}\n".format(
+      name=suite.name, line="=" * len(suite.name)))
+    suite.max_workers = self.test_workers
+    test_runner = unittest.TextTestRunner(resultclass=HawkeyeTestResult,
+                                          verbosity=self.verbosity,
+                                          stream=stream)
+    if self.rpc_stats:
+      self.rpc_stats.suite_started(suite)
+    started_at = time.time()
+    if self.profiler:
+      result = self._run_profiled(suite, test_runner)
+    else:
       result = test_runner.run(suite)
-      """:type result: HawkeyeTestResult """
+    self.suites_durations[suite.short_name] = time.time() - started_at
+    if self.rpc_stats:
+      self.rpc_stats.suite_finished(suite)
+    return result
+
+  def _run_profiled(self, suite, test_runner):
+    """
+    Executes tests of a suite with every test run under profiler.
+
+    Args:
+      suite: A HawkeyeTestSuite object.
+      test_runner: A unittest.TextTestRunner object.
+    Returns:
+      A HawkeyeTestResult object.
+    """
+    tests = list(suite)
+    # Instance attributes shadow methods of test class until suite is done
+    for test in tests:
+      test.run = self.profiler.profiled(suite.short_name, test.run)
+    try:
+      with self.profiler.memory(suite.short_name):
+        return test_runner.run(suite)
+    finally:
+      for test in tests:
+        del test.run
+
+  def _process_suite_result(self, suite, result):
+    """
+    Adds statuses of suite tests to report and saves error details.
 
-      self.suites_report.update(result.report_dict)
-      if result.errors or result.failures:
-        self._save_error_details(suite.short_name, result)
+    Args:
+      suite: A HawkeyeTestSuite object.
+      result: A HawkeyeTestResult object.
+    """
+    self.suites_report.update(result.report_dict)
+    self.suites_timings.update(result.timings)
+    self.suites_latencies.update(result.latencies)
+    self.suites_server_timings.update(result.server_timings)
+    self.suites_metrics.update(
+      (test_id, metrics) for test_id, metrics in result.metrics.iteritems()
+      if metrics)
+    if result.errors or result.failures:
+      self._save_error_details(suite.short_name, result)
+    if self.progress:
+      self.progress.suite_finished(suite)
 
   ERR_TEMPLATE = (
     "======================================================================\n"
@@ -382,6 +1129,98 @@ class HawkeyeSuitesRunner(object):
       ))
       cprint("    " + missed_in_suites)
 
+    budgets = load_budgets_from_csv(self.baseline_file)
+    durations = {test_id: timing.duration
+                 for test_id, timing in self.suites_timings.iteritems()}
+    violations = find_budget_violations(
+      budgets, self.suites_report, durations,
+      self.suites_latencies, self.budget_factor)
+    cprint("\nPerformance regressions (budget factor {factor}):"
+      .format(factor=self.budget_factor), attrs=["bold"])
+    cprint(" {checked:<3} tests have performance budget in baseline"
+      .format(checked=len(budgets)))
+    cprint(" {slower:<3} succeeded tests exceeded their budget"
+      .format(slower=len(violations)), "yellow",
+      attrs=["bold"] if violations else None)
+    if verbosity > 1 and violations:
+      # Optionally print details about test which exceeded budget
+      slower = "\n    ".join((
+        "{} ... {} {:.3f}s ({:.3f}s budget)".format(
+          test_id, measure, actual, budget)
+        for test_id, measure, budget, actual in violations
+      ))
+      cprint("    " + slower, color="yellow")
+
+    timed_out = sorted(test_id for test_id, status
+                       in self.suites_report.iteritems()
+                       if status == HawkeyeTestResult.TIMEOUT)
+    if timed_out:
+      cprint("\nTimeouts:", attrs=["bold"])
+      cprint(" {count:<3} tests ran out of time".format(count=len(timed_out)),
+             "yellow", attrs=["bold"])
+      if verbosity > 1:
+        # Timings are not known when shard reports are merged
+        cprint("    " + "\n    ".join(
+          "{} ... after {:.3f}s".format(
+            test_id, self.suites_timings[test_id].duration)
+          if test_id in self.suites_timings else test_id
+          for test_id in timed_out), color="yellow")
+
+    if self.suites_timings and self.slowest_count:
+      self._print_slowest_tests()
+
+    breakdown = sum_server_timings(
+      [request for test_requests in self.suites_server_timings.itervalues()
+       for request in test_requests])
+    if breakdown:
+      self._print_server_timings(breakdown)
+
+    if self.suites_metrics:
+      self._print_metrics()
+
+  def _print_slowest_tests(self):
+    """
+    Prints table of tests which took the most time.
+    """
+    slowest = sorted(self.suites_timings.iteritems(),
+                     key=lambda item: item[1].duration,
+                     reverse=True)[:self.slowest_count]
+    cprint("\nSlowest {count} tests:".format(count=len(slowest)),
+           attrs=["bold"])
+    cprint(" {:>9} {:>9} {:>9} {:>9}  {}".format(
+      "total", "setUp", "test", "tearDown", "test ID"))
+    for test_id, timing in slowest:
+      cprint(" {:>8.3f}s {:>8.3f}s {:>8.3f}s {:>8.3f}s  {}".format(
+        timing.duration, timing.setup_time, timing.test_time,
+        timing.teardown_time, test_id))
+
+
+  def _print_server_timings(self, breakdown):
+    """
+    Prints how latency of requests which reported server timings
+    is split between network, handler and API RPCs.
+
+    Args:
+      breakdown: A dict built by sum_server_timings.
+    """
+    cprint("\nServer timing of {count} requests:".format(
+      count=breakdown["requests"]), attrs=["bold"])
+    latency = breakdown["latency"]
+    for name in ["network", "handler"] + breakdown["services"]:
+      share = breakdown[name] / latency * 100 if latency else 0.0
+      cprint(" {:>9.3f}s {:>5.1f}%  {}".format(breakdown[name], share, name))
+
+
+  def _print_metrics(self):
+    """
+    Prints measurements recorded by tests (e.g. by benchmarks).
+    """
+    cprint("\nBenchmark metrics:", attrs=["bold"])
+    for test_id in sorted(self.suites_metrics):
+      cprint(" {}".format(test_id))
+      for name, value, unit in self.suites_metrics[test_id]:
+        cprint("   {:>12.3f} {:<10} {}".format(value, unit, name))
+
 
 class DeprecatedHawkeyeTestCase(HawkeyeTestCase):
   """
@@ -1,13 +1,54 @@
+import cookielib
+import hashlib
 import json
 import logging
 import os
+import Queue
+import threading
+import time
+import uuid
 from datetime import datetime
 
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
 
 LIMITED_BODY_LENGTH = 2000
 
+# Size of chunks which streamed response body is read by.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Response header with server-side timings of request (handler wall time and
+# durations of API RPCs, see python27-app/module-main/server_timing.py).
+SERVER_TIMING_HEADER = "Server-Timing"
+
+# Request headers which correlate request with the test which sent it.
+# Applications write them to their logs and pass them to tasks spawned
+# by the request.
+TEST_ID_HEADER = "X-Hawkeye-Test-Id"
+REQUEST_ID_HEADER = "X-Hawkeye-Request-Id"
+
+# Default max number of requests which are sent by AsyncHTTPEngine at once.
+ASYNC_WORKERS = 100
+
+# Keeps TestContext of a test which is running in current thread.
+_current_test = threading.local()
+
+# Semaphore limiting number of requests being sent at once (can be shared
+# between processes testing different languages).
+_request_budget = None
+
+# Default (connect, read) timeouts in seconds of requests and default
+# max seconds a test can take (can be overridden by suite and test).
+_default_request_timeout = (10, 120)
+_default_test_deadline = 600
+
+
+class TestTimeout(Exception):
+  """ Raised when running test exceeds its deadline. """
+  pass
+
 
 class ResponseInfo:
   """
@@ -23,7 +64,13 @@ class ResponseInfo:
     """
     self.status = response.status_code
     self.headers = response.headers
-    self.payload = response.content
+    if hasattr(response, "body_digest"):
+      # Body was streamed (see read_streamed_body)
+      self.payload = None
+      self.digest = response.body_digest
+      self.length = response.body_length
+    else:
+      self.payload = response.content
 
 
 class HawkeyeConstants:
@@ -36,7 +83,8 @@ class HawkeyeConstants:
 
 
 def hawkeye_request(method, url, params=None, verbosity=3, verify=False,
-                    allow_redirects=False, **kwargs):
+                    allow_redirects=False, session=None, digest=None,
+                    **kwargs):
   """
   Wrapper of requests.request. It writes logs about request sent and
   response received. It also sets default value of `verify` and `allow_redirects`
@@ -54,16 +102,40 @@ def hawkeye_request(method, url, params=None, verbosity=3, verify=False,
     verify: A boolean, determines if server's certificate should be verified.
     allow_redirects: A boolean, determines if redirects should be
       automatically followed.
+    session: A requests.Session to send request with (a new connection
+      is opened for every request if it's None).
+    digest: A string - name of hashlib algorithm (e.g. 'md5'). If it's
+      specified, response body is streamed and isn't kept in memory (see
+      read_streamed_body), only its prefix is logged.
     kwargs: other keyword arguments to be passed to requests.request.
+      If timeout is not specified, timeouts of running test are used
+      (read timeout never exceeds time left before test deadline).
+      Headers get ID of running test and a new request ID (see
+      with_correlation_headers).
 
   Returns:
     an instance of requests.Response.
+  Raises:
+    TestTimeout: If running test has exceeded its deadline.
   """
+  if "timeout" not in kwargs:
+    kwargs["timeout"] = get_request_timeout()
+  kwargs["headers"] = with_correlation_headers(kwargs.get("headers"))
+  started_at = time.time()
+  resp = None
   try:
-    resp = requests.request(
-      method, url, params=params, verify=verify,
-      allow_redirects=allow_redirects, **kwargs
-    )
+    if _request_budget is not None:
+      _request_budget.acquire()
+    try:
+      resp = (session or requests).request(
+        method, url, params=params, verify=verify,
+        allow_redirects=allow_redirects, stream=bool(digest), **kwargs
+      )
+      if digest:
+        read_streamed_body(resp, digest)
+    finally:
+      if _request_budget is not None:
+        _request_budget.release()
     # Use real request which was sent by requests lib
     request_headers = resp.request.headers
     request_body = resp.request.body
@@ -82,26 +154,363 @@ def hawkeye_request(method, url, params=None, verbosity=3, verify=False,
   finally:
     # Anyway log request
     _log_request(method, url, request_headers, request_body, verbosity)
-  _log_response(resp.status_code, url, resp.headers, resp.content, verbosity)
+    _capture_exchange(method, url, request_headers, request_body,
+                      resp, started_at)
+  _log_response(resp.status_code, url, resp.headers, _response_body(resp),
+                verbosity)
+  context = get_current_test()
+  if context is not None:
+    latency = resp.elapsed.total_seconds()
+    context.latencies.append(latency)
+    server_timing = resp.headers.get(SERVER_TIMING_HEADER)
+    if server_timing and context.server_timings is not None:
+      context.server_timings.append(
+        (latency, parse_server_timing(server_timing)))
   return resp
 
 
+def with_correlation_headers(headers):
+  """
+  Adds ID of running test and a new unique request ID to headers,
+  unless they are set already.
+
+  Args:
+    headers: A dict of request headers or None.
+  Returns:
+    A new dict of headers.
+  """
+  headers = dict(headers or {})
+  context = get_current_test()
+  if context is not None:
+    headers.setdefault(TEST_ID_HEADER, context.test_id)
+  headers.setdefault(REQUEST_ID_HEADER, uuid.uuid4().hex)
+  return headers
+
+
+def parse_server_timing(header_value):
+  """
+  Parses value of Server-Timing header.
+
+  Args:
+    header_value: A string like 'handler;dur=12.1, memcache;dur=3.0'.
+  Returns:
+    A dict (<metric name>: <duration in seconds>). Metrics without
+    duration or with malformed duration are skipped.
+  """
+  durations = {}
+  for metric in header_value.split(","):
+    parts = [part.strip() for part in metric.split(";")]
+    name = parts[0]
+    for param in parts[1:]:
+      key, _, value = param.partition("=")
+      if key.strip() == "dur" and name:
+        try:
+          durations[name] = float(value.strip('" ')) / 1000
+        except ValueError:
+          pass
+  return durations
+
+
+def read_streamed_body(response, digest):
+  """
+  Reads body of streamed response by chunks and computes its digest and
+  length, so body of any size takes constant memory. Body is not
+  available as response.content after that, response gets attributes
+  body_digest (hex digest), body_length and body_prefix (first
+  LIMITED_BODY_LENGTH bytes) instead.
+
+  Args:
+    response: A requests.Response object sent with stream=True.
+    digest: A string - name of hashlib algorithm (e.g. 'md5').
+  """
+  hasher = hashlib.new(digest)
+  length = 0
+  prefix = ""
+  try:
+    for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+      hasher.update(chunk)
+      length += len(chunk)
+      if len(prefix) < LIMITED_BODY_LENGTH:
+        prefix += chunk[:LIMITED_BODY_LENGTH - len(prefix)]
+  finally:
+    # Partially read body is still logged if reading failed
+    response.close()
+    response.body_digest = hasher.hexdigest()
+    response.body_length = length
+    response.body_prefix = prefix
+
+
+def _response_body(response):
+  """
+  Returns:
+    A string - body of response to log (a prefix and digest of body if
+    it was streamed).
+  """
+  if not hasattr(response, "body_digest"):
+    return response.content
+  if response.body_length <= len(response.body_prefix):
+    return response.body_prefix
+  # Summary goes first, so it's not cut with long prefix
+  return "STREAMED {length} bytes with digest {digest}, first {n} bytes:\n" \
+         "{prefix}".format(length=response.body_length,
+                           digest=response.body_digest,
+                           n=len(response.body_prefix),
+                           prefix=response.body_prefix)
+
+
+def set_request_budget(semaphore):
+  """
+  Limits number of requests which are sent at once by hawkeye_request.
+
+  Args:
+    semaphore: A threading or multiprocessing semaphore which is acquired
+      while request is being sent (None to remove limit).
+  """
+  global _request_budget
+  _request_budget = semaphore
+
+
+def set_default_timeouts(request_timeout, test_deadline):
+  """
+  Sets timeouts which are used by tests and suites which don't
+  specify their own.
+
+  Args:
+    request_timeout: A tuple (connect, read) - timeouts of requests
+      in seconds.
+    test_deadline: A number - max seconds a test can take.
+  """
+  global _default_request_timeout, _default_test_deadline
+  _default_request_timeout = request_timeout
+  _default_test_deadline = test_deadline
+
+
+class TestContext(object):
+  """
+  Information about a running test which is used to attribute
+  requests to it.
+  """
+  def __init__(self, test_id, latencies, started_at=None,
+               request_timeout=None, deadline=None, server_timings=None,
+               metrics=None):
+    """
+    Args:
+      test_id: A string - ID of the test.
+      latencies: A list to append latencies (in seconds) of requests to.
+      started_at: A float - unix time when the test started.
+      request_timeout: A tuple (connect, read) - timeouts of requests of
+        the test in seconds (default timeouts are used if it's None).
+      deadline: A number - max seconds the test can take (default
+        deadline is used if it's None).
+      server_timings: A list to append tuples (latency, server timings
+        parsed by parse_server_timing) of requests which responses have
+        Server-Timing header to.
+      metrics: A list to append tuples (name, value, unit) recorded
+        by the test (see record_metric) to.
+    """
+    self.test_id = test_id
+    self.latencies = latencies
+    self.server_timings = server_timings
+    self.metrics = metrics
+    self.started_at = started_at or time.time()
+    self.request_timeout = request_timeout or _default_request_timeout
+    self.deadline = self.started_at + (deadline or _default_test_deadline)
+
+  def time_left(self):
+    """
+    Returns:
+      A float - seconds left before test deadline.
+    Raises:
+      TestTimeout: If the test has exceeded its deadline.
+    """
+    time_left = self.deadline - time.time()
+    if time_left <= 0:
+      raise self.deadline_exceeded()
+    return time_left
+
+  def deadline_exceeded(self):
+    """
+    Returns:
+      A TestTimeout exception to raise when the test is out of time.
+    """
+    return TestTimeout("Test exceeded its deadline of {:.0f}s".format(
+      self.deadline - self.started_at))
+
+
+def set_current_test(context):
+  """
+  Makes hawkeye_request calls of current thread (and requests scheduled by
+  AsyncHTTPEngine from current thread) be attributed to a test.
+
+  Args:
+    context: A TestContext object or None if no test is running.
+  """
+  _current_test.context = context
+
+
+def get_current_test():
+  """
+  Returns:
+    A TestContext of a test which is running in current thread or None.
+  """
+  return getattr(_current_test, 'context', None)
+
+
+def record_metric(name, value, unit="ms"):
+  """
+  Records a measurement (e.g. result of benchmark) of running test.
+  It's saved to benchmarks csv next to the output file. Measurements
+  made outside of tests are ignored.
+
+  Args:
+    name: A string - name of metric (unique within the test).
+    value: A number - measured value.
+    unit: A string - unit of value.
+  """
+  context = get_current_test()
+  if context is not None and context.metrics is not None:
+    context.metrics.append((name, value, unit))
+
+
+def get_request_timeout():
+  """
+  Returns:
+    A tuple (connect, read) - timeouts to use for request of a test running
+    in current thread. Read timeout is limited by time left before
+    test deadline.
+  Raises:
+    TestTimeout: If running test has exceeded its deadline.
+  """
+  context = get_current_test()
+  if not context:
+    return _default_request_timeout
+  connect, read = context.request_timeout
+  return connect, min(read, context.time_left())
+
+
+def sleep(seconds):
+  """
+  Sleeps within deadline of a test running in current thread. Poll loops
+  should use it instead of time.sleep, so they stop when test runs out
+  of time.
+
+  Args:
+    seconds: A number - seconds to sleep.
+  Raises:
+    TestTimeout: If test deadline comes before sleep is over.
+  """
+  context = get_current_test()
+  if not context:
+    time.sleep(seconds)
+    return
+  time_left = context.time_left()
+  if seconds < time_left:
+    time.sleep(seconds)
+    return
+  time.sleep(time_left)
+  raise context.deadline_exceeded()
+
+
+def _request_in_context(context, method, url, on_response=None, **kwargs):
+  """
+  Sends request using hawkeye_request in worker thread, so it's
+  attributed to the test which scheduled the request.
+  """
+  set_current_test(context)
+  try:
+    response = hawkeye_request(method, url, **kwargs)
+    if on_response:
+      on_response(response)
+    return response
+  finally:
+    set_current_test(None)
+
+
+class AsyncHTTPEngine(object):
+  """
+  Sends requests in background using bounded pool of workers and
+  keep-alive connections shared by all workers.
+
+  Cookies are never stored, so requests sent through the engine are
+  as independent from each other as requests sent by hawkeye_request.
+  """
+
+  def __init__(self, max_workers=ASYNC_WORKERS):
+    """
+    Args:
+      max_workers: An integer - max number of requests being sent at once.
+    """
+    self._executor = ThreadPoolExecutor(max_workers)
+    self._session = requests.Session()
+    self._session.cookies.set_policy(
+      cookielib.DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(pool_maxsize=max_workers)
+    self._session.mount('http://', adapter)
+    self._session.mount('https://', adapter)
+
+  def submit(self, method, url, on_response=None, **kwargs):
+    """
+    Schedules request. It's sent and logged like one sent by hawkeye_request.
+
+    Args:
+      method: A string name of http method.
+      url: A string URL.
+      on_response: A function which is called with response in worker
+        thread before the future is resolved.
+      kwargs: keyword arguments to be passed to hawkeye_request.
+    Returns:
+      A concurrent.futures.Future which result is requests.Response.
+    """
+    return self._executor.submit(
+      _request_in_context, get_current_test(), method, url,
+      on_response=on_response, session=self._session, **kwargs)
+
+  def shutdown(self):
+    """ Waits for scheduled requests and closes connections. """
+    self._executor.shutdown()
+    self._session.close()
+
+
+class LazyMessage(object):
+  """
+  Log message which is rendered only when a handler writes it,
+  so the thread which logs it doesn't spend time on formatting.
+  """
+
+  def __init__(self, render, *args):
+    """
+    Args:
+      render: A function which returns message string.
+      args: arguments to be passed to render.
+    """
+    self._render = render
+    self._args = args
+
+  def __str__(self):
+    return self._render(*self._args)
+
+
 def _log_request(method, url, headers, body, verbosity):
   if verbosity < 1:
     return
+  # Caller can reuse its headers dict while message is not rendered yet
+  headers = dict(headers) if headers else headers
+  logger.info(LazyMessage(
+    render_request, method, url, headers, body, verbosity))
+
+
+def render_request(method, url, headers, body, verbosity):
   if verbosity == 1:
-    return logger.info(
-      "Request: {method} {url}".format(method=method.upper(), url=url)
-    )
+    return "Request: {method} {url}".format(method=method.upper(), url=url)
   # More verbose message will contain headers
   header_lines = _headers_to_log_string(headers)
   if verbosity == 2:
-    return logger.info(
+    return (
       "Request: {method} {url}\n{headers}"
       .format(method=method.upper(), url=url, headers=header_lines)
     )
   body = _body_to_log_string(body, verbosity)
-  logger.info(
+  return (
     "Request: {method} {url}\n{headers}\n\n{body}"
     .format(method=method.upper(), url=url, headers=header_lines, body=body)
   )
@@ -110,24 +519,53 @@ def _log_request(method, url, headers, body, verbosity):
 def _log_response(status, url, headers, body, verbosity):
   if verbosity < 1:
     return
+  logger.info(LazyMessage(
+    render_response, status, url, headers, body, verbosity))
+
+
+def render_response(status, url, headers, body, verbosity):
   if verbosity == 1:
-    return logger.info(
-      "Response: {status} {url}".format(status=status, url=url)
-    )
+    return "Response: {status} {url}".format(status=status, url=url)
   # More verbose message will contain headers
   header_lines = _headers_to_log_string(headers)
   if verbosity == 2:
-    return logger.info(
+    return (
       "Response: {status} {url}\n{headers}"
       .format(status=status, url=url, headers=header_lines)
     )
   body = _body_to_log_string(body, verbosity)
-  logger.info(
+  return (
     "Response: {status} {url}\n{headers}\n\n{body}"
     .format(status=status, url=url, headers=header_lines, body=body)
   )
 
 
+def _capture_exchange(method, url, request_headers, request_body, response,
+                      started_at):
+  """
+  Passes request and response to capture logger (see hawkeye_capture).
+  Exchange is encoded by background writer, so it's cheap for caller.
+  """
+  if not capture_logger.handlers:
+    return
+  context = get_current_test()
+  request_headers = dict(request_headers or {})
+  capture_logger.info("exchange", extra={"exchange": {
+    "test_id": context.test_id if context else None,
+    "request_id": request_headers.get(REQUEST_ID_HEADER),
+    "method": method.upper(),
+    "url": url,
+    "request_headers": request_headers,
+    "request_body": request_body,
+    "status": response.status_code if response is not None else None,
+    "response_headers": dict(response.headers) if response is not None else {},
+    "response_body": (_response_body(response)
+                      if response is not None else None),
+    "started_at": started_at,
+    "elapsed": time.time() - started_at
+  }})
+
+
 def _headers_to_log_string(headers):
   if not headers:
     return ""
@@ -147,7 +585,77 @@ def _body_to_log_string(body, verbosity):
   return body
 
 
-def configure_hawkeye_logging(hawkeye_logs_dir, language):
+class QueuedHandler(logging.Handler):
+  """
+  Passes log records to a background thread which writes them using
+  target handler. So threads sending requests don't wait for formatting
+  and disk I/O.
+  """
+
+  # What to do when queue is full
+  BLOCK = 'block'   # wait for writer to free space (backpressure)
+  DROP = 'drop'   # drop record and report number of dropped records later
+  OVERFLOW_POLICIES = (BLOCK, DROP)
+
+  def __init__(self, target, queue_size=10000, overflow=BLOCK):
+    """
+    Args:
+      target: A logging.Handler to write records with.
+      queue_size: An integer - max number of records waiting to be written.
+      overflow: A string - one of OVERFLOW_POLICIES.
+    """
+    if overflow not in self.OVERFLOW_POLICIES:
+      raise ValueError("Unknown overflow policy '{policy}'. It can be one of "
+                       "{policies}".format(policy=overflow,
+                                           policies=self.OVERFLOW_POLICIES))
+    super(QueuedHandler, self).__init__()
+    self.target = target
+    self.overflow = overflow
+    self.dropped = 0
+    self._queue = Queue.Queue(queue_size)
+    self._writer = threading.Thread(target=self._write_records,
+                                    name="hawkeye-log-writer")
+    self._writer.daemon = True
+    self._writer.start()
+
+  def emit(self, record):
+    if self.overflow == self.BLOCK:
+      self._queue.put(record)
+      return
+    try:
+      self._queue.put_nowait(record)
+    except Queue.Full:
+      self.dropped += 1
+
+  def _write_records(self):
+    reported_dropped = 0
+    while True:
+      record = self._queue.get()
+      if record is None:
+        return
+      # emit is called under handler lock, so counter is never torn
+      dropped = self.dropped
+      if dropped > reported_dropped:
+        self.target.handle(logging.makeLogRecord({
+          "name": record.name, "levelno": logging.WARNING,
+          "levelname": logging.getLevelName(logging.WARNING),
+          "msg": "{count} log records were dropped as log queue was full"
+                 .format(count=dropped - reported_dropped)
+        }))
+        reported_dropped = dropped
+      self.target.handle(record)
+
+  def close(self):
+    """ Waits until queued records are written and closes target handler. """
+    if self._writer.is_alive():
+      self._queue.put(None)
+      self._writer.join()
+    self.target.close()
+    super(QueuedHandler, self).close()
+
+
+def configure_hawkeye_logging(hawkeye_logs_dir, language, queue_size=10000,
+                              overflow=QueuedHandler.BLOCK, capture=True):
   """
   This function configures hawkeye logger and loggers of some libraries
   to write relevant logs to specific log file located in hawkeye_logs_dir.
@@ -155,9 +663,17 @@ def configure_hawkeye_logging(hawkeye_logs_dir, language):
   which are written manually to report files are aimed to collect debug
   information which can help to understand unexpected failure of testcase.
 
+  Records are written to the file by a background thread.
+
   Args:
     hawkeye_logs_dir: A string - path to hawkeye logs directory.
     language: A string - name of currently testing language.
+    queue_size: An integer - max number of records waiting to be written.
+    overflow: A string - what to do when the queue is full
+      (one of QueuedHandler.OVERFLOW_POLICIES).
+    capture: A boolean - determines if requests and responses should also
+      be saved to structured capture file next to the log
+      (see hawkeye_capture).
   """
   # Configure simple formatter
   formatter = logging.Formatter("%(levelname)s %(name)s %(message)s")
@@ -168,8 +684,10 @@ def configure_hawkeye_logging(hawkeye_logs_dir, language):
     .format(lang=language, dt=datetime.now())
   )
   file_path = os.path.join(hawkeye_logs_dir, file_name)
-  handler = logging.FileHandler(file_path)
-  handler.setFormatter(formatter)
+  file_handler = logging.FileHandler(file_path)
+  file_handler.setFormatter(formatter)
+  file_handler.setLevel(logging.DEBUG)
+  handler = QueuedHandler(file_handler, queue_size, overflow)
   handler.setLevel(logging.DEBUG)
 
   # Configure hawkeye logger
@@ -182,5 +700,19 @@ def configure_hawkeye_logging(hawkeye_logs_dir, language):
   requests_logger.setLevel(logging.WARN)
   requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 
+  if capture:
+    # Imported here as hawkeye_capture depends on this module
+    from hawkeye_capture import CaptureHandler
+    capture_path = "{base}.capture".format(base=os.path.splitext(file_path)[0])
+    capture_handler = QueuedHandler(
+      CaptureHandler(capture_path), queue_size, overflow)
+    capture_logger.addHandler(capture_handler)
+    capture_logger.setLevel(logging.INFO)
+
 
 logger = logging.getLogger("hawkeye")
+
+# Exchanges passed to this logger are not written to detailed log,
+# they are saved to capture file only
+capture_logger = logging.getLogger("hawkeye_capture")
+capture_logger.propagate = False
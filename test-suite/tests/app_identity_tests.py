@@ -71,7 +71,8 @@ class SignatureTest(HawkeyeTestCase):
 
 
 def suite(lang, app):
-  suite = HawkeyeTestSuite('App Identity Test Suite', 'app_identity')
+  suite = HawkeyeTestSuite('App Identity Test Suite', 'app_identity',
+                           concurrent_tests=True)
 
   suite.addTests(ProjectIDTest.all_cases(app))
   suite.addTests(HostnameTest.all_cases(app))
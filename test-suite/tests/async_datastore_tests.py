@@ -40,6 +40,8 @@ class PutAndGetMultipleItemsTest(DeprecatedHawkeyeTestCase):
     self.assertTrue(entry_info['val3_is_None'])
 
 class SimpleKindAwareInsertTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('DataStoreCleanupTest',)
+
   def run_hawkeye_test(self):
     response = self.http_post('/async_datastore/project',
       'name={0}&description=Mediation Engine&rating=8&license=L1'.format(
@@ -75,6 +77,8 @@ class SimpleKindAwareInsertTest(DeprecatedHawkeyeTestCase):
     sleep(5)
 
 class KindAwareInsertWithParentTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareInsertTest',)
+
   def run_hawkeye_test(self):
     response = self.http_post('/async_datastore/module',
       'name={0}&description=A Mediation Core&project_id={1}'.format(
@@ -99,6 +103,8 @@ class KindAwareInsertWithParentTest(DeprecatedHawkeyeTestCase):
     SYNAPSE_MODULES[HawkeyeConstants.MOD_NHTTP] = module_id
 
 class SimpleKindAwareQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('KindAwareInsertWithParentTest',)
+
   def run_hawkeye_test(self):
     project_list = self.assert_and_get_list('/async_datastore/project')
     for entry in project_list:
@@ -119,6 +125,8 @@ class SimpleKindAwareQueryTest(DeprecatedHawkeyeTestCase):
       self.assertEquals(mod_info['name'], entry['name'])
 
 class AncestorQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('KindAwareInsertWithParentTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/async_datastore/project_modules?' \
       'project_id={0}'.format(ALL_PROJECTS[HawkeyeConstants.PROJECT_SYNAPSE]))
@@ -132,6 +140,8 @@ class AncestorQueryTest(DeprecatedHawkeyeTestCase):
     self.assertTrue(modules.index(HawkeyeConstants.MOD_NHTTP) != -1)
 
 class OrderedKindAncestorQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('KindAwareInsertWithParentTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/async_datastore/project_modules?' \
       'project_id={0}&order=module_id'.format(\
@@ -162,6 +172,8 @@ class OrderedKindAncestorQueryTest(DeprecatedHawkeyeTestCase):
 
 
 class KindlessQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('KindAwareInsertWithParentTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list(
       '/async_datastore/project_keys?comparator=gt&project_id={0}'.format(
@@ -182,6 +194,8 @@ class KindlessQueryTest(DeprecatedHawkeyeTestCase):
     self.assertTrue(project_seen)
 
 class KindlessAncestorQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('KindAwareInsertWithParentTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list(
       '/async_datastore/project_keys?ancestor=true&comparator=gt&project_id={0}'.
@@ -206,6 +220,8 @@ class KindlessAncestorQueryTest(DeprecatedHawkeyeTestCase):
     self.assertTrue(project_seen)
 
 class QueryByKeyNameTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('KindAwareInsertWithParentTest',)
+
   def run_hawkeye_test(self):
     response = self.http_get('/async_datastore/entity_names?project_name={0}'.
       format(HawkeyeConstants.PROJECT_SYNAPSE))
@@ -221,6 +237,8 @@ class QueryByKeyNameTest(DeprecatedHawkeyeTestCase):
       SYNAPSE_MODULES[HawkeyeConstants.MOD_CORE])
 
 class SinglePropertyBasedQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareInsertTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/async_datastore/project_ratings?'
                                            'rating=10&comparator=eq')
@@ -262,6 +280,8 @@ class SinglePropertyBasedQueryTest(DeprecatedHawkeyeTestCase):
       pass
 
 class OrderedResultQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareInsertTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/async_datastore/project_ratings?'
                                            'rating=6&comparator=ge&desc=true')
@@ -272,6 +292,8 @@ class OrderedResultQueryTest(DeprecatedHawkeyeTestCase):
       last_rating = entity['rating']
 
 class LimitedResultQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareInsertTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/async_datastore/project_ratings?'
                                            'rating=6&comparator=ge&limit=2')
@@ -286,6 +308,8 @@ class LimitedResultQueryTest(DeprecatedHawkeyeTestCase):
       last_rating = entity['rating']
 
 class ProjectionQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareInsertTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/async_datastore/project_fields?'
                                            'fields=project_id,name')
@@ -307,6 +331,8 @@ class ProjectionQueryTest(DeprecatedHawkeyeTestCase):
       self.assertNotEquals(entity['name'], HawkeyeConstants.PROJECT_XERCES)
 
 class GQLProjectionQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareInsertTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/async_datastore/project_fields?'
                                            'fields=name,rating&gql=true')
@@ -318,6 +344,8 @@ class GQLProjectionQueryTest(DeprecatedHawkeyeTestCase):
       self.assertTrue(entity['name'] is not None)
 
 class CompositeQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareInsertTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/async_datastore/project_filter?'
                                            'license=L1&rate_limit=5')
@@ -336,6 +364,8 @@ class CompositeQueryTest(DeprecatedHawkeyeTestCase):
     self.assertEquals(entity_list[0]['name'], HawkeyeConstants.PROJECT_HADOOP)
 
 class SimpleTransactionTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('DataStoreCleanupTest',)
+
   def run_hawkeye_test(self):
     key = str(uuid.uuid1())
     response = self.http_get('/async_datastore/transactions?' \
@@ -357,6 +387,8 @@ class SimpleTransactionTest(DeprecatedHawkeyeTestCase):
     self.assertEquals(entity['counter'], 2)
 
 class CrossGroupTransactionTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('DataStoreCleanupTest',)
+
   def run_hawkeye_test(self):
     key = str(uuid.uuid1())
     response = self.http_get('/async_datastore/transactions?' \
@@ -381,6 +413,8 @@ class CrossGroupTransactionTest(DeprecatedHawkeyeTestCase):
     self.assertEquals(entity['backup'], 2)
 
 class QueryCursorTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareInsertTest',)
+
   def run_hawkeye_test(self):
     project1 = self.assert_and_get_list('/async_datastore/project_cursor')
     project2 = self.assert_and_get_list('/async_datastore/project_cursor?' \
@@ -468,7 +502,8 @@ class CountQueryTest(DeprecatedHawkeyeTestCase):
     self.assertEquals(response.status, 200)
 
 def suite(lang, app):
-  suite = HawkeyeTestSuite('Asynchronous Datastore Test Suite', 'async_datastore')
+  suite = HawkeyeTestSuite('Asynchronous Datastore Test Suite',
+                           'async_datastore', shard_key='datastore')
   suite.addTests(DataStoreCleanupTest.all_cases(app))
   suite.addTests(PutAndGetMultipleItemsTest.all_cases(app))
   suite.addTests(SimpleKindAwareInsertTest.all_cases(app))
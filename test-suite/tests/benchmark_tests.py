@@ -0,0 +1,431 @@
+import time
+
+from hawkeye_test_runner import HawkeyeTestCase, HawkeyeTestSuite
+from hawkeye_utils import SERVER_TIMING_HEADER, parse_server_timing, \
+  record_metric, sleep
+
+# Number of entities seeded by benchmarks and number of timed runs
+# of every measured operation.
+QUERY_OVERHEAD_PROJECTS = 100
+QUERY_OVERHEAD_REPEATS = 50
+PROJECTION_ENTITIES = 500
+PROJECTION_LIMITS = (10, 100, 500)
+PROJECTION_MODES = ('full', 'projection', 'keys_only')
+PROJECTION_REPEATS = 5
+
+# Payload sizes in bytes (up to about the 1 MB entity limit) and number
+# of entities put, fetched and queried for every size.
+ENTITY_SIZES = (
+  (100, 50),
+  (1000, 50),
+  (10000, 50),
+  (100000, 20),
+  (1000000, 5),
+)
+ENTITY_PAYLOAD_TYPES = ('blob', 'text')
+
+# Shapes (number of indexed properties out of 100, length of list property)
+# of entities put by index writes benchmark. List lengths are measured with
+# 5 indexed properties so composite indexes including a list apply.
+INDEX_WRITE_SHAPES = (
+  [(indexed, 0) for indexed in (0, 5, 20, 100)] +
+  [(5, list_length) for list_length in (10, 100, 500)]
+)
+INDEX_WRITE_ENTITIES = 50
+
+# Number of entities seeded before composite index is registered, number
+# of them seeded by a single request, number of puts timed before and
+# during backfill of the index and max seconds to wait for the backfill.
+BACKFILL_ENTITIES = 20000
+BACKFILL_SEED_BATCH = 2000
+BACKFILL_BASELINE_WRITES = 50
+BACKFILL_WRITES_PER_POLL = 5
+BACKFILL_TIMEOUT = 1200
+
+# Numbers of entities paged through by paging benchmark (the dataset grows
+# from one size to the next one), page size and number of pages fetched
+# by a single request.
+PAGING_DATASET_SIZES = (1000, 10000)
+PAGING_PAGE_SIZE = 100
+PAGING_PAGES_PER_REQUEST = 20
+PAGING_SEED_BATCH = 2000
+PAGING_QUERIES = ('kind', 'composite', 'kindless_ancestor')
+PAGING_STRATEGIES = ('offset', 'cursor')
+
+# Statistics of latency summary reported by benchmark endpoints.
+LATENCY_STATS = ('mean_ms', 'p50_ms', 'p95_ms', 'max_ms')
+
+
+def record_latency_summary(prefix, summary):
+  """
+  Records latency statistics reported by benchmark endpoint.
+
+  Args:
+    prefix: A string - name of measured variant.
+    summary: A dict with latency statistics in milliseconds.
+  """
+  for stat in LATENCY_STATS:
+    if stat in summary:
+      record_metric('{}.{}'.format(prefix, stat[:-len('_ms')]), summary[stat])
+
+
+def record_throughput(prefix, summary):
+  """
+  Records throughput reported by benchmark endpoint.
+
+  Args:
+    prefix: A string - name of measured variant.
+    summary: A dict with entities_per_s and optional kb_per_s items.
+  """
+  if 'entities_per_s' in summary:
+    record_metric('{}.throughput'.format(prefix), summary['entities_per_s'],
+                  'entities/s')
+  if 'kb_per_s' in summary:
+    record_metric('{}.bandwidth'.format(prefix), summary['kb_per_s'], 'KB/s')
+
+
+def merge_latency_summaries(summaries):
+  """
+  Merges latency summaries of several series of runs (approximately:
+  percentiles are taken as max over the series).
+
+  Args:
+    summaries: A list of dicts built by latency_summary of benchmark app.
+  Returns:
+    A dict with count, mean_ms, p95_ms and max_ms items.
+  """
+  summaries = [summary for summary in summaries if summary.get('count')]
+  count = sum(summary['count'] for summary in summaries)
+  if not count:
+    return {'count': 0}
+  return {
+    'count': count,
+    'mean_ms': sum(summary['mean_ms'] * summary['count']
+                   for summary in summaries) / count,
+    'p95_ms': max(summary['p95_ms'] for summary in summaries),
+    'max_ms': max(summary['max_ms'] for summary in summaries)
+  }
+
+
+def depth_bucket(depth):
+  """
+  Returns the first page depth of power-of-two bucket of depth
+  (0, 1, 2-3, 4-7, ...).
+  """
+  if depth == 0:
+    return 0
+  bucket = 1
+  while bucket * 2 <= depth:
+    bucket *= 2
+  return bucket
+
+
+def mean(values):
+  return sum(values) / len(values) if values else 0.0
+
+
+def record_request_costs(prefix, responses):
+  """
+  Records mean end-to-end latency, datastore time (from Server-Timing
+  header) and response size of requests.
+
+  Args:
+    prefix: A string - name of measured variant.
+    responses: A list of requests.Response objects.
+  """
+  record_metric('{}.latency'.format(prefix),
+                mean([resp.elapsed.total_seconds() * 1000
+                      for resp in responses]))
+  datastore_times = [
+    parse_server_timing(resp.headers[SERVER_TIMING_HEADER])
+      .get('datastore_v3', 0.0) * 1000
+    for resp in responses if SERVER_TIMING_HEADER in resp.headers
+  ]
+  if datastore_times:
+    record_metric('{}.datastore'.format(prefix), mean(datastore_times))
+  record_metric('{}.response'.format(prefix),
+                mean([len(resp.content) for resp in responses]), 'bytes')
+
+
+class BenchmarkTestCase(HawkeyeTestCase):
+  """
+  Base class of benchmarks. A single request of a benchmark runs many
+  timed operations on the server, so it has a long read timeout.
+  """
+  REQUEST_TIMEOUT = (10, 300)
+
+  # Max seconds to wait for seeded entities to become visible to queries
+  CONSISTENCY_TIMEOUT = 300
+
+  def wait_for_entities(self, path, expected, count, params=None):
+    """
+    Waits until queries see all seeded entities.
+
+    Args:
+      path: A string - path of endpoint reporting visible entities.
+      expected: An integer - number of seeded entities.
+      count: A function which takes decoded response body and returns
+        number of visible entities.
+      params: A dict - query parameters of request.
+    Raises:
+      AssertionError: If not all entities are visible within
+        CONSISTENCY_TIMEOUT.
+    """
+    deadline = time.time() + self.CONSISTENCY_TIMEOUT
+    while True:
+      response = self.app.get(path, params=params)
+      self.assertEqual(response.status_code, 200)
+      visible = count(response.json())
+      if visible >= expected:
+        return
+      if time.time() > deadline:
+        self.fail("Only {visible} of {expected} seeded entities are visible "
+                  "to queries after {timeout}s"
+                  .format(visible=visible, expected=expected,
+                          timeout=self.CONSISTENCY_TIMEOUT))
+      sleep(1)
+
+
+class QueryOverheadBenchmark(BenchmarkTestCase):
+  """
+  Compares lookups of a project by ID done with GQL string built for every
+  request, bound GqlQuery parsed once, db.Query and get by key.
+  """
+
+  def setUp(self):
+    response = self.app.post('/{lang}/benchmarks/query_overhead',
+                             params={'count': QUERY_OVERHEAD_PROJECTS})
+    self.assertEqual(response.status_code, 201)
+
+  def tearDown(self):
+    self.app.delete('/{lang}/benchmarks/query_overhead')
+
+  def test_query_overhead(self):
+    response = self.app.get('/{lang}/benchmarks/query_overhead',
+                            params={'count': QUERY_OVERHEAD_PROJECTS,
+                                    'repeats': QUERY_OVERHEAD_REPEATS})
+    self.assertEqual(response.status_code, 200)
+    variants = response.json()['variants']
+    for name, summary in sorted(variants.iteritems()):
+      record_latency_summary(name, summary)
+
+
+class ProjectionBenchmark(BenchmarkTestCase):
+  """
+  Compares full-entity, projection and keys-only queries over large
+  entities with many properties as number of results grows.
+  """
+
+  def setUp(self):
+    response = self.app.post('/{lang}/benchmarks/projection',
+                             params={'count': PROJECTION_ENTITIES})
+    self.assertEqual(response.status_code, 201)
+    self.wait_for_entities('/{lang}/benchmarks/projection',
+                           PROJECTION_ENTITIES,
+                           lambda body: len(body['results']),
+                           params={'mode': 'keys_only',
+                                   'limit': PROJECTION_ENTITIES})
+
+  def tearDown(self):
+    self.app.delete('/{lang}/benchmarks/projection')
+
+  def test_projection_payload(self):
+    for limit in PROJECTION_LIMITS:
+      for mode in PROJECTION_MODES:
+        responses = []
+        for _ in xrange(PROJECTION_REPEATS):
+          response = self.app.get('/{lang}/benchmarks/projection',
+                                  params={'mode': mode, 'limit': limit})
+          self.assertEqual(response.status_code, 200)
+          self.assertEqual(len(response.json()['results']), limit)
+          responses.append(response)
+        record_request_costs('{}.{}'.format(mode, limit), responses)
+
+
+class EntitySizeBenchmark(BenchmarkTestCase):
+  """
+  Measures latency and throughput of single and batched puts, gets and
+  ancestor queries of projects with payload from 100 bytes to about 1 MB.
+  """
+
+  def tearDown(self):
+    self.app.delete('/{lang}/benchmarks/entity_size')
+
+  def test_entity_size_sweep(self):
+    for payload_type in ENTITY_PAYLOAD_TYPES:
+      for size, count in ENTITY_SIZES:
+        response = self.app.get('/{lang}/benchmarks/entity_size',
+                                params={'size': size, 'count': count,
+                                        'payload_type': payload_type})
+        self.assertEqual(response.status_code, 200)
+        operations = response.json()['operations']
+        for name, summary in sorted(operations.iteritems()):
+          prefix = '{}.{}.{}'.format(payload_type, size, name)
+          record_latency_summary(prefix, summary)
+          record_throughput(prefix, summary)
+
+
+class IndexWriteBenchmark(BenchmarkTestCase):
+  """
+  Measures put latency and write throughput of entities with growing
+  number of indexed properties and list values, for a kind without
+  composite indexes and for a kind with composite indexes in index.yaml.
+  """
+
+  def tearDown(self):
+    self.app.delete('/{lang}/benchmarks/index_writes')
+
+  def test_index_write_amplification(self):
+    for indexed, list_length in INDEX_WRITE_SHAPES:
+      for composite in (False, True):
+        response = self.app.get('/{lang}/benchmarks/index_writes',
+                                params={'indexed': indexed,
+                                        'list_length': list_length,
+                                        'composite': composite,
+                                        'count': INDEX_WRITE_ENTITIES})
+        self.assertEqual(response.status_code, 200)
+        operations = response.json()['operations']
+        for name, summary in sorted(operations.iteritems()):
+          prefix = 'indexed_{}.list_{}.{}.{}'.format(
+            indexed, list_length, 'composite' if composite else 'builtin',
+            name)
+          record_latency_summary(prefix, summary)
+          record_throughput(prefix, summary)
+
+
+class IndexBackfillBenchmark(BenchmarkTestCase):
+  """
+  Seeds a large kind, registers a new composite index for it and measures
+  how long it takes until a query using the index returns complete results
+  and how latency of puts to the kind changes while the index is built.
+  """
+
+  def setUp(self):
+    for start in xrange(0, BACKFILL_ENTITIES, BACKFILL_SEED_BATCH):
+      response = self.app.post('/{lang}/benchmarks/index_backfill',
+                               params={'start': start,
+                                       'count': BACKFILL_SEED_BATCH})
+      self.assertEqual(response.status_code, 201)
+    self.wait_for_entities('/{lang}/benchmarks/index_backfill',
+                           BACKFILL_ENTITIES, lambda body: body['count'])
+
+  def tearDown(self):
+    self.app.delete('/{lang}/benchmarks/index_backfill/index')
+    self.app.delete('/{lang}/benchmarks/index_backfill')
+
+  def test_index_backfill(self):
+    response = self.app.post('/{lang}/benchmarks/index_backfill/writes',
+                             params={'writes': BACKFILL_BASELINE_WRITES})
+    self.assertEqual(response.status_code, 200)
+    record_latency_summary('writes.baseline', response.json())
+
+    response = self.app.post('/{lang}/benchmarks/index_backfill/index')
+    self.assertEqual(response.status_code, 201, response.text)
+    registered_at = time.time()
+
+    writes = []
+    serving_at = None
+    while True:
+      response = self.app.get('/{lang}/benchmarks/index_backfill/index')
+      self.assertEqual(response.status_code, 200)
+      status = response.json()
+      if serving_at is None and status['state'] == 'READ_WRITE':
+        serving_at = time.time()
+      if status['results'] == status['expected']:
+        break
+      if time.time() - registered_at > BACKFILL_TIMEOUT:
+        self.fail("Query using new index returns {results} of {expected} "
+                  "entities after {timeout}s (index state: {state})"
+                  .format(timeout=BACKFILL_TIMEOUT, **status))
+      response = self.app.post('/{lang}/benchmarks/index_backfill/writes',
+                               params={'writes': BACKFILL_WRITES_PER_POLL})
+      self.assertEqual(response.status_code, 200)
+      writes.append(response.json())
+      sleep(1)
+    complete_at = time.time()
+
+    record_metric('backfill.complete_results', complete_at - registered_at, 's')
+    if serving_at is not None:
+      record_metric('backfill.read_write', serving_at - registered_at, 's')
+    record_latency_summary('writes.during_backfill',
+                           merge_latency_summaries(writes))
+
+
+class PagingBenchmark(BenchmarkTestCase):
+  """
+  Measures latency of every page of kind, composite and kindless ancestor
+  queries paged through with limit/offset and with cursors passed between
+  requests, as dataset grows.
+  """
+
+  def tearDown(self):
+    self.app.delete('/{lang}/benchmarks/paging')
+
+  def seed(self, start, end):
+    for batch_start in xrange(start, end, PAGING_SEED_BATCH):
+      response = self.app.post(
+        '/{lang}/benchmarks/paging',
+        params={'start': batch_start,
+                'count': min(PAGING_SEED_BATCH, end - batch_start)})
+      self.assertEqual(response.status_code, 201)
+    self.wait_for_entities('/{lang}/benchmarks/paging/count', end,
+                           lambda body: min(body.values()))
+
+  def fetch_pages(self, query, strategy):
+    """
+    Pages through all entities.
+
+    Args:
+      query: A string - name of query.
+      strategy: A string - 'offset' or 'cursor'.
+    Returns:
+      A tuple (list of page latencies in ms, number of fetched entities).
+    """
+    latencies = []
+    results = 0
+    cursor = None
+    while True:
+      response = self.app.get('/{lang}/benchmarks/paging',
+                              params={'query': query, 'strategy': strategy,
+                                      'page_size': PAGING_PAGE_SIZE,
+                                      'pages': PAGING_PAGES_PER_REQUEST,
+                                      'start_page': len(latencies),
+                                      'cursor': cursor})
+      self.assertEqual(response.status_code, 200)
+      chunk = response.json()
+      latencies += chunk['latencies_ms']
+      results += chunk['results']
+      cursor = chunk['cursor']
+      if chunk['done']:
+        return latencies, results
+
+  def test_paging_depth(self):
+    seeded = 0
+    for size in PAGING_DATASET_SIZES:
+      self.seed(seeded, size)
+      seeded = size
+      for query in PAGING_QUERIES:
+        for strategy in PAGING_STRATEGIES:
+          latencies, results = self.fetch_pages(query, strategy)
+          self.assertEqual(results, size)
+          by_bucket = {}
+          for depth, latency in enumerate(latencies):
+            by_bucket.setdefault(depth_bucket(depth), []).append(latency)
+          prefix = '{}.{}.{}'.format(size, query, strategy)
+          for bucket in sorted(by_bucket):
+            record_metric('{}.depth_{}'.format(prefix, bucket),
+                          mean(by_bucket[bucket]))
+          record_metric('{}.total'.format(prefix), sum(latencies))
+
+
+def suite(lang, app):
+  suite = HawkeyeTestSuite('Benchmarks Suite', 'benchmarks', deadline=1800)
+  if lang != 'python':
+    return suite
+  suite.addTests(QueryOverheadBenchmark.all_cases(app))
+  suite.addTests(ProjectionBenchmark.all_cases(app))
+  suite.addTests(EntitySizeBenchmark.all_cases(app))
+  suite.addTests(IndexWriteBenchmark.all_cases(app))
+  suite.addTests(IndexBackfillBenchmark.all_cases(app))
+  suite.addTests(PagingBenchmark.all_cases(app))
+  return suite
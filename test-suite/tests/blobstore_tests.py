@@ -1,3 +1,4 @@
+import hashlib
 import json
 import requests
 from StringIO import StringIO
@@ -49,6 +50,8 @@ class UploadBlobTest(HawkeyeTestCase):
 
 
 class DownloadBlobTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('UploadBlobTest',)
+
   def run_hawkeye_test(self):
     response = self.http_get('/blobstore/download/{0}'.format(
       FILE_UPLOADS[FILE1_NAME]))
@@ -62,6 +65,8 @@ class DownloadBlobTest(DeprecatedHawkeyeTestCase):
 
 
 class QueryBlobByKeyTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('UploadBlobTest',)
+
   def run_hawkeye_test(self):
     response = self.http_get('/blobstore/query?key={0}'.format(
       FILE_UPLOADS[FILE1_NAME]))
@@ -80,6 +85,8 @@ class QueryBlobByKeyTest(DeprecatedHawkeyeTestCase):
 
 
 class QueryBlobByPropertyTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('UploadBlobTest',)
+
   def run_hawkeye_test(self):
     response = self.http_get('/blobstore/query?' \
                              'file=file1.txt'.format(FILE_UPLOADS[FILE1_NAME]))
@@ -102,6 +109,8 @@ class QueryBlobByPropertyTest(DeprecatedHawkeyeTestCase):
 
 
 class QueryBlobDataTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('UploadBlobTest',)
+
   def run_hawkeye_test(self):
     response = self.http_get('/blobstore/query?key={0}&data=' \
                             'true&start=0&end=5'.format(FILE_UPLOADS[FILE1_NAME]))
@@ -115,6 +124,8 @@ class QueryBlobDataTest(DeprecatedHawkeyeTestCase):
 
 
 class DeleteBlobTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('UploadBlobTest',)
+
   def run_hawkeye_test(self):
     response = self.http_delete('/blobstore/query?key={0}'.format(
       FILE_UPLOADS[FILE1_NAME]))
@@ -152,6 +163,8 @@ class AsyncUploadBlobTest(HawkeyeTestCase):
 
 
 class AsyncQueryBlobDataTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('AsyncUploadBlobTest',)
+
   def run_hawkeye_test(self):
     response = self.http_get('/blobstore/query?key={0}&data=true&'\
                              'start=0&end=5&async=true'.format(FILE_UPLOADS[FILE3_NAME]))
@@ -160,6 +173,8 @@ class AsyncQueryBlobDataTest(DeprecatedHawkeyeTestCase):
 
 
 class AsyncDeleteBlobTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('AsyncUploadBlobTest',)
+
   def run_hawkeye_test(self):
     response = self.http_delete('/blobstore/query?key={0}&' \
                                   'async=true'.format(FILE_UPLOADS[FILE3_NAME]))
@@ -194,8 +209,11 @@ class GCSBlobstoreBackendTest(HawkeyeTestCase):
     blob_key = response.json()['key']
 
     # Download the blob.
-    response = self.app.get('/'.join(['/{lang}/blobstore/download', blob_key]))
-    self.assertEqual(response.content, FILE1_CONTENT)
+    response = self.app.get('/'.join(['/{lang}/blobstore/download', blob_key]),
+                            digest='md5')
+    self.assertEqual(response.body_length, len(FILE1_CONTENT))
+    self.assertEqual(response.body_digest,
+                     hashlib.md5(FILE1_CONTENT).hexdigest())
 
     # Delete the blob.
     self.app.delete('/{{lang}}/blobstore/query?key={}'.format(blob_key))
@@ -206,7 +224,8 @@ class GCSBlobstoreBackendTest(HawkeyeTestCase):
 
 
 def suite(lang, app):
-  suite = HawkeyeTestSuite('Blobstore Test Suite', 'blobstore')
+  suite = HawkeyeTestSuite('Blobstore Test Suite', 'blobstore',
+                           shard_key='blobstore')
   suite.addTests(UploadBlobTest.all_cases(app))
   suite.addTests(DownloadBlobTest.all_cases(app))
   suite.addTests(QueryBlobDataTest.all_cases(app))
@@ -3,6 +3,7 @@ import time
 
 from hawkeye_test_runner import (HawkeyeTestCase, HawkeyeTestSuite,
                                  DeprecatedHawkeyeTestCase)
+from hawkeye_utils import sleep
 
 __author__ = 'jovan'
 
@@ -20,7 +21,7 @@ class CronTest(DeprecatedHawkeyeTestCase):
       seconds = time_delta.seconds
       if(seconds > 120):
         break
-      time.sleep(5)
+      sleep(5)
     self.assertEquals(success, True)
 
 
@@ -1,18 +1,12 @@
 import base64
 import json
-import Queue
-import ssl
 import time
 import urllib
-import urllib2
 import uuid
 import random
 import string
-from threading import Thread
 from time import sleep
 
-from concurrent.futures import ThreadPoolExecutor
-
 from hawkeye_test_runner import (HawkeyeTestCase, HawkeyeTestSuite,
                                  DeprecatedHawkeyeTestCase)
 from hawkeye_utils import HawkeyeConstants
@@ -34,6 +28,8 @@ class DataStoreCleanupTest(DeprecatedHawkeyeTestCase):
 
 
 class SimpleKindAwareInsertTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('DataStoreCleanupTest',)
+
   def run_hawkeye_test(self):
     response = self.http_post('/datastore/project',
       'name={0}&description=Mediation Engine&rating=8&license=L1'.format(
@@ -70,6 +66,8 @@ class SimpleKindAwareInsertTest(DeprecatedHawkeyeTestCase):
 
 
 class KindAwareInsertWithParentTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareInsertTest',)
+
   def run_hawkeye_test(self):
     response = self.http_post('/datastore/module',
       'name={0}&description=A Mediation Core&project_id={1}'.format(
@@ -95,6 +93,8 @@ class KindAwareInsertWithParentTest(DeprecatedHawkeyeTestCase):
 
 
 class SimpleKindAwareQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('KindAwareInsertWithParentTest',)
+
   def run_hawkeye_test(self):
     project_list = self.assert_and_get_list('/datastore/project')
     for entry in project_list:
@@ -122,6 +122,8 @@ class ZigZagQueryTest(DeprecatedHawkeyeTestCase):
 
 
 class AncestorQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('KindAwareInsertWithParentTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/datastore/project_modules?' \
       'project_id={0}'.format(ALL_PROJECTS[HawkeyeConstants.PROJECT_SYNAPSE]))
@@ -136,6 +138,8 @@ class AncestorQueryTest(DeprecatedHawkeyeTestCase):
 
 
 class OrderedKindAncestorQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('KindAwareInsertWithParentTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/datastore/project_modules?' \
       'project_id={0}&order=module_id'.format(\
@@ -166,6 +170,8 @@ class OrderedKindAncestorQueryTest(DeprecatedHawkeyeTestCase):
 
 
 class KindlessQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('KindAwareInsertWithParentTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list(
       '/datastore/project_keys?comparator=gt&project_id={0}'.format(
@@ -187,6 +193,8 @@ class KindlessQueryTest(DeprecatedHawkeyeTestCase):
 
 
 class KindlessAncestorQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('KindAwareInsertWithParentTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list(
       '/datastore/project_keys?ancestor=true&comparator=gt&project_id={0}'.
@@ -212,6 +220,8 @@ class KindlessAncestorQueryTest(DeprecatedHawkeyeTestCase):
 
 
 class QueryByKeyNameTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('KindAwareInsertWithParentTest',)
+
   def run_hawkeye_test(self):
     response = self.http_get('/datastore/entity_names?project_name={0}'.
       format(HawkeyeConstants.PROJECT_SYNAPSE))
@@ -228,6 +238,8 @@ class QueryByKeyNameTest(DeprecatedHawkeyeTestCase):
 
 
 class SinglePropertyBasedQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareInsertTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/datastore/project_ratings?'
                                            'rating=10&comparator=eq')
@@ -270,6 +282,8 @@ class SinglePropertyBasedQueryTest(DeprecatedHawkeyeTestCase):
 
 
 class OrderedResultQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareInsertTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/datastore/project_ratings?'
                                            'rating=6&comparator=ge&desc=true')
@@ -281,6 +295,8 @@ class OrderedResultQueryTest(DeprecatedHawkeyeTestCase):
 
 
 class LimitedResultQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareInsertTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/datastore/project_ratings?'
                                            'rating=6&comparator=ge&limit=2')
@@ -296,6 +312,8 @@ class LimitedResultQueryTest(DeprecatedHawkeyeTestCase):
 
 
 class ProjectionQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareInsertTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/datastore/project_fields?'
                                            'fields=project_id,name')
@@ -318,6 +336,8 @@ class ProjectionQueryTest(DeprecatedHawkeyeTestCase):
 
 
 class GQLProjectionQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareInsertTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/datastore/project_fields?'
                                            'fields=name,rating&gql=true')
@@ -330,6 +350,8 @@ class GQLProjectionQueryTest(DeprecatedHawkeyeTestCase):
 
 
 class CompositeQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareInsertTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/datastore/project_filter?'
                                            'license=L1&rate_limit=5')
@@ -349,6 +371,8 @@ class CompositeQueryTest(DeprecatedHawkeyeTestCase):
 
 
 class SimpleTransactionTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('DataStoreCleanupTest',)
+
   def run_hawkeye_test(self):
     key = str(uuid.uuid1())
     response = self.http_get('/datastore/transactions?' \
@@ -371,6 +395,8 @@ class SimpleTransactionTest(DeprecatedHawkeyeTestCase):
 
 
 class CrossGroupTransactionTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('DataStoreCleanupTest',)
+
   def run_hawkeye_test(self):
     key = str(uuid.uuid1())
     response = self.http_get('/datastore/transactions?' \
@@ -396,6 +422,8 @@ class CrossGroupTransactionTest(DeprecatedHawkeyeTestCase):
 
 
 class QueryCursorTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareInsertTest',)
+
   def run_hawkeye_test(self):
     project1 = self.assert_and_get_list('/datastore/project_cursor')
     project2 = self.assert_and_get_list('/datastore/project_cursor?' \
@@ -580,7 +608,6 @@ class QueryLimitTest(DeprecatedHawkeyeTestCase):
 
 class LongTxRead(DeprecatedHawkeyeTestCase):
   ID = 'long-tx-test'
-  RESPONSES = Queue.Queue()
 
   def tearDown(self):
     self.http_delete('/datastore/long_tx_read?id={}'.format(self.ID))
@@ -589,26 +616,10 @@ class LongTxRead(DeprecatedHawkeyeTestCase):
     self.http_post('/datastore/long_tx_read', 'id={}'.format(self.ID))
 
   def run_hawkeye_test(self):
-    def fetch_succeeded(url):
-      try:
-        urllib2.urlopen(url)
-        self.RESPONSES.put(True)
-      except urllib2.HTTPError:
-        self.RESPONSES.put(False)
-
-    url = self.app.build_url(
-      '/python/datastore/long_tx_read?id={}'.format(self.ID), https=False
-    )
-    thread1 = Thread(target=fetch_succeeded, args=(url,))
-    thread2 = Thread(target=fetch_succeeded, args=(url,))
-
-    thread1.start()
-    thread2.start()
-    thread1.join()
-    thread2.join()
-
-    self.assertTrue(self.RESPONSES.get())
-    self.assertTrue(self.RESPONSES.get())
+    path = '/python/datastore/long_tx_read?id={}'.format(self.ID)
+    futures = [self.app.aget(path, allow_redirects=True) for _ in range(2)]
+    for future in futures:
+      self.assertLess(future.result().status_code, 400)
 
 
 class NonAsciiEntityKeys(DeprecatedHawkeyeTestCase):
@@ -657,34 +668,23 @@ class CursorWithRepeatedProp(DeprecatedHawkeyeTestCase):
 
 class TxInvalidation(DeprecatedHawkeyeTestCase):
   KEY = 'tx-invalidation-test'
-  RESPONSE = None
 
   def tearDown(self):
     self.http_delete('/datastore/tx_invalidation?key={}'.format(self.KEY))
 
   def run_hawkeye_test(self):
-    context = ssl._create_unverified_context()
-
-    def tx_succeeded(url, payload):
-      response = urllib2.urlopen(url, payload, context=context)
-      self.RESPONSE = response.read()
-
-    url = self.app.build_url('/python/datastore/tx_invalidation')
-
-    tx_payload = urllib.urlencode({'key': self.KEY, 'txn': True})
-    thread = Thread(target=tx_succeeded, args=(url, tx_payload))
-    thread.start()
+    path = '/python/datastore/tx_invalidation'
+    tx_future = self.app.apost(
+      path, https=True, data={'key': self.KEY, 'txn': True})
 
-    # The tx_payload request sleeps for 1 second between a get and put inside
+    # The tx request sleeps for 1 second between a get and put inside
     # a transaction. This smaller sleep aims to run a put (from the
-    # non_tx_payload request) between those two calls.
+    # non-tx request) between those two calls.
     time.sleep(.5)
 
-    non_tx_payload = urllib.urlencode({'key': self.KEY, 'txn': False})
-    urllib2.urlopen(url, non_tx_payload, context=context)
+    self.app.post(path, https=True, data={'key': self.KEY, 'txn': False})
 
-    thread.join()
-    response = json.loads(self.RESPONSE)
+    response = tx_future.result().json()
     # The first transaction should be invalidated by the concurrent put.
     self.assertFalse(response['txnSucceeded'])
 
@@ -970,15 +970,14 @@ class QueryInTransaction(HawkeyeTestCase):
     url = '/{lang}/datastore/query_in_transaction'
 
     # Transactions that take place in separate entity groups should succeed.
-    thread_pool = ThreadPoolExecutor(2)
     query_1_info = {'parent': self.PARENT_1, 'kind': self.CHILDREN_1[0][0],
                     'waitTime': self.WAIT_TIME, 'putParent': self.PARENT_1,
                     'putKind': self.CHILDREN_1[0][0]}
     query_2_info = {'parent': self.PARENT_2, 'kind': self.CHILDREN_2[0][0],
                     'waitTime': self.WAIT_TIME, 'putParent': self.PARENT_2,
                     'putKind': self.CHILDREN_2[0][0]}
-    future_1 = thread_pool.submit(self.app.post, url, json=query_1_info)
-    future_2 = thread_pool.submit(self.app.post, url, json=query_2_info)
+    future_1 = self.app.apost(url, json=query_1_info)
+    future_2 = self.app.apost(url, json=query_2_info)
     self.assertEqual(future_1.result().status_code, 200)
     self.assertEqual(future_2.result().status_code, 200)
 
@@ -990,15 +989,16 @@ class QueryInTransaction(HawkeyeTestCase):
     query_2_info = {'parent': self.PARENT_1, 'kind': self.CHILDREN_1[0][0],
                     'waitTime': self.WAIT_TIME, 'putParent': self.PARENT_1,
                     'putKind': self.CHILDREN_1[0][0]}
-    future_1 = thread_pool.submit(self.app.post, url, json=query_1_info)
-    future_2 = thread_pool.submit(self.app.post, url, json=query_2_info)
+    future_1 = self.app.apost(url, json=query_1_info)
+    future_2 = self.app.apost(url, json=query_2_info)
     status_codes = [future.result().status_code
                     for future in [future_1, future_2]]
     self.assertEqual(len([code for code in status_codes if code == 200]), 1)
 
 
 def suite(lang, app):
-  suite = HawkeyeTestSuite('Datastore Test Suite', 'datastore')
+  suite = HawkeyeTestSuite('Datastore Test Suite', 'datastore',
+                           shard_key='datastore')
   suite.addTests(DataStoreCleanupTest.all_cases(app))
   suite.addTests(SimpleKindAwareInsertTest.all_cases(app))
   suite.addTests(KindAwareInsertWithParentTest.all_cases(app))
@@ -25,7 +25,8 @@ class RequestAPI(DeprecatedHawkeyeTestCase):
         self.assertEqual(response_dict['uri'], url)
 
 def suite(lang, app):
-  suite = HawkeyeTestSuite('Config Environment Variable Test Suite', 'env_var')
+  suite = HawkeyeTestSuite('Config Environment Variable Test Suite',
+                           'env_var', concurrent_tests=True)
   suite.addTests(GetConfigEnvironmentVariableTest.all_cases(app))
 
   if lang == 'python':
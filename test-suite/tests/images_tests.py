@@ -29,6 +29,8 @@ class ImageUploadTest(HawkeyeTestCase):
     sleep(5)
 
 class ImageLoadTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('ImageUploadTest',)
+
   def run_hawkeye_test(self):
     response = self.http_get('/images/logo?project_id=' + PROJECTS['appscale'])
     self.assertEquals(response.status, 200)
@@ -39,6 +41,8 @@ class ImageLoadTest(DeprecatedHawkeyeTestCase):
     self.assertEquals(100, image.size[0])
 
 class ImageMetadataTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('ImageUploadTest',)
+
   def run_hawkeye_test(self):
     response = self.http_get('/images/logo?metadata=true&project_id=' +
                              PROJECTS['appscale'])
@@ -48,6 +52,8 @@ class ImageMetadataTest(DeprecatedHawkeyeTestCase):
     self.assertEquals(logo_info['format'], 0)
 
 class ImageResizeTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('ImageUploadTest',)
+
   def run_hawkeye_test(self):
     response = self.http_get('/images/logo?resize=50&metadata=true&project_id=' +
                              PROJECTS['appscale'])
@@ -57,6 +63,8 @@ class ImageResizeTest(DeprecatedHawkeyeTestCase):
     self.assertEquals(logo_info['format'], 0)
 
 class ImageResizeTransformTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('ImageUploadTest',)
+
   def run_hawkeye_test(self):
     response = self.http_get('/images/logo?transform=true&resize=50&'
                              'metadata=true&project_id=' + PROJECTS['appscale'])
@@ -66,6 +74,8 @@ class ImageResizeTransformTest(DeprecatedHawkeyeTestCase):
     self.assertEquals(logo_info['format'], 0)
 
 class ImageRotateTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('ImageUploadTest',)
+
   def run_hawkeye_test(self):
     response = self.http_get('/images/logo?rotate=true&metadata=true&project_id=' +
                              PROJECTS['appscale'])
@@ -75,6 +85,8 @@ class ImageRotateTest(DeprecatedHawkeyeTestCase):
     self.assertEquals(logo_info['format'], 0)
 
 class ImageRotateTransformTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('ImageUploadTest',)
+
   def run_hawkeye_test(self):
     response = self.http_get('/images/logo?transform=true&rotate=true&'
                              'metadata=true&project_id=' + PROJECTS['appscale'])
@@ -84,7 +96,8 @@ class ImageRotateTransformTest(DeprecatedHawkeyeTestCase):
     self.assertEquals(logo_info['format'], 0)
 
 def suite(lang, app):
-  suite = hawkeye_test_runner.HawkeyeTestSuite('Images Test Suite', 'images')
+  suite = hawkeye_test_runner.HawkeyeTestSuite('Images Test Suite', 'images',
+                                               shard_key='images')
   suite.addTests(ImageDeleteTest.all_cases(app))
   suite.addTests(ImageUploadTest.all_cases(app))
   suite.addTests(ImageLoadTest.all_cases(app))
@@ -669,7 +669,8 @@ class TestIncrementTypes(HawkeyeTestCase):
 
 
 def suite(lang, app):
-  suite = HawkeyeTestSuite('Memcache Test Suite', 'memcache')
+  suite = HawkeyeTestSuite('Memcache Test Suite', 'memcache',
+                           concurrent_tests=True)
   suite.addTests(MemcacheAddTest.all_cases(app))
   suite.addTests(MemcacheKeyTest.all_cases(app))
   suite.addTests(MemcacheSetTest.all_cases(app))
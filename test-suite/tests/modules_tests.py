@@ -6,6 +6,7 @@ import requests
 
 from constants import TASK_EXECUTION_WAIT
 from hawkeye_test_runner import HawkeyeTestSuite, HawkeyeTestCase
+from hawkeye_utils import sleep
 
 
 class TestVersionDetails(HawkeyeTestCase):
@@ -177,7 +178,7 @@ class TestTaskTargets(HawkeyeTestCase):
           all(response.json()['entities'])):
         break
       else:
-        time.sleep(1)
+        sleep(1)
         continue
 
     entities = zip(self.entity_ids.keys(), response.json()['entities'])
@@ -211,7 +212,8 @@ class TestTaskTargets(HawkeyeTestCase):
 
 
 def suite(lang, app):
-  suite = HawkeyeTestSuite('Modules API Test Suite', 'modules')
+  suite = HawkeyeTestSuite('Modules API Test Suite', 'modules',
+                           concurrent_tests=True)
   suite.addTests(TestVersionDetails.all_cases(app))
   suite.addTests(TestCreatingAndGettingEntity.all_cases(app))
   suite.addTests(TestTaskTargets.all_cases(app))
@@ -19,6 +19,8 @@ class NDBCleanupTest(DeprecatedHawkeyeTestCase):
     self.assertEquals(response.status, 200)
 
 class SimpleKindAwareNDBInsertTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('NDBCleanupTest',)
+
   def run_hawkeye_test(self):
     response = self.http_post('/ndb/project',
       'name={0}&description=Mediation Engine&rating=8&license=L1'.format(
@@ -54,6 +56,8 @@ class SimpleKindAwareNDBInsertTest(DeprecatedHawkeyeTestCase):
     sleep(2)
 
 class KindAwareNDBInsertWithParentTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareNDBInsertTest',)
+
   def run_hawkeye_test(self):
     response = self.http_post('/ndb/module',
       'name={0}&description=Mediation Core&project_id={1}'.format(
@@ -78,6 +82,8 @@ class KindAwareNDBInsertWithParentTest(DeprecatedHawkeyeTestCase):
     NDB_SYNAPSE_MODULES[HawkeyeConstants.MOD_NHTTP] = module_id
 
 class SimpleKindAwareNDBQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('KindAwareNDBInsertWithParentTest',)
+
   def run_hawkeye_test(self):
     project_list = self.assert_and_get_list('/ndb/project')
     for entry in project_list:
@@ -98,6 +104,8 @@ class SimpleKindAwareNDBQueryTest(DeprecatedHawkeyeTestCase):
       self.assertEquals(project_info['name'], entry['name'])
 
 class NDBAncestorQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('KindAwareNDBInsertWithParentTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/ndb/project_modules?' \
       'project_id={0}'.format(NDB_ALL_PROJECTS[HawkeyeConstants.PROJECT_SYNAPSE]))
@@ -111,6 +119,8 @@ class NDBAncestorQueryTest(DeprecatedHawkeyeTestCase):
     self.assertTrue(modules.index(HawkeyeConstants.MOD_NHTTP) != -1)
 
 class NDBSinglePropertyBasedQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareNDBInsertTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/ndb/project_ratings?rating=10&'
                                            'comparator=eq')
@@ -151,6 +161,8 @@ class NDBSinglePropertyBasedQueryTest(DeprecatedHawkeyeTestCase):
       pass
 
 class NDBOrderedResultQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareNDBInsertTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/ndb/project_ratings?rating=6&'
                                            'comparator=ge&desc=true')
@@ -161,6 +173,8 @@ class NDBOrderedResultQueryTest(DeprecatedHawkeyeTestCase):
       last_rating = entity['rating']
 
 class NDBLimitedResultQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareNDBInsertTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/ndb/project_ratings?rating=6&'
                                            'comparator=ge&limit=2')
@@ -175,6 +189,8 @@ class NDBLimitedResultQueryTest(DeprecatedHawkeyeTestCase):
       last_rating = entity['rating']
 
 class NDBProjectionQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareNDBInsertTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/ndb/project_fields?'
                                            'fields=name,description')
@@ -194,6 +210,8 @@ class NDBProjectionQueryTest(DeprecatedHawkeyeTestCase):
       self.assertNotEquals(entity['name'], HawkeyeConstants.PROJECT_XERCES)
 
 class NDBCompositeQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareNDBInsertTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/ndb/project_filter?'
                                            'license=L1&rate_limit=5')
@@ -212,6 +230,8 @@ class NDBCompositeQueryTest(DeprecatedHawkeyeTestCase):
     self.assertEquals(entity_list[0]['name'], HawkeyeConstants.PROJECT_HADOOP)
 
 class NDBGQLTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareNDBInsertTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/ndb/project_filter?'
                                            'license=L1&rate_limit=5&gql=true')
@@ -230,6 +250,8 @@ class NDBGQLTest(DeprecatedHawkeyeTestCase):
     self.assertEquals(entity_list[0]['name'], HawkeyeConstants.PROJECT_HADOOP)
 
 class NDBInQueryTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareNDBInsertTest',)
+
   def run_hawkeye_test(self):
     entity_list = self.assert_and_get_list('/ndb/project_license_filter?'
                                            'licenses=L1')
@@ -254,6 +276,8 @@ class NDBInQueryTest(DeprecatedHawkeyeTestCase):
       pass
 
 class NDBCursorTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('SimpleKindAwareNDBInsertTest',)
+
   def run_hawkeye_test(self):
     project1 = self.assert_and_get_list('/ndb/project_cursor')
     project2 = self.assert_and_get_list('/ndb/project_cursor?cursor={0}'.
@@ -271,6 +295,8 @@ class NDBCursorTest(DeprecatedHawkeyeTestCase):
     self.assertTrue(project4['next'] is None)
 
 class SimpleNDBTransactionTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('NDBCleanupTest',)
+
   def run_hawkeye_test(self):
     key = str(uuid.uuid1())
     response = self.http_get('/ndb/transactions?' \
@@ -295,6 +321,8 @@ class SimpleNDBTransactionTest(DeprecatedHawkeyeTestCase):
     self.assertEquals(entity['counter'], 2)
 
 class NDBCrossGroupTransactionTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('NDBCleanupTest',)
+
   def run_hawkeye_test(self):
     key = str(uuid.uuid1())
     response = self.http_get('/ndb/transactions?' \
@@ -322,7 +350,8 @@ class NDBCrossGroupTransactionTest(DeprecatedHawkeyeTestCase):
     self.assertEquals(entity['backup'], 2)
 
 def suite(lang, app):
-  suite = HawkeyeTestSuite('NDB Test Suite', 'ndb')
+  suite = HawkeyeTestSuite('NDB Test Suite', 'ndb', shard_key='ndb',
+                           concurrent_tests=True)
   if lang != 'python':
     return suite
   suite.addTests(NDBCleanupTest.all_cases(app))
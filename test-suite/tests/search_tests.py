@@ -1230,7 +1230,8 @@ class FacetedSearch(SearchTestCase):
 
 
 def suite(lang, app):
-  test_suite = HawkeyeTestSuite("Search API Test Suite", "search")
+  test_suite = HawkeyeTestSuite("Search API Test Suite", "search",
+                                shard_key="search")
   if lang != 'python':
     return test_suite
 
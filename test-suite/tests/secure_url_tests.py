@@ -76,7 +76,8 @@ class HandlerOrderTest(HawkeyeTestCase):
 
 
 def suite(lang, app):
-  suite = HawkeyeTestSuite('Secure URL Test Suite', 'secure_url')
+  suite = HawkeyeTestSuite('Secure URL Test Suite', 'secure_url',
+                           concurrent_tests=True)
   if lang == 'python':
     suite.addTests(NeverSecureTest.all_cases(app))
     suite.addTests(AlwaysSecureTest.all_cases(app))
@@ -2,11 +2,11 @@ import datetime
 import json
 import time
 import uuid
-from time import sleep
 
 from constants import TASK_EXECUTION_WAIT
 from hawkeye_test_runner import (DeprecatedHawkeyeTestCase, HawkeyeTestCase,
                                  HawkeyeTestSuite)
+from hawkeye_utils import sleep
 
 
 class PushQueueTest(DeprecatedHawkeyeTestCase):
@@ -477,7 +477,7 @@ class PushHeadersTest(HawkeyeTestCase):
       if response.text == 'complete':
         break
 
-      time.sleep(1)
+      sleep(1)
 
     self.app.delete(url)
 
@@ -501,7 +501,7 @@ class TaskExistsTest(HawkeyeTestCase):
       else:
         self.assertEqual(response.json()['error'], 'TaskAlreadyExistsError')
 
-      time.sleep(1)
+      sleep(1)
 
   def test_adding_enqueued_task(self):
     task_id = uuid.uuid4().hex
@@ -560,7 +560,7 @@ class AdminWorkerTest(HawkeyeTestCase):
       self.assertLess(time.time(), deadline)
       response = self.app.get('/{lang}/taskqueue/admin_manager')
       if response.status_code == 404:
-        time.sleep(1)
+        sleep(1)
         continue
 
       self.assertEqual(response.status_code, 200)
@@ -568,7 +568,8 @@ class AdminWorkerTest(HawkeyeTestCase):
 
 
 def suite(lang, app):
-  suite = HawkeyeTestSuite('Task Queue Test Suite', 'taskqueue')
+  suite = HawkeyeTestSuite('Task Queue Test Suite', 'taskqueue',
+                           shard_key='taskqueue')
   suite.addTests(QueueExistsTest.all_cases(app))
   suite.addTests(PushQueueTest.all_cases(app))
   suite.addTests(DeferredTaskTest.all_cases(app))
@@ -30,7 +30,8 @@ class CertificateValidation(DeprecatedHawkeyeTestCase):
 
 
 def suite(lang, app):
-  suite = HawkeyeTestSuite('URLFetch Suite', 'urlfetch')
+  suite = HawkeyeTestSuite('URLFetch Suite', 'urlfetch',
+                           concurrent_tests=True)
   if lang == 'python':
     suite.addTests(CertificateValidation.all_cases(app))
 
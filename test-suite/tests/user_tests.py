@@ -72,6 +72,8 @@ class AdminLoginTest(DeprecatedHawkeyeTestCase):
     self.assertTrue(user_info['admin'])
 
 class LogoutURLTest(DeprecatedHawkeyeTestCase):
+  REQUIRES = ('UserLoginTest',)
+
   def run_hawkeye_test(self):
     headers = { 'Cookie' : LOGIN_COOKIES['user'] }
     response = self.http_get('/users/home', headers=headers)
@@ -80,7 +82,7 @@ class LogoutURLTest(DeprecatedHawkeyeTestCase):
     self.assertEquals(url_info['type'], 'logout')
 
 def suite(lang, app):
-  suite = HawkeyeTestSuite('User API Test Suite', 'users')
+  suite = HawkeyeTestSuite('User API Test Suite', 'users', shard_key='users')
   suite.addTests(LoginURLTest.all_cases(app))
   suite.addTests(UserLoginTest.all_cases(app))
   suite.addTests(AdminLoginTest.all_cases(app))
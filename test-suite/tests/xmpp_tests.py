@@ -1,7 +1,7 @@
 import json
-import time
 
 from hawkeye_test_runner import HawkeyeTestSuite, DeprecatedHawkeyeTestCase
+from hawkeye_utils import sleep
 
 __author__ = 'chris'
 
@@ -47,7 +47,7 @@ class SendAndReceiveTest(DeprecatedHawkeyeTestCase):
       if xmpp_info['state'] == 'message received!':
         message_received = True
         break
-      time.sleep(1)
+      sleep(1)
 
     self.assertTrue(message_received)
 